@@ -23,8 +23,10 @@ const AnimeStudio: React.FC<AnimeStudioProps> = ({
     startPreview,
     endPreview,
     loading,
+    jobStage,
     result,
     videoUrl,
+    videoDownloadUrl,
     isPlaying,
     setIsPlaying,
     currentFrameIndex,
@@ -150,6 +152,7 @@ const AnimeStudio: React.FC<AnimeStudioProps> = ({
                 projectName={projectName}
                 prompt={prompt}
                 loading={loading}
+                jobStage={jobStage}
                 onFileChange={handleFileChange}
                 setProjectName={setProjectName}
                 setPrompt={setPrompt}
@@ -189,6 +192,7 @@ const AnimeStudio: React.FC<AnimeStudioProps> = ({
                 projectName={projectName}
                 result={result}
                 videoUrl={videoUrl}
+                videoDownloadUrl={videoDownloadUrl}
                 isRendering={isRendering}
                 isZipping={isZipping}
                 onStepChange={onStepChange}
@@ -6,6 +6,7 @@ interface CreationStepProps {
   projectName: string;
   prompt: string;
   loading: boolean;
+  jobStage?: string | null;
   onFileChange: (
     e: React.ChangeEvent<HTMLInputElement>,
     type: "start" | "end"
@@ -22,6 +23,7 @@ const CreationStep: React.FC<CreationStepProps> = ({
   projectName,
   prompt,
   loading,
+  jobStage,
   onFileChange,
   setProjectName,
   setPrompt,
@@ -178,7 +180,8 @@ const CreationStep: React.FC<CreationStepProps> = ({
           >
             {loading ? (
               <>
-                <i className="fas fa-circle-notch fa-spin"></i> Processing...
+                <i className="fas fa-circle-notch fa-spin"></i>{" "}
+                {jobStage ? `Processing (${jobStage})...` : "Processing..."}
               </>
             ) : (
               <>
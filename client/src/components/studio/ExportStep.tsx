@@ -1,9 +1,11 @@
 import React from "react";
+import { videoExtension } from "../../hooks/useAnimeStudio";
 
 interface ExportStepProps {
   projectName: string;
   result: any;
   videoUrl: string | null;
+  videoDownloadUrl: string | null;
   isRendering: boolean;
   isZipping: boolean;
   onStepChange: (step: 0 | 1 | 2) => void;
@@ -16,6 +18,7 @@ const ExportStep: React.FC<ExportStepProps> = ({
   projectName,
   result,
   videoUrl,
+  videoDownloadUrl,
   isRendering,
   isZipping,
   onStepChange,
@@ -23,6 +26,8 @@ const ExportStep: React.FC<ExportStepProps> = ({
   onExportVideo,
   onExportZip,
 }) => {
+  // 서버가 고른 코덱에 따라 형식이 달라짐 (video_mime 기준)
+  const videoExt = videoExtension(result?.data?.video_mime);
   return (
     <div className="w-full max-w-6xl animate-fadeIn flex flex-col h-full">
       <div className="flex items-center justify-between mb-8">
@@ -108,9 +113,9 @@ const ExportStep: React.FC<ExportStepProps> = ({
           {/* Download Buttons */}
           <div className="grid grid-cols-1 md:grid-cols-2 gap-4">
             <a
-              href={videoUrl || "#"}
+              href={videoDownloadUrl || "#"}
               download={
-                videoUrl ? `${projectName || "anime_project"}.webm` : undefined
+                videoUrl ? `${projectName || "anime_project"}.${videoExt}` : undefined
               }
               onClick={(e) => {
                 if (!videoUrl || isRendering) e.preventDefault();
@@ -128,7 +133,7 @@ const ExportStep: React.FC<ExportStepProps> = ({
                 </span>
               ) : videoUrl ? (
                 <span>
-                  <i className="fas fa-download mr-2"></i> Download Video (WebM)
+                  <i className="fas fa-download mr-2"></i> Download Video ({videoExt.toUpperCase()})
                 </span>
               ) : (
                 <span>
@@ -1,4 +1,5 @@
 import React from "react";
+import type { RegenerateMode } from "../../hooks/useAnimeStudio";
 
 interface ReviewStepProps {
   currentFrameIndex: number;
@@ -18,7 +19,7 @@ interface ReviewStepProps {
   setCurrentFrameIndex: (index: number | ((prev: number) => number)) => void;
   revisionPrompt: string;
   setRevisionPrompt: (prompt: string) => void;
-  onRegenerate: () => void;
+  onRegenerate: (mode?: RegenerateMode) => void;
   isRegenerating: boolean;
   sliderRef: React.RefObject<HTMLDivElement | null>;
   fps: number;
@@ -298,7 +299,7 @@ const ReviewStep: React.FC<ReviewStepProps> = ({
                 />
 
                 <button
-                  onClick={onRegenerate}
+                  onClick={() => onRegenerate("kling")}
                   disabled={
                     isRegenerating ||
                     selectionStart === null ||
@@ -319,6 +320,30 @@ const ReviewStep: React.FC<ReviewStepProps> = ({
                   )}
                   Regenerate
                 </button>
+
+                <button
+                  title="Fill the selected range locally with optical-flow in-betweens (no Kling call)"
+                  onClick={() => onRegenerate("local")}
+                  disabled={
+                    isRegenerating ||
+                    selectionStart === null ||
+                    selectionEnd === null
+                  }
+                  className={`px-6 py-2 bg-slate-700 hover:bg-slate-600 text-white text-sm font-bold rounded-lg transition-colors flex items-center justify-center gap-2 ${
+                    isRegenerating ||
+                    selectionStart === null ||
+                    selectionEnd === null
+                      ? "opacity-50 cursor-not-allowed"
+                      : ""
+                  }`}
+                >
+                  {isRegenerating ? (
+                    <i className="fas fa-circle-notch fa-spin"></i>
+                  ) : (
+                    <i className="fas fa-film"></i>
+                  )}
+                  Interpolate
+                </button>
               </div>
               {/* Helper text / Validation Warning */}
               {validationWarning ? (
@@ -7,11 +7,134 @@ interface UseAnimeStudioProps {
   onStepChange: (step: 0 | 1 | 2) => void;
 }
 
-const base64ToBlob = async (base64: string) => {
-  const res = await fetch(base64);
+// data URL(Base64) 과 Blob URL 모두 지원
+const urlToBlob = async (url: string) => {
+  const res = await fetch(url);
   return await res.blob();
 };
 
+// 비디오 MIME → 저장 확장자 (서버가 고른 코덱에 따라 webm / mp4 / avi)
+const VIDEO_EXTENSIONS: Record<string, string> = {
+  "video/webm": "webm",
+  "video/mp4": "mp4",
+  "video/x-msvideo": "avi",
+};
+export const videoExtension = (mime?: string | null) =>
+  VIDEO_EXTENSIONS[(mime || "").split(";")[0].trim()] ?? "webm";
+
+// 서버 보관 원본이 없을 때 (만료 등) 리뷰용 프록시로 원본 해상도 결과를 만들 수 없음
+const PROXY_ONLY_MESSAGE =
+  "The full-resolution frames are no longer on the server (the project expired). " +
+  "Please generate the clip again to render, regenerate or export at full quality.";
+
+// 구간 재생성 방식 (server RegenerateRequest.mode 와 동일)
+export type RegenerateMode = "kling" | "local";
+
+// 바이너리 프레임 컨테이너 (server/app/transport.py 와 동일한 형식)
+// "AFC1" | 매니페스트 길이 | 매니페스트(JSON) | (파트 길이 | 파트 바이트) * N
+const FRAME_CONTAINER_MIME = "application/x-anime-frames";
+const FRAME_CONTAINER_MAGIC = "AFC1";
+
+const uint32 = (value: number) => {
+  const bytes = new Uint8Array(4);
+  new DataView(bytes.buffer).setUint32(0, value);
+  return bytes;
+};
+
+// Blob 값을 파트로 분리하여 컨테이너 본문 생성
+const encodeFrameContainer = (payload: any): Blob => {
+  const parts: Blob[] = [];
+  const extract = (value: any): any => {
+    if (value instanceof Blob) {
+      parts.push(value);
+      return { $part: parts.length - 1, mime: value.type };
+    }
+    if (Array.isArray(value)) return value.map(extract);
+    if (value && typeof value === "object") {
+      return Object.fromEntries(
+        Object.entries(value).map(([k, v]) => [k, extract(v)])
+      );
+    }
+    return value;
+  };
+  const manifest = new TextEncoder().encode(JSON.stringify(extract(payload)));
+  const chunks: BlobPart[] = [
+    new TextEncoder().encode(FRAME_CONTAINER_MAGIC),
+    uint32(manifest.length),
+    manifest,
+  ];
+  parts.forEach((part) => chunks.push(uint32(part.size), part));
+  return new Blob(chunks, { type: FRAME_CONTAINER_MIME });
+};
+
+// 컨테이너 응답을 JSON 응답과 같은 구조로 복원 (파트는 Blob URL 로 변환)
+// ! Blob URL 은 화면에서 빠질 때 useAnimeStudio 에서 해제 (revokeObjectURL)
+const decodeFrameContainer = (buffer: ArrayBuffer): any => {
+  const view = new DataView(buffer);
+  const magic = new TextDecoder().decode(new Uint8Array(buffer, 0, 4));
+  if (magic !== FRAME_CONTAINER_MAGIC) {
+    throw new Error("Invalid frame container.");
+  }
+  const manifestLength = view.getUint32(4);
+  const manifest = JSON.parse(
+    new TextDecoder().decode(new Uint8Array(buffer, 8, manifestLength))
+  );
+
+  const parts: Uint8Array<ArrayBuffer>[] = [];
+  let offset = 8 + manifestLength;
+  while (offset < buffer.byteLength) {
+    const length = view.getUint32(offset);
+    offset += 4;
+    parts.push(new Uint8Array(buffer, offset, length));
+    offset += length;
+  }
+
+  const restore = (value: any): any => {
+    if (Array.isArray(value)) return value.map(restore);
+    if (value && typeof value === "object") {
+      if ("$part" in value) {
+        return URL.createObjectURL(
+          new Blob([parts[value.$part]], { type: value.mime })
+        );
+      }
+      return Object.fromEntries(
+        Object.entries(value).map(([k, v]) => [k, restore(v)])
+      );
+    }
+    return value;
+  };
+  return restore(manifest);
+};
+
+// 응답 Content-Type 에 따라 컨테이너 또는 JSON 으로 파싱
+const readResponse = async (response: Response): Promise<any> => {
+  const contentType = response.headers.get("Content-Type") || "";
+  if (contentType.startsWith(FRAME_CONTAINER_MIME)) {
+    return decodeFrameContainer(await response.arrayBuffer());
+  }
+  return await response.json();
+};
+
+// NDJSON 이벤트 스트림을 한 줄(이벤트)씩 읽어 전달
+const readEventStream = async (
+  response: Response,
+  onEvent: (event: any) => void
+) => {
+  if (!response.body) throw new Error("Streaming is not supported.");
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  for (;;) {
+    const { done, value } = await reader.read();
+    buffer += decoder.decode(value, { stream: !done });
+    const lines = buffer.split("\n");
+    buffer = lines.pop() ?? "";
+    lines.filter((line) => line.trim()).forEach((line) => onEvent(JSON.parse(line)));
+    if (done) break;
+  }
+  if (buffer.trim()) onEvent(JSON.parse(buffer));
+};
+
 export const useAnimeStudio = ({
   baseUrl,
   onStepChange,
@@ -30,6 +153,7 @@ export const useAnimeStudio = ({
   const [loading, setLoading] = useState(false);
   const [result, setResult] = useState<any>(null);
   const [error, setError] = useState<string | null>(null);
+  const [jobStage, setJobStage] = useState<string | null>(null);
 
   const [videoUrl, setVideoUrl] = useState<string | null>(null);
 
@@ -52,6 +176,26 @@ export const useAnimeStudio = ({
   const [isRendering, setIsRendering] = useState(false);
   const [isZipping, setIsZipping] = useState(false);
 
+  // 화면에서 빠진 Blob URL 해제 (교체/재생성으로 잘려 나간 프레임, 이전 렌더링 비디오)
+  // ? 해제하지 않으면 컨테이너 응답의 프레임 Blob 이 탭을 닫을 때까지 메모리에 남음
+  const liveBlobUrls = useRef<Set<string>>(new Set());
+  useEffect(() => {
+    const current = new Set<string>(
+      [...(result?.data?.frames ?? []), videoUrl].filter(
+        (url): url is string => typeof url === "string" && url.startsWith("blob:")
+      )
+    );
+    liveBlobUrls.current.forEach((url) => {
+      if (!current.has(url)) URL.revokeObjectURL(url);
+    });
+    liveBlobUrls.current = current;
+  }, [result, videoUrl]);
+
+  useEffect(() => {
+    const urls = liveBlobUrls;
+    return () => urls.current.forEach((url) => URL.revokeObjectURL(url));
+  }, []);
+
   // 재생 루프 이펙트
   useEffect(() => {
     let interval: number;
@@ -102,6 +246,22 @@ export const useAnimeStudio = ({
     }
   };
 
+  // 서버 결과 파일은 URL 을 그대로 재생 (Range 요청으로 바로 재생/탐색), 이전 서버 응답은 Base64
+  const resolveVideoUrl = async (data: any): Promise<string | null> => {
+    if (data?.video_url) return `${baseUrl}${data.video_url}`;
+    if (data?.video_data) {
+      // 컨테이너 응답은 이미 Blob URL (다시 복사하지 않음)
+      if (data.video_data.startsWith("blob:")) return data.video_data;
+      return URL.createObjectURL(await urlToBlob(data.video_data));
+    }
+    return null;
+  };
+
+  const videoDownloadUrl =
+    videoUrl && !videoUrl.startsWith("blob:")
+      ? `${videoUrl}?download=true`
+      : videoUrl;
+
   const handleGenerate = async () => {
     if (!startFile || !endFile) {
       setError("Please select both start and end images.");
@@ -119,38 +279,78 @@ export const useAnimeStudio = ({
       formData.append("end_image", endFile);
       formData.append("prompt", prompt);
       formData.append("project_name", projectName);
+      // 리뷰는 저해상도 프록시로 표시 (원본은 내보내기 시 서버에서 조회)
+      formData.append("proxy", "true");
 
       const cleanBaseUrl = baseUrl.endsWith("/")
         ? baseUrl.slice(0, -1)
         : baseUrl;
-      const endpoint = `${cleanBaseUrl}/generate-video`;
+      const endpoint = `${cleanBaseUrl}/generate-video/stream`;
 
+      // 프레임이 추출되는 대로 타임라인에 추가 (header → frame * N → done)
       const response = await fetch(endpoint, {
         method: "POST",
         body: formData,
+        headers: { Accept: "application/x-ndjson" },
       });
 
-      const data = await response.json();
-
       if (!response.ok) {
-        throw new Error(data.message || `Error: ${response.status}`);
+        const data = await response.json().catch(() => null);
+        throw new Error(data?.message || `Error: ${response.status}`);
       }
 
-      setResult(data);
-      if (data.data?.frames?.length > 0) {
-        setCurrentFrameIndex(0);
+      const frames: string[] = [];
+      let done: any = null;
+      // 프레임마다 배열을 복사해 다시 그리지 않도록 화면 갱신 주기마다 한 번만 반영 (전체 배열은 done 에서 확정)
+      let pendingFlush: number | null = null;
+      const flushFrames = () => {
+        if (pendingFlush !== null) cancelAnimationFrame(pendingFlush);
+        pendingFlush = null;
+        setResult({ status: "success", data: { frames: [...frames] } });
+      };
+      try {
+        await readEventStream(response, (event) => {
+          if (event.type === "progress") {
+            // 대기열에서 기다리는 중이면 순번 표시
+            setJobStage(
+              event.stage === "queued"
+                ? `queued #${event.position} of ${event.waiting}`
+                : event.stage
+            );
+          } else if (event.type === "header") {
+            setJobStage("extracting");
+          } else if (event.type === "frame") {
+            frames[event.index] = event.data;
+            if (event.index === 0) {
+              // 첫 프레임은 바로 표시 (편집 화면으로 넘어가기 전에 타임라인이 비어 있지 않도록)
+              flushFrames();
+              setCurrentFrameIndex(0);
+              onStepChange(1);
+            } else if (pendingFlush === null) {
+              pendingFlush = requestAnimationFrame(flushFrames);
+            }
+          } else if (event.type === "done") {
+            done = event;
+          }
+        });
+      } finally {
+        // 스트림이 끊긴 경우에도 받은 프레임까지는 표시
+        if (pendingFlush !== null) flushFrames();
       }
 
-      if (data.data?.video_data) {
-        try {
-          const blob = await base64ToBlob(data.data.video_data);
-          const url = URL.createObjectURL(blob);
-          setVideoUrl(url);
-        } catch (e) {
-          console.error("Failed to process video blob", e);
-          setVideoUrl(null);
-        }
-      } else {
+      if (!done || done.status !== "success") {
+        throw new Error(done?.message || "Generation stream ended unexpectedly.");
+      }
+
+      setResult({
+        status: "success",
+        data: { ...done.data, frames: [...frames] },
+      });
+
+      try {
+        setVideoUrl(await resolveVideoUrl(done.data));
+      } catch (e) {
+        console.error("Failed to process video blob", e);
         setVideoUrl(null);
       }
 
@@ -159,6 +359,7 @@ export const useAnimeStudio = ({
       setError(err.message || "Failed to connect to the server.");
     } finally {
       setLoading(false);
+      setJobStage(null);
     }
   };
 
@@ -190,28 +391,62 @@ export const useAnimeStudio = ({
     setIsPlaying(true);
   };
 
-  const handleRegenerate = async () => {
+  // mode: "kling" (원격 재생성) / "local" (서버에서 광학 흐름 보간, 수 초)
+  const handleRegenerate = async (mode: RegenerateMode = "kling") => {
     if (selectionStart === null || selectionEnd === null) return;
 
     setIsRegenerating(true);
     try {
       const startIdx = Math.min(selectionStart, selectionEnd);
       const endIdx = Math.max(selectionStart, selectionEnd);
+      const projectId = result.data.project_id;
+
+      // 1. 서버 보관 프레임 참조 (인덱스만 전송, 결과는 서버에서 이어 붙임)
+      let response: Response | null = null;
+      if (projectId) {
+        response = await fetch(`${baseUrl}/regenerate`, {
+          method: "POST",
+          headers: {
+            "Content-Type": "application/json",
+            Accept: `${FRAME_CONTAINER_MIME}, application/json`,
+          },
+          body: JSON.stringify({
+            project_name: projectName || "project",
+            project_id: projectId,
+            start_index: startIdx,
+            end_index: endIdx,
+            prompt: prompt,
+            revision_prompt: revisionPrompt,
+            mode,
+            proxy: true,
+          }),
+        });
+      }
 
-      const response = await fetch(`${baseUrl}/regenerate`, {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({
-          project_name: projectName || "project",
-          start_image: result.data.frames[startIdx],
-          end_image: result.data.frames[endIdx],
-          prompt: prompt,
-          revision_prompt: revisionPrompt,
-          target_frame_count: endIdx - startIdx,
-        }),
-      });
+      // 2. 보관 프레임이 없으면 (만료, Mock 등) 키 프레임 업로드
+      // ! 보유 프레임이 프록시면 저해상도 재생성이 되므로 업로드하지 않고 다시 생성하도록 안내
+      if (!response || response.status === 404) {
+        if (result.data.proxy) throw new Error(PROXY_ONLY_MESSAGE);
+        response = await fetch(`${baseUrl}/regenerate`, {
+          method: "POST",
+          headers: {
+            "Content-Type": FRAME_CONTAINER_MIME,
+            Accept: `${FRAME_CONTAINER_MIME}, application/json`,
+          },
+          body: encodeFrameContainer({
+            project_name: projectName || "project",
+            start_image: await urlToBlob(result.data.frames[startIdx]),
+            end_image: await urlToBlob(result.data.frames[endIdx]),
+            prompt: prompt,
+            revision_prompt: revisionPrompt,
+            target_frame_count: endIdx - startIdx,
+            mode,
+            proxy_frames: Boolean(result.data.proxy),
+          }),
+        });
+      }
 
-      const data = await response.json();
+      const data = await readResponse(response);
       if (data.status === "success") {
         const newFrames = data.data.frames;
         const updatedFrames = [...result.data.frames];
@@ -225,6 +460,10 @@ export const useAnimeStudio = ({
             ...result.data,
             frames: finalFrames,
             video_data: null,
+            // 업로드 방식으로 처리된 경우 서버 보관 프레임과 달라지므로 참조 해제
+            project_id: data.data.project_id ?? null,
+            // 프록시 프레임이 하나라도 섞여 있으면 유지 (업로드 폴백 시 원본 해상도가 아님)
+            proxy: Boolean(result.data.proxy || data.data.proxy),
           },
         });
         setVideoUrl(null);
@@ -233,9 +472,9 @@ export const useAnimeStudio = ({
       } else {
         alert("Regeneration failed: " + data.message);
       }
-    } catch (e) {
+    } catch (e: any) {
       console.error(e);
-      alert("Error regenerating segment");
+      alert(`Error regenerating segment: ${e.message}`);
     } finally {
       setIsRegenerating(false);
     }
@@ -248,15 +487,41 @@ export const useAnimeStudio = ({
     setIsRendering(true);
     let success = false;
     try {
-      const response = await fetch(`${baseUrl}/render-video`, {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({
-          project_name: projectName || "project",
-          frames: result.data.frames,
-          fps: fps,
-        }),
-      });
+      // 서버 보관 프레임이 있으면 project_id 로 렌더링 (프레임 업로드 없음)
+      let response: Response | null = null;
+      if (result.data.project_id) {
+        response = await fetch(`${baseUrl}/render-video`, {
+          method: "POST",
+          headers: {
+            "Content-Type": "application/json",
+            Accept: `${FRAME_CONTAINER_MIME}, application/json`,
+          },
+          body: JSON.stringify({
+            project_name: projectName || "project",
+            project_id: result.data.project_id,
+            fps: fps,
+          }),
+        });
+      }
+
+      if (!response || response.status === 404) {
+        // ! 보유 프레임이 프록시면 저해상도 비디오가 되므로 업로드하지 않고 다시 생성하도록 안내
+        if (result.data.proxy) throw new Error(PROXY_ONLY_MESSAGE);
+        const frames = await Promise.all(result.data.frames.map(urlToBlob));
+        response = await fetch(`${baseUrl}/render-video`, {
+          method: "POST",
+          headers: {
+            "Content-Type": FRAME_CONTAINER_MIME,
+            Accept: `${FRAME_CONTAINER_MIME}, application/json`,
+          },
+          body: encodeFrameContainer({
+            project_name: projectName || "project",
+            frames,
+            fps: fps,
+            proxy_frames: Boolean(result.data.proxy),
+          }),
+        });
+      }
 
       if (!response.ok) {
         const text = await response.text();
@@ -265,17 +530,18 @@ export const useAnimeStudio = ({
         );
       }
 
-      const data = await response.json();
-      if (data.status === "success" && data.data.video_data) {
-        const blob = await base64ToBlob(data.data.video_data);
-        const url = URL.createObjectURL(blob);
+      const data = await readResponse(response);
+      const url = data.status === "success" ? await resolveVideoUrl(data.data) : null;
+      if (url) {
         setVideoUrl(url);
 
         setResult((prev: any) => ({
           ...prev,
           data: {
             ...prev.data,
+            video_url: data.data.video_url,
             video_data: data.data.video_data,
+            video_mime: data.data.video_mime,
           },
         }));
         success = true;
@@ -294,40 +560,51 @@ export const useAnimeStudio = ({
   const handleExportZip = async () => {
     setIsZipping(true);
     try {
+      // 서버 보관 프레임이 있으면 서버에서 원본 해상도 ZIP 을 스트리밍으로 바로 저장
+      const projectId = result?.data?.project_id;
+      if (projectId) {
+        const response = await fetch(`${baseUrl}/projects/${projectId}`);
+        if (response.ok) {
+          window.location.assign(`${baseUrl}/projects/${projectId}/frames.zip`);
+          return;
+        }
+      }
+      // 만료되었거나 서버 보관 프레임이 없으면 보유 프레임으로 브라우저에서 생성 (프록시면 안내)
+      if (result?.data?.proxy) throw new Error(PROXY_ONLY_MESSAGE);
       const zip = new JSZip();
       if (result?.data?.frames) {
-        result.data.frames.forEach((frame: string, i: number) => {
-          const parts = frame.split(",");
-          const base64Data = parts[1];
-          const mime = parts[0].split(":")[1].split(";")[0];
-          const ext = mime.split("/")[1];
-          zip.file(
-            `frame_${i.toString().padStart(3, "0")}.${ext}`,
-            base64Data,
-            { base64: true }
-          );
+        // 프레임은 data URL 또는 Blob URL (바이너리 컨테이너 응답)
+        const blobs = await Promise.all(result.data.frames.map(urlToBlob));
+        blobs.forEach((blob: Blob, i: number) => {
+          const ext = (blob.type || "image/jpeg").split("/")[1];
+          zip.file(`frame_${i.toString().padStart(3, "0")}.${ext}`, blob);
         });
       }
       const content = await zip.generateAsync({ type: "blob" });
       saveAs(content, `${projectName || "anime_project"}_frames.zip`);
-    } catch (e) {
+    } catch (e: any) {
       console.error(e);
-      alert("Failed to create ZIP");
+      alert(`Failed to create ZIP: ${e.message}`);
     } finally {
       setIsZipping(false);
     }
   };
 
   const handleExportVideo = async () => {
-    if (videoUrl) {
-      saveAs(videoUrl, `${projectName || "anime_project"}.webm`);
-    } else if (result?.data?.video_data) {
-      try {
-        const blob = await base64ToBlob(result.data.video_data);
-        saveAs(blob, `${projectName || "anime_project"}.webm`);
-      } catch (e) {
-        console.error("Failed to export video", e);
-      }
+    if (videoDownloadUrl && videoDownloadUrl !== videoUrl) {
+      // 서버 파일은 첨부 파일 응답으로 바로 저장 (메모리로 읽지 않음)
+      window.location.assign(videoDownloadUrl);
+      return;
+    }
+    // 브라우저에 있는 비디오는 실제 형식(MIME)에 맞는 확장자로 저장
+    const source = videoUrl || result?.data?.video_data;
+    if (!source) return;
+    try {
+      const blob = await urlToBlob(source);
+      const ext = videoExtension(result?.data?.video_mime || blob.type);
+      saveAs(blob, `${projectName || "anime_project"}.${ext}`);
+    } catch (e) {
+      console.error("Failed to export video", e);
     }
   };
 
@@ -343,9 +620,11 @@ export const useAnimeStudio = ({
     startPreview,
     endPreview,
     loading,
+    jobStage,
     result,
     error,
     videoUrl,
+    videoDownloadUrl,
     isPlaying,
     setIsPlaying,
     currentFrameIndex,
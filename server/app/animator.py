@@ -2,14 +2,54 @@
 Animator Module - Kling AI를 사용한 애니메이션 생성
 """
 import os
-import time
+import asyncio
 import requests
 import base64
-from typing import Optional, List
+from typing import Optional, List, Callable, Iterator, Iterable, Dict, Any, Tuple
 import cv2
+import time
 import uuid
+import zipfile
+from contextlib import asynccontextmanager
 
 from config.settings import settings
+from app.kling_client import KlingClient, KlingAPIError, kling_client
+from app.poller import TaskPoller, task_poller
+from app.cache import ResultCache, result_cache
+from app.ledger import TaskLedger, LedgerEntry, task_ledger
+from app.jobs import current_job_id
+from app.scheduler import (
+    KlingScheduler, SchedulerBusyError, SchedulerSlot, PRIORITY_GENERATE, PRIORITY_REVISION, kling_scheduler
+)
+from app import frames as frames_lib
+from app import retiming
+from app.video_codecs import codec_registry
+from app.workspace import WorkspaceQuotaError, workspace_manager
+from app.metrics import frames_processed, record_error, track_stage
+from app.tracing import annotate, traced
+from app.frames import Frame
+
+
+class _ZipChunkWriter:
+    """
+    ZipFile 출력 대상 (기록된 바이트를 모아 두었다가 drain 으로 꺼냄)
+    ? tell/seek 이 없으면 ZipFile 이 데이터 디스크립터 방식으로 기록하므로 되돌아가 쓰지 않음
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
 
 
 class Animator:
@@ -17,12 +57,23 @@ class Animator:
     Kling AI를 사용하여 두 이미지 사이의 애니메이션을 생성하는 클래스
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        client: KlingClient = kling_client,
+        poller: TaskPoller = task_poller,
+        cache: ResultCache = result_cache,
+        ledger: TaskLedger = task_ledger,
+        scheduler: KlingScheduler = kling_scheduler
+    ):
         """Kling AI 클라이언트 초기화"""
-        # ! API 키 설정 확인 필수
-        self.access_key = settings.KLING_ACCESS_KEY
-        self.secret_key = settings.KLING_SECRET_KEY
-        self.base_url = "https://api-singapore.klingai.com/v1/videos/image2video"
+        # ! API 키 설정 확인 필수 (config/.env)
+        self.client = client
+        self.poller = poller
+        self.cache = cache
+        self.ledger = ledger
+        self.scheduler = scheduler
+        # 캐시 키별 진행 중 작업 잠금 (동일 입력 동시 요청 시 Kling 작업 1건만 제출)
+        self._inflight: Dict[str, list] = {}
         
     def extract_frames_from_url(self, video_url: str, output_dir: str, frame_skip: int = 1) -> List[str]:
         """비디오/URL 프레임 추출 및 저장"""
@@ -83,50 +134,61 @@ class Animator:
         
         # 3. 임시 파일 정리
         return saved_files
-        
-        return saved_files
 
-    def _generate_jwt_token(self) -> str:
+    def iter_frames(
+        self,
+        video_source: str,
+        frame_skip: int = 1,
+        encode: bool = True,
+        window: Optional[int] = None,
+        sample_count: Optional[int] = None,
+        on_start: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Iterator[Frame]:
         """
-        Kling AI API 인증용 JWT 생성
-        ? 만료/시작 시간 보안 정책 확인
+        비디오 프레임을 디스크에 저장하지 않고 순서대로 반환하는 제너레이터
+        encode=True 면 JPEG 바이트, False 면 디코딩된 BGR 배열
+        sample_count 지정 시 고르게 샘플링된 프레임만 디코딩하여 반환
+        ? 파일로 저장이 필요한 경우에만 extract_frames_from_url 사용
         """
-        import jwt
-        import time
-    
-        if not self.access_key or not self.secret_key:
-            print("❌ Error: KLING_ACCESS_KEY or KLING_SECRET_KEY is missing!")
-            return ""
-
-        headers = {
-            "alg": "HS256",
-            "typ": "JWT"
-        }
-        payload = {
-            "iss": self.access_key,
-            "exp": int(time.time()) + 1800, 
-            "nbf": int(time.time()) - 5 
-        }
-        
-        token = jwt.encode(payload, self.secret_key.strip(), algorithm="HS256", headers=headers)
-        
-        if isinstance(token, bytes):
-            token = token.decode('utf-8')
-            
-        return token
-        
+        return frames_lib.iter_frames(
+            video_source, frame_skip=frame_skip, encode=encode, window=window,
+            sample_count=sample_count, on_start=on_start
+        )
+
+    def _collect_frames(
+        self,
+        frames: Iterable[bytes],
+        on_frame: Optional[Callable[[int, bytes], None]] = None
+    ) -> List[bytes]:
+        """프레임을 리스트로 모으면서 하나씩 on_frame 으로 전달 (점진적 스트리밍용)"""
+        collected = []
+        # ? 다운로드와 병행되므로 추출 시간에는 데이터 도착 대기도 포함 (순수 디코딩/인코딩은 decode/jpeg_encode 단계)
+        with track_stage("extract"):
+            for frame in frames:
+                if on_frame:
+                    on_frame(len(collected), frame)
+                collected.append(frame)
+        frames_processed.labels(stage="extract").inc(len(collected))
+        return collected
+
     def _encode_image_to_base64(self, image_bytes: bytes) -> str:
         """이미지를 base64로 인코딩"""
         return base64.b64encode(image_bytes).decode('utf-8')
     
-    def generate_video_from_images(
+    @traced()
+    async def generate_video_from_images(
         self, 
         project_name: str,
         start_image_bytes: bytes, 
         end_image_bytes: bytes,
         prompt: str,
-        duration: int = 5
-    ) -> Optional[tuple[List[str], str]]:
+        duration: int = 5,
+        progress_callback: Optional[Callable[..., None]] = None,
+        sample_count: Optional[int] = None,
+        on_video_info: Optional[Callable[[Dict[str, Any]], None]] = None,
+        on_frame: Optional[Callable[[int, bytes], None]] = None,
+        priority: int = PRIORITY_GENERATE
+    ) -> Optional[tuple[List[bytes], str]]:
         """
         두 이미지를 시작과 끝 프레임으로 사용하여 비디오 생성
         
@@ -135,177 +197,377 @@ class Animator:
             end_image_bytes: 끝 프레임 이미지 (bytes)
             prompt: 비디오 생성 프롬프트
             duration: 비디오 길이 (초, 5 또는 10)
+            progress_callback: 진행 단계 보고 콜백 (stage, **info) - Job 진행 상황 표시용
+            sample_count: 지정 시 전체 프레임 대신 고르게 샘플링한 sample_count 장만 추출 (구간 재생성용)
+            on_video_info: 프레임 추출 시작 시 호출 (frame_count, fps, width, height)
+            on_frame: 프레임이 추출될 때마다 호출 (index, JPEG 바이트) - 워커 스레드에서 호출될 수 있음
+            priority: Kling 작업 대기열 우선순위 (scheduler.PRIORITY_*)
             
         Returns:
-            (프레임 경로 리스트, 비디오 파일 경로) 튜플 또는 None
+            (JPEG 프레임 바이트 리스트, 원본 비디오 파일 경로) 튜플 또는 None
+            ! 비디오 파일이 든 작업 디렉토리는 호출 측에서 정리해야 함 (workspace_manager.release)
+
+        Raises:
+            SchedulerBusyError: Kling 작업 대기열이 가득 찬 경우
+            WorkspaceQuotaError: 임시 작업 공간이 부족한 경우 (Kling 제출 전에 확인)
         """
+        def report(stage: str, **info) -> None:
+            if progress_callback:
+                progress_callback(stage, **info)
+
         try:
             print("Kling AI API 호출 중...")
-            
+
             # 이미지를 base64로 인코딩
             start_b64 = self._encode_image_to_base64(start_image_bytes)
             end_b64 = self._encode_image_to_base64(end_image_bytes)
             
-            # API 요청 헤더
-            token = self._generate_jwt_token()
-            print("token 값:")
-            print(token)
-            headers = {
-                "Authorization": f"Bearer {token}",
-                "Content-Type": "application/json"
-            }
-            
             # API 요청 페이로드
             # 참고: 실제 Kling AI API 스펙에 맞게 조정 필요
-            payload = {
-                "model_name": "kling-v1",  # 또는 "kling-v1-pro"
-                "prompt": """
+            model_name = "kling-v1"  # 또는 "kling-v1-pro"
+            mode = "pro"  # 또는 "standard"
+            final_prompt = """
                 Create a smooth anime-style animation transitioning from the first frame to the second frame.
-                """+prompt,
-                "image": start_b64,  # 시작 프레임
-                "image_tail": end_b64,  # 끝 프레임 (필드명은 API 문서 확인 필요)
-                "duration": str(duration),
-                "aspect_ratio": "16:9",
-                "mode": "pro"  # 또는 "standard"
-            }
-            
-            # API 호출
-            print("데이터 업로드 및 작업 요청 중... (이미지 크기에 따라 1~2분 소요될 수 있습니다)")
-            response = requests.post(
-                self.base_url,
-                headers=headers,
-                json=payload,
-                timeout=120  # 2분 타임아웃
+                """+prompt
+
+            # 동일 입력으로 생성한 결과가 있으면 API 호출 없이 반환
+            cache_key = self.cache.make_key(
+                start_image_bytes, end_image_bytes, final_prompt, duration, model_name, mode
             )
-            
-            # response.raise_for_status() 라인 위에 삽입
-            if response.status_code == 400:
-                print(">>> 400 Bad Request 서버 응답 상세:")
-                print(response.text) # <--- 이 코드를 통해 정확한 오류 메시지를 확인해야 합니다.
-                return None
-            
-            response.raise_for_status()
-            result = response.json()
+            poll_key = f"{model_name}:{mode}:{duration}"
 
-            print(result)
-            
-            # 작업 ID 가져오기
-            task_id = result.get("data", {}).get("task_id")
-            if not task_id:
-                print(f"작업 ID를 가져올 수 없습니다: {result}")
-                return None
-            
-            print(f"작업 시작됨: {task_id}")
-            print("비디오 생성 대기 중... (수 분 소요될 수 있습니다)")
-            
-            # 작업 완료 대기 (폴링)
-            max_attempts = 180  # 최대 30분 대기
-            attempt = 0
-            
-            while attempt < max_attempts:
-                time.sleep(10)
-                attempt += 1
-                
-                # 작업 상태 확인
-                status_response = requests.get(
-                    f"{self.base_url}/{task_id}",
-                    headers=headers,
-                    timeout=10
-                )
-                
-                status_response.raise_for_status()
-                status_result = status_response.json()
-                
-                task_status = status_result.get("data", {}).get("task_status")
-                
-                # 디버깅: 상태 출력 (매번 출력하여 확인)
-                print(f" [Status: {task_status}]\n")
-
-                if task_status == "succeed" or task_status == "completed": 
-                    print("\n비디오 생성 완료!")
-                    
-                    # 비디오 URL 가져오기
-                    data = status_result.get("data", {})
-                    
-                    # 1. task_result 구조 확인 (새로운 응답 형식)
-                    video_url = None
-                    task_result = data.get("task_result", {})
-                    # 디버깅: task_result 타입 확인
-                    print(f"DEBUG: task_result type: {type(task_result)}")
-                    print(f"DEBUG: task_result content: {task_result}")
-                    
-                    if task_result and "videos" in task_result:
-                        videos = task_result.get("videos")
-                        print(f"DEBUG: videos: {videos}")
-                        
-                        if videos and len(videos) > 0:
-                            video_url = videos[0].get("url")
-                            print(f"DEBUG: Extracted URL: {video_url}")
-                            
-                    # 2. 기존 구조 확인 (fallback)
-                    if not video_url:
-                        print("DEBUG: trying fallback...")
-                        video_url = data.get("video_url")
-                        
-                    if not video_url and "video_result_list" in data:
-                        video_list = data.get("video_result_list")
-                        if video_list and len(video_list) > 0:
-                            video_url = video_list[0].get("url")
-                    
-                    print(f"Video URL: {video_url}")
-
-                    if not video_url:
-                        print("비디오 URL을 가져올 수 없습니다. 응답을 확인하세요.")
-                        print(f"DEBUG Response: {status_result}")
-                        return None
-                    
-                        # 1. 비디오 파일 다운로드 (스트리밍 안정성 확보)
-                    print(f"비디오 다운로드 중... ({video_url})")
+            # ? 같은 입력의 작업이 진행 중이면 끝날 때까지 기다린 뒤 캐시 결과 사용
+            async with self._inflight_lock(cache_key):
+                # ! 작업 공간 확인은 Kling 제출 전에 (공간 부족으로 비용이 청구된 결과를 버리지 않도록)
+                workspace = workspace_manager.create("cache")
+                with track_stage("cache_lookup"):
+                    cached = await asyncio.to_thread(self.cache.get, cache_key, workspace.path)
+                annotate(project_name=project_name, cache_hit=bool(cached))
+                if cached:
+                    report("cached", cache_key=cache_key)
                     try:
-                        # output_dir 준비 (frames 저장될 곳)
-                        output_dir = os.path.join("generated_frames", project_name, task_id)
-                        os.makedirs(output_dir, exist_ok=True)
-                        
-                        # 비디오 파일도 output_dir 안에 저장
-                        temp_video_path = os.path.join(output_dir, f"original_{task_id}.mp4")
-                        
-                        video_response = requests.get(video_url, stream=True, timeout=60)
-                        video_response.raise_for_status()
-                        
-                        with open(temp_video_path, 'wb') as f:
-                            for chunk in video_response.iter_content(chunk_size=8192):
-                                f.write(chunk)
-                                
-                        print(f"다운로드 완료: {temp_video_path}")
-                        
-                        # 2. 로컬 파일에서 프레임 추출
-                        print("프레임 추출 중...")
-                        frames = self.extract_frames_from_url(temp_video_path, output_dir)
-                        
-                        # Return frames AND video path
-                        return frames, temp_video_path
-                        
-                    except Exception as e:  
-                        print(f"비디오 다운로드 및 추출 실패: {e}")
-                        return None
-                    
-                elif task_status == "failed":
-                    print("\n비디오 생성 실패")
-                    error_msg = status_result.get("data", {}).get("error")
-                    print(f"오류: {error_msg}")
-                    return None
-                else:
-                    print(".", end="", flush=True)
-            
-            print("\n타임아웃: 비디오 생성이 너무 오래 걸립니다")
-            return None
+                        return await asyncio.to_thread(
+                            self._frames_from_cached, cached, sample_count, on_video_info, on_frame
+                        )
+                    except BaseException:
+                        workspace.release()
+                        raise
+                workspace.release()
+
+                # 이전 실행(재시작 전)에서 제출한 같은 입력의 작업이 남아 있으면 재제출 없이 이어서 처리
+                pending = self.ledger.find_pending(cache_key)
+                if pending:
+                    print(f"기존 작업에 다시 연결: {pending.task_id}")
+                    return await self._complete_task(
+                        pending, report, sample_count, on_video_info, on_frame
+                    )
 
+                # 동시 진행 작업 수 제한: 자리가 날 때까지 대기 (대기 순번 보고)
+                with track_stage("kling_queue"):
+                    slot = await self.scheduler.acquire(
+                        project_name,
+                        priority,
+                        on_position=lambda position, waiting: report("queued", position=position, waiting=waiting)
+                    )
+                try:
+                    return await self._submit_and_complete(
+                        slot, project_name, cache_key, poll_key, report, sample_count, on_video_info, on_frame,
+                        {
+                            "model_name": model_name,
+                            "prompt": final_prompt,
+                            "image": start_b64,  # 시작 프레임
+                            "image_tail": end_b64,  # 끝 프레임 (필드명은 API 문서 확인 필요)
+                            "duration": str(duration),
+                            "aspect_ratio": "16:9",
+                            "mode": mode
+                        }
+                    )
+                finally:
+                    slot.release()
+
+        except (SchedulerBusyError, WorkspaceQuotaError):
+            raise
         except Exception as e:
+            record_error("generation")
             print(f"Video generation error: {e}")
             import traceback
             traceback.print_exc()
             return None
 
+    async def _submit_and_complete(
+        self,
+        slot: SchedulerSlot,
+        project_name: str,
+        cache_key: str,
+        poll_key: str,
+        report: Callable[..., None],
+        sample_count: Optional[int],
+        on_video_info: Optional[Callable[[Dict[str, Any]], None]],
+        on_frame: Optional[Callable[[int, bytes], None]],
+        payload: Dict[str, Any]
+    ) -> Optional[tuple[List[bytes], str]]:
+        """배정받은 자리로 Kling 작업 제출 후 완료까지 처리"""
+        report("submitting")
+        # API 호출 (커넥션 풀 재사용)
+        print("데이터 업로드 및 작업 요청 중... (이미지 크기에 따라 1~2분 소요될 수 있습니다)")
+        try:
+            # 이미지 업로드 + 작업 등록
+            with track_stage("kling_submit"):
+                task_id = await self.client.submit_image2video(payload)
+        except KlingAPIError as e:
+            record_error("kling_submit")
+            print(f"작업 요청 실패: {e}")
+            return None
+
+        print(f"작업 시작됨: {task_id}")
+        # ! 폴링 전에 기록해야 재시작 시 작업을 이어서 처리할 수 있음
+        self.ledger.record_submitted(
+            task_id, cache_key, project_name, poll_key, job_id=current_job_id.get()
+        )
+        return await self._complete_task(
+            self.ledger.get(task_id) or task_id, report, sample_count, on_video_info, on_frame,
+            project_name=project_name, cache_key=cache_key, poll_key=poll_key, slot=slot
+        )
+
+    async def resume_task(
+        self,
+        entry: LedgerEntry,
+        progress_callback: Optional[Callable[..., None]] = None
+    ) -> Optional[tuple[List[bytes], str]]:
+        """
+        재시작 전에 제출된 작업을 이어서 처리 (폴링 → 다운로드 → 캐시 저장)
+        같은 입력의 새 요청은 잠금 대기 후 캐시 결과를 사용
+        """
+        def report(stage: str, **info) -> None:
+            if progress_callback:
+                progress_callback(stage, **info)
+
+        async with self._inflight_lock(entry.cache_key):
+            # 잠금 대기 중 다른 요청이 이미 처리했을 수 있음
+            current = self.ledger.get(entry.task_id)
+            if current is None or not current.is_pending:
+                return None
+            print(f"🔁 작업 이어서 처리: {entry.task_id} ({entry.status})")
+            return await self._complete_task(current, report)
+
+    @traced()
+    async def _complete_task(
+        self,
+        entry: Any,
+        report: Callable[..., None],
+        sample_count: Optional[int] = None,
+        on_video_info: Optional[Callable[[Dict[str, Any]], None]] = None,
+        on_frame: Optional[Callable[[int, bytes], None]] = None,
+        project_name: Optional[str] = None,
+        cache_key: Optional[str] = None,
+        poll_key: Optional[str] = None,
+        slot: Optional[SchedulerSlot] = None
+    ) -> Optional[tuple[List[bytes], str]]:
+        """
+        제출된 작업의 완료 대기 → 다운로드/프레임 추출 → 캐시 저장 (진행 상태는 작업 기록에 반영)
+
+        Args:
+            entry: 작업 기록 (기록 비활성화 시 task_id 문자열 + project_name/cache_key/poll_key)
+            slot: 스케줄러 자리 (없으면 Kling 에서 이미 진행 중인 작업이므로 대기 없이 차지)
+                  ? 자리는 폴링이 끝나면 반납 (다운로드는 Kling 동시 작업 수와 무관)
+        """
+        if isinstance(entry, LedgerEntry):
+            task_id, project_name, cache_key, poll_key = (
+                entry.task_id, entry.project_name, entry.cache_key, entry.poll_key
+            )
+            video_url = entry.video_url
+            age = time.time() - entry.created_at
+        else:
+            task_id, video_url, age = entry, None, 0.0
+        annotate(task_id=task_id)
+
+        if not video_url:
+            slot = slot or self.scheduler.occupy(project_name)
+            try:
+                with track_stage("kling_wait"):
+                    status_result = await self._wait_task(task_id, poll_key, age, report)
+            finally:
+                slot.release()
+            if status_result is None:
+                return None
+
+            task_status = status_result.get("data", {}).get("task_status")
+            if task_status == "failed":
+                print("\n비디오 생성 실패")
+                error_msg = status_result.get("data", {}).get("error")
+                print(f"오류: {error_msg}")
+                record_error("kling_task_failed")
+                self.ledger.mark_failed(task_id, error_msg)
+                return None
+
+            print("\n비디오 생성 완료!")
+            video_url = self._extract_video_url(status_result.get("data", {}))
+            print(f"Video URL: {video_url}")
+
+            if not video_url:
+                print("비디오 URL을 가져올 수 없습니다. 응답을 확인하세요.")
+                print(f"DEBUG Response: {status_result}")
+                record_error("kling_no_video")
+                self.ledger.mark_failed(task_id, "video url missing")
+                return None
+            self.ledger.mark_succeeded(task_id, video_url)
+
+        # ? 다운로드 실패 시 succeeded 상태로 남아 다음 요청/재시작 때 다운로드부터 재시도
+        result = await self._download_and_extract(
+            project_name, task_id, video_url, report, sample_count, on_video_info, on_frame
+        )
+        if result and result[0]:
+            # 샘플링 추출 결과는 일부 프레임뿐이므로 비디오만 캐시 (프레임은 적중 시 다시 추출)
+            cached_frames = result[0] if sample_count is None else []
+            await asyncio.to_thread(self.cache.put, cache_key, cached_frames, result[1])
+            self.ledger.mark_completed(task_id)
+        return result
+
+    async def _wait_task(
+        self,
+        task_id: str,
+        poll_key: str,
+        age: float,
+        report: Callable[..., None]
+    ) -> Optional[Dict[str, Any]]:
+        """작업 종료까지 폴링 후 마지막 상태 응답 반환 (타임아웃/조회 실패 시 None)"""
+        report("waiting", task_id=task_id)
+        print("비디오 생성 대기 중... (수 분 소요될 수 있습니다)")
+
+        # 작업 완료 대기 (공용 폴러가 예상 완료 시점에 맞춰 상태 조회)
+        def on_status(task_status: str, attempt: int) -> None:
+            # 디버깅: 상태 출력 (매번 출력하여 확인)
+            print(f" [Status: {task_status}]")
+            report("waiting", task_id=task_id, task_status=task_status, attempt=attempt)
+
+        try:
+            return await self.poller.wait(task_id, key=poll_key, on_status=on_status, age=age)
+        except asyncio.TimeoutError:
+            print("\n타임아웃: 비디오 생성이 너무 오래 걸립니다")
+            record_error("kling_timeout")
+            self.ledger.mark_failed(task_id, "timeout")
+            return None
+        except KlingAPIError as e:
+            # 존재하지 않는 작업 등 (재시도해도 성공할 수 없음)
+            print(f"작업 상태 조회 실패: {e}")
+            record_error("kling_status")
+            self.ledger.mark_failed(task_id, str(e))
+            return None
+
+    @asynccontextmanager
+    async def _inflight_lock(self, cache_key: str):
+        # [잠금, 사용 중인 요청 수]
+        holder = self._inflight.setdefault(cache_key, [asyncio.Lock(), 0])
+        holder[1] += 1
+        try:
+            async with holder[0]:
+                yield
+        finally:
+            holder[1] -= 1
+            if holder[1] == 0:
+                self._inflight.pop(cache_key, None)
+
+    def _frames_from_cached(
+        self,
+        cached: tuple[List[bytes], str],
+        sample_count: Optional[int],
+        on_video_info: Optional[Callable[[Dict[str, Any]], None]] = None,
+        on_frame: Optional[Callable[[int, bytes], None]] = None
+    ) -> tuple[List[bytes], str]:
+        """
+        캐시 항목에서 요청에 맞는 프레임 반환
+        프레임 없이 비디오만 저장된 항목은 비디오에서 다시 추출
+        """
+        frames, video_path = cached
+        if frames:
+            if sample_count is not None:
+                frames = [frames[i] for i in frames_lib.sample_indices(len(frames), sample_count)]
+            if on_video_info:
+                on_video_info({**frames_lib.probe_video(video_path), "frame_count": len(frames)})
+            return self._collect_frames(frames, on_frame), video_path
+        frames_iter = self.iter_frames(video_path, sample_count=sample_count, on_start=on_video_info)
+        return self._collect_frames(frames_iter, on_frame), video_path
+
+    def _extract_video_url(self, data: dict) -> Optional[str]:
+        """
+        작업 상태 응답(data)에서 결과 비디오 URL 추출
+        """
+        # 1. task_result 구조 확인 (새로운 응답 형식)
+        video_url = None
+        task_result = data.get("task_result", {})
+        if task_result and "videos" in task_result:
+            videos = task_result.get("videos")
+            if videos and len(videos) > 0:
+                video_url = videos[0].get("url")
+                
+        # 2. 기존 구조 확인 (fallback)
+        if not video_url:
+            video_url = data.get("video_url")
+            
+        if not video_url and "video_result_list" in data:
+            video_list = data.get("video_result_list")
+            if video_list and len(video_list) > 0:
+                video_url = video_list[0].get("url")
+        return video_url
+
+    @traced()
+    async def _download_and_extract(
+        self,
+        project_name: str,
+        task_id: str,
+        video_url: str,
+        report: Callable[..., None],
+        sample_count: Optional[int] = None,
+        on_video_info: Optional[Callable[[Dict[str, Any]], None]] = None,
+        on_frame: Optional[Callable[[int, bytes], None]] = None
+    ) -> Optional[tuple[List[bytes], str]]:
+        """
+        결과 비디오 다운로드 후 프레임 추출 (메모리 내 JPEG 인코딩)
+        sample_count 지정 시 선택된 인덱스의 프레임만 추출
+        """
+        print(f"비디오 다운로드 중... ({video_url})")
+        report("downloading", task_id=task_id)
+        # 원본 비디오를 받을 요청별 작업 디렉토리
+        # ? 이미 비용이 청구된 결과이므로 용량 상한과 무관하게 받음
+        workspace = workspace_manager.create("download", enforce_quota=False)
+        try:
+            temp_video_path = workspace.file(f"original_{task_id}.mp4")
+            
+            # 다운로드와 프레임 추출 병행: 바이트가 도착하는 대로 디코딩 스레드가 읽어감
+            # (OpenCV 는 블로킹이므로 스레드에서 실행)
+            buffer = frames_lib.StreamingVideoBuffer(temp_video_path)
+            report("extracting", task_id=task_id)
+            extract = asyncio.ensure_future(asyncio.to_thread(
+                lambda: self._collect_frames(
+                    self.iter_frames(buffer, sample_count=sample_count, on_start=on_video_info),
+                    on_frame
+                )
+            ))
+            try:
+                with track_stage("download"):
+                    await self.client.stream_to(video_url, buffer, chunk_size=settings.KLING_DOWNLOAD_CHUNK_SIZE)
+                print(f"다운로드 완료: {temp_video_path}")
+            except Exception as e:
+                buffer.fail(e)
+                raise
+            finally:
+                # 디코딩 스레드 종료 대기 (실패 시 예외 전파)
+                try:
+                    frames = await extract
+                finally:
+                    buffer.close()
+            print(f"총 {len(frames)}개의 프레임이 추출되었습니다.")
+            annotate(video_bytes=os.path.getsize(temp_video_path), frame_count=len(frames))
+            
+            # Return frames AND video path
+            return frames, temp_video_path
+            
+        except Exception as e:  
+            print(f"비디오 다운로드 및 추출 실패: {e}")
+            record_error("download")
+            workspace.release()
+            return None
+
     def generate_frame(self, image_data: bytes, prompt: str) -> bytes:
         """단일 프레임 생성 (미구현)"""
         # TODO: AI 프레임 생성 로직 구현 필요 !
@@ -337,17 +599,22 @@ class Animator:
         else:
             return "normal speed, real time"
 
-    def regenerate_video_segment(
+    @traced()
+    async def regenerate_video_segment(
         self,
         project_name: str,
         start_image_path: str,
         end_image_path: str,
         target_frame_count: int,
         original_prompt: str = "",
-        revision_prompt: str = ""
-    ) -> Optional[List[str]]:
+        revision_prompt: str = "",
+        progress_callback: Optional[Callable[..., None]] = None,
+        on_video_info: Optional[Callable[[Dict[str, Any]], None]] = None,
+        on_frame: Optional[Callable[[int, bytes], None]] = None
+    ) -> Optional[List[bytes]]:
         """
-        특정 구간의 영상을 재생성하고, 필요한 프레임 수만큼 샘플링하여 반환
+        특정 구간의 영상을 재생성하고, 필요한 프레임 수만큼 샘플링하여 반환 (JPEG 바이트)
+        progress_callback/on_video_info/on_frame 은 generate_video_from_images 와 동일
         """
         try:
             # 1. 이미지 로드
@@ -365,47 +632,44 @@ class Animator:
             modified_prompt = f"{base_prompt}, {speed_control}, {fluidity}, high quality, high detail, smooth transition"
             print(f"재생성 프롬프트: {modified_prompt} (Base: {base_prompt})")
             
-            # 3. 비디오 생성 (전체 프레임 추출)
+            if target_frame_count <= 0:
+                print("목표 프레임 수가 0 이하입니다.")
+                return []
+
+            # 3. 비디오 생성 + 샘플링 추출
+            # ! 필요한 인덱스를 먼저 계산하고 해당 프레임만 디코딩/인코딩 (나머지는 grab 으로 건너뜀)
             revision_project_name = f"{project_name}_revision"
             
-            # self.generate_video_from_images 호출
-            result = self.generate_video_from_images(
+            result = await self.generate_video_from_images(
                 project_name=revision_project_name,
                 start_image_bytes=start_bytes,
                 end_image_bytes=end_bytes,
                 prompt=modified_prompt,
-                duration=5 
+                duration=5,
+                sample_count=target_frame_count,
+                progress_callback=progress_callback,
+                on_video_info=on_video_info,
+                on_frame=on_frame,
+                # 구간 재생성은 사용자가 편집 화면에서 기다리므로 새 생성보다 먼저 배정
+                priority=PRIORITY_REVISION
             )
             
             if not result:
                 print("재생성 실패: 프레임을 생성하지 못했습니다.")
                 return None
 
-            all_frames, _ = result
-                
-            total_frames = len(all_frames)
-            print(f"생성된 총 프레임 수: {total_frames} -> 목표 프레임 수: {target_frame_count}")
-            
-            if target_frame_count <= 0:
-                print("목표 프레임 수가 0 이하입니다.")
-                return []
-                
-            if target_frame_count == 1:
-                return [all_frames[total_frames // 2]]
-            
-            # 4. 프레임 샘플링 (Linear Interpolation)
-            sampled_frames = []
-            if total_frames <= target_frame_count:
-                sampled_frames = all_frames
-            else:
-                indices = [int(i * (total_frames - 1) / (target_frame_count - 1)) for i in range(target_frame_count)]
-                for idx in indices:
-                    sampled_frames.append(all_frames[idx])
+            sampled_frames, video_path = result
+            annotate(target_frame_count=target_frame_count, frame_count=len(sampled_frames))
+            # 재생성은 프레임만 사용하므로 원본 비디오 즉시 정리
+            workspace_manager.release(os.path.dirname(video_path))
             
             print(f"샘플링 완료: {len(sampled_frames)}장")
             return sampled_frames
             
+        except (SchedulerBusyError, WorkspaceQuotaError):
+            raise
         except Exception as e:
+            record_error("regeneration")
             print(f"Segment regeneration error: {e}")
             import traceback
             traceback.print_exc()
@@ -413,88 +677,79 @@ class Animator:
 
     def create_video_from_frames(self, frame_paths: List[str], output_path: str, fps: int = 15) -> Optional[str]:
         """
-        프레임 이미지 리스트를 하나의 비디오 파일로 병합 (OpenCV 사용)
+        프레임 이미지 파일 리스트를 하나의 비디오 파일로 병합 (OpenCV 사용)
+        ? 메모리에 있는 프레임은 create_video_from_frame_bytes 사용 (임시 파일 불필요)
         """
-        if not frame_paths:
-            print("병합할 프레임이 없습니다.")
-            return None
+        def read_files() -> Iterator[bytes]:
+            for path in frame_paths:
+                if not os.path.exists(path):
+                    print(f"파일 누락 (스킵): {path}")
+                    continue
+                with open(path, "rb") as f:
+                    yield f.read()
+
+        return self.create_video_from_frame_bytes(read_files(), output_path, fps)
 
+    def create_video_from_frame_bytes(
+        self,
+        frames: Iterable[bytes],
+        output_path: str,
+        fps: int = 15,
+        positions: Optional[Iterable[float]] = None,
+        retime_mode: str = retiming.MODE_LINEAR,
+        codec_preference: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        메모리 내 프레임 이미지(JPEG 등 바이트)들을 하나의 비디오 파일로 병합
+        디코딩은 스레드 풀에서 병렬로 진행하고, VideoWriter 에는 입력 순서대로 기록
+        positions 지정 시 디코딩된 프레임을 리타이밍하여 기록 (retiming.source_positions)
+        ? 코덱은 codec_registry 가 선택하며 확장자가 바뀔 수 있으므로 반환된 경로를 사용
+        """
         try:
-            # 첫 번째 프레임으로 크기 확인
-            first_frame = cv2.imread(frame_paths[0])
+            def valid_frames() -> Iterator[Any]:
+                for img in frames_lib.iter_decoded(frames):
+                    if img is None:
+                        print("이미지 디코딩 실패 (스킵)")
+                        continue
+                    yield img
+
+            decoded = valid_frames()
+            if positions is not None:
+                decoded = retiming.iter_retime(decoded, list(positions), retime_mode)
+
+            # 첫 번째로 디코딩된 프레임으로 크기 확인
+            first_frame = next(decoded, None)
             if first_frame is None:
-                print(f"프레임을 읽을 수 없습니다: {frame_paths[0]}")
+                print("병합할 프레임이 없습니다.")
                 return None
                 
             height, width, layers = first_frame.shape
             size = (width, height)
             
-            # 코덱 선택 및 폴백
-            # ? 브라우저 재생 가능 코덱 우선순위 적용
-            base, ext = os.path.splitext(output_path)
-            ext = ext.lower()
-            
-            # 시도 코덱 목록
-            # ! 1. WebM (VP8) - 높은 호환성
-            # ! 2. WebM (VP9) - 고효율
-            # ! 3. MP4 (mp4v) - 최종 폴백
-            
-            attempts = []
-            if ext == '.webm':
-                attempts.append(('VP80', output_path))
-                attempts.append(('VP90', output_path))
-                attempts.append(('mp4v', base + '.mp4')) # Fallback to MP4 container
-            else:
-                attempts.append(('mp4v', output_path))
-                attempts.append(('avc1', output_path)) # Try safe avc1 if mp4 requested
-            
-            active_out = None
-            final_path = output_path
-            
-            for FourCC_str, target_path in attempts:
-                fourcc = cv2.VideoWriter_fourcc(*FourCC_str)
-                temp_out = cv2.VideoWriter(target_path, fourcc, fps, size)
-                
-                if temp_out.isOpened():
-                    print(f"코덱 성공: {FourCC_str} -> {target_path}")
-                    active_out = temp_out
-                    final_path = target_path
-                    break
-                else:
-                    print(f"코덱 초기화 실패: {FourCC_str}")
-                    if os.path.exists(target_path):
-                        try: os.remove(target_path)
-                        except: pass
-            
+            # 코덱 선택 (사용 가능 코덱은 프로세스당 한 번만 시험, codec_preference: fast / small)
+            active_out = codec_registry.open(os.path.splitext(output_path)[0], fps, size, codec_preference)
             if active_out is None:
                 print("모든 코덱 시도 실패")
                 return None
-                
-            active_out.write(first_frame) # Write first frame explicitly checked above? No, rewriting loop
+            final_path = active_out.path
             
-            print(f"비디오 생성 시작: {final_path} ({len(frame_paths)} frames, {fps} fps)")
+            print(f"비디오 생성 시작: {final_path} ({fps} fps)")
             
-            # 첫 번째 프레임은 이미 shape 확인용으로 읽었지만 loop에서 다시 읽음 (효율성 off)
-            for i, path in enumerate(frame_paths):
-                # 0번 프레임은 위에서 읽었으나 여기서 다시 읽어서 쓴다.
-                if i == 0:
-                    active_out.write(first_frame)
-                    continue
-                    
-                if not os.path.exists(path):
-                    continue
-                
-                img = cv2.imread(path)
-                if img is not None:
+            frame_count = 1
+            try:
+                active_out.write(first_frame)
+                for img in decoded:
                     active_out.write(img)
-                else:
-                    print(f"이미지 읽기 실패: {path}")
-            
-            active_out.release()
+                    frame_count += 1
+            finally:
+                # ! 오류 시에도 출력을 닫아야 ffmpeg 프로세스가 남지 않음
+                completed = active_out.release()
+            if not completed:
+                return None
             
             # 파일 크기 확인 (0바이트면 실패로 간주)
             if os.path.exists(final_path) and os.path.getsize(final_path) > 0:
-                print(f"비디오 생성 완료: {final_path} ({os.path.getsize(final_path)} bytes)")
+                print(f"비디오 생성 완료: {final_path} ({frame_count} frames, {os.path.getsize(final_path)} bytes)")
                 return final_path
             else:
                 print("비디오 파일이 생성되지 않았거나 비어있습니다.")
@@ -510,21 +765,23 @@ class Animator:
         """
         프레임 이미지 리스트를 하나의 ZIP 파일로 압축
         """
-        import zipfile
-        
         if not frame_paths:
             return None
-            
+
+        def read_frames() -> Iterator[Tuple[str, bytes]]:
+            for file_path in frame_paths:
+                if os.path.exists(file_path):
+                    # ZIP 파일 내에 저장될 이름 (파일명만)
+                    with open(file_path, "rb") as f:
+                        yield os.path.basename(file_path), f.read()
+                else:
+                    print(f"파일 누락 (스킵): {file_path}")
+
         try:
             print(f"ZIP 생성 시작: {output_path}")
-            with zipfile.ZipFile(output_path, 'w') as zipf:
-                for file_path in frame_paths:
-                    if os.path.exists(file_path):
-                        # ZIP 파일 내에 저장될 이름 (파일명만)
-                        arcname = os.path.basename(file_path)
-                        zipf.write(file_path, arcname)
-                    else:
-                        print(f"파일 누락 (스킵): {file_path}")
+            with open(output_path, "wb") as zip_file:
+                for chunk in self.iter_zip_from_frames(read_frames()):
+                    zip_file.write(chunk)
             
             print("ZIP 생성 완료")
             return output_path
@@ -532,5 +789,22 @@ class Animator:
             print(f"ZIP 생성 중 오류 발생: {e}")
             return None
 
+    def iter_zip_from_frames(self, frames: Iterable[Tuple[str, bytes]]) -> Iterator[bytes]:
+        """
+        (파일명, 이미지 바이트) 목록을 ZIP 으로 묶으면서 만들어진 조각을 바로 반환 (스트리밍 응답용)
+        ! JPEG 은 이미 압축되어 있으므로 무압축(ZIP_STORED)으로 저장 → CPU 는 CRC 계산뿐
+        ? 메모리에는 현재 프레임 1장과 중앙 디렉토리(파일당 수십 바이트)만 유지
+        """
+        sink = _ZipChunkWriter()
+        date_time = time.localtime()[:6]
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as zipf:
+            for name, data in frames:
+                info = zipfile.ZipInfo(name, date_time=date_time)
+                info.external_attr = 0o644 << 16
+                zipf.writestr(info, data)
+                yield sink.drain()
+        # 중앙 디렉토리 (ZipFile 종료 시 기록)
+        yield sink.drain()
+
 # 싱글톤 인스턴스
 animator = Animator()
@@ -0,0 +1,207 @@
+"""
+Cache Module - 생성 결과 콘텐츠 주소 기반(Content-addressed) 캐시
+
+동일한 시작/끝 이미지, 최종 프롬프트, 길이, 모델, 모드로 다시 요청하면
+Kling API 를 호출하지 않고 디스크에 보관된 프레임과 비디오를 바로 반환합니다.
+전체 용량이 상한을 넘으면 가장 오래 사용되지 않은 항목(LRU)부터 삭제합니다.
+"""
+import hashlib
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import settings
+
+VIDEO_FILENAME = "video.mp4"
+
+
+class ResultCache:
+    """
+    디스크 기반 LRU 결과 캐시
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int, enabled: bool = True):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        # key -> 항목 크기 (bytes), 순서 = 최근 사용 순 (마지막이 최신)
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        if self.enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._load_index()
+
+    @staticmethod
+    def make_key(
+        start_image_bytes: bytes,
+        end_image_bytes: bytes,
+        prompt: str,
+        duration: int,
+        model_name: str,
+        mode: str
+    ) -> str:
+        """
+        요청 입력으로 캐시 키(SHA-256) 생성
+        ! prompt 는 Kling 에 실제로 전송되는 최종 프롬프트여야 함 (슬로우 모션 키워드 등 포함)
+        """
+        h = hashlib.sha256()
+        for part in (
+            hashlib.sha256(start_image_bytes).digest(),
+            hashlib.sha256(end_image_bytes).digest(),
+            prompt.encode("utf-8"),
+            str(duration).encode(),
+            model_name.encode(),
+            mode.encode(),
+        ):
+            # 길이 접두어로 필드 경계를 구분
+            h.update(len(part).to_bytes(8, "big"))
+            h.update(part)
+        return h.hexdigest()
+
+    # -------------------------------------------------------------------------
+    # 조회 / 저장
+    # -------------------------------------------------------------------------
+    def get(self, key: str, output_dir: str) -> Optional[Tuple[List[bytes], str]]:
+        """
+        캐시 적중 시 (JPEG 프레임 바이트 리스트, 비디오 경로) 반환
+        ? 비디오는 호출 측이 결과 디렉토리를 삭제하므로 output_dir 로 복사하여 전달
+        ? 비디오만 저장된 항목은 빈 프레임 리스트 반환 (호출 측에서 추출)
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            if key not in self._entries:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+
+        entry_dir = os.path.join(self.cache_dir, key)
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            frames = []
+            for name in sorted(os.listdir(entry_dir)):
+                if not name.startswith("frame_"):
+                    continue
+                with open(os.path.join(entry_dir, name), "rb") as f:
+                    frames.append(f.read())
+
+            video_path = os.path.join(output_dir, VIDEO_FILENAME)
+            shutil.copyfile(os.path.join(entry_dir, VIDEO_FILENAME), video_path)
+            # 디렉토리 수정 시각 = 마지막 사용 시각 (재시작 후 LRU 순서 복원용)
+            os.utime(entry_dir)
+        except OSError as e:
+            # ? 동시 삭제(LRU)나 일부만 지워진 항목은 적중이 아닌 미스로 집계
+            print(f"캐시 항목 읽기 실패 ({key[:12]}): {e}")
+            self._remove(key)
+            with self._lock:
+                self._misses += 1
+            return None
+
+        with self._lock:
+            self._hits += 1
+        print(f"⚡ 캐시 적중: {key[:12]} ({len(frames)} frames)")
+        return frames, video_path
+
+    def put(self, key: str, frames: List[bytes], video_path: str) -> None:
+        """
+        생성 결과를 캐시에 저장하고 용량 상한 초과 시 LRU 항목 삭제
+        frames 가 비어 있으면 비디오만 저장 (샘플링 추출 결과 등)
+        """
+        if not self.enabled or not video_path:
+            return
+
+        entry_dir = os.path.join(self.cache_dir, key)
+        tmp_dir = f"{entry_dir}.tmp-{threading.get_ident()}"
+        try:
+            os.makedirs(tmp_dir, exist_ok=True)
+            for i, frame in enumerate(frames):
+                with open(os.path.join(tmp_dir, f"frame_{i:06d}.jpg"), "wb") as f:
+                    f.write(frame)
+            shutil.copyfile(video_path, os.path.join(tmp_dir, VIDEO_FILENAME))
+            size = self._dir_size(tmp_dir)
+
+            with self._lock:
+                if key in self._entries:
+                    shutil.rmtree(tmp_dir, ignore_errors=True)
+                    return
+                os.replace(tmp_dir, entry_dir)
+                self._entries[key] = size
+                self._total_bytes += size
+                self._evict_locked()
+        except OSError as e:
+            print(f"캐시 저장 실패 ({key[:12]}): {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+            }
+
+    # -------------------------------------------------------------------------
+    # 내부 유틸리티
+    # -------------------------------------------------------------------------
+    def _load_index(self) -> None:
+        """기존 캐시 디렉토리를 스캔하여 LRU 인덱스 복원 (수정 시각 오래된 순)"""
+        found = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if ".tmp-" in name:
+                # 저장 도중 중단된 항목
+                shutil.rmtree(path, ignore_errors=True)
+                continue
+            if os.path.isdir(path) and os.path.exists(os.path.join(path, VIDEO_FILENAME)):
+                found.append((os.path.getmtime(path), name, self._dir_size(path)))
+
+        for _, name, size in sorted(found):
+            self._entries[name] = size
+            self._total_bytes += size
+        with self._lock:
+            self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self._evictions += 1
+            shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+            print(f"캐시 삭제 (LRU): {key[:12]}")
+
+    def _remove(self, key: str) -> None:
+        with self._lock:
+            size = self._entries.pop(key, None)
+            if size is not None:
+                self._total_bytes -= size
+        shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+
+    @staticmethod
+    def _dir_size(path: str) -> int:
+        return sum(
+            os.path.getsize(os.path.join(path, name))
+            for name in os.listdir(path)
+        )
+
+
+# 싱글톤 인스턴스
+result_cache = ResultCache(
+    cache_dir=settings.RESULT_CACHE_DIR,
+    max_bytes=settings.RESULT_CACHE_MAX_BYTES,
+    enabled=settings.RESULT_CACHE_ENABLED
+)
@@ -0,0 +1,189 @@
+"""
+Frame Store Module - 프로젝트별 프레임 보관소
+
+생성된 프레임(JPEG 바이트)을 project_id 로 서버에 보관합니다.
+클라이언트는 재생성/렌더링 요청 시 프레임 전체를 다시 업로드하는 대신
+project_id 와 프레임 인덱스만 보내고, 재생성 결과는 서버에서 바로 이어 붙입니다.
+리뷰용 저해상도 프레임(프록시)도 같은 순서로 함께 보관하며, 원본은 필요할 때 인덱스/범위로 조회합니다.
+
+마지막 접근 후 TTL 이 지난 프로젝트는 삭제되며, 전체 용량이 상한을 넘으면
+가장 오래 사용되지 않은 프로젝트(LRU)부터 삭제합니다.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from config.settings import settings
+
+
+class StoredProject:
+    """
+    보관 중인 프로젝트 1건 (프레임 목록 + 프록시 목록 + 수정 버전)
+    """
+
+    def __init__(
+        self,
+        project_id: str,
+        project_name: str,
+        frames: List[bytes],
+        proxies: Optional[List[bytes]] = None
+    ):
+        self.project_id = project_id
+        self.project_name = project_name
+        self.frames = frames
+        # frames 와 같은 순서의 리뷰용 프레임 (프록시 비활성화 시 None)
+        self.proxies = proxies
+        # 재생성으로 프레임이 바뀔 때마다 증가 (동시 수정 충돌 확인용)
+        self.version = 1
+        self.created_at = time.time()
+        self.accessed_at = self.created_at
+
+    @property
+    def size(self) -> int:
+        return sum(len(frame) for frame in self.frames) + sum(len(proxy) for proxy in self.proxies or ())
+
+    def to_dict(self, ttl: float) -> Dict[str, Any]:
+        return {
+            "project_id": self.project_id,
+            "project_name": self.project_name,
+            "frame_count": len(self.frames),
+            "has_proxies": self.proxies is not None,
+            "version": self.version,
+            "created_at": self.created_at,
+            "expires_at": self.accessed_at + ttl,
+        }
+
+
+class FrameStore:
+    """
+    메모리 기반 프로젝트 프레임 보관소 (TTL + 용량 상한 LRU)
+    """
+
+    def __init__(self, ttl: float, max_bytes: int):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # project_id -> StoredProject, 순서 = 최근 사용 순 (마지막이 최신)
+        self._projects: "OrderedDict[str, StoredProject]" = OrderedDict()
+        self._total_bytes = 0
+
+    def create(
+        self,
+        project_name: str,
+        frames: List[bytes],
+        proxies: Optional[List[bytes]] = None
+    ) -> StoredProject:
+        """프레임(과 프록시)을 새 프로젝트로 등록하고 반환"""
+        if proxies is not None and len(proxies) != len(frames):
+            raise ValueError("프록시 수가 프레임 수와 다릅니다")
+        project = StoredProject(
+            uuid.uuid4().hex, project_name, list(frames), list(proxies) if proxies is not None else None
+        )
+        with self._lock:
+            self._purge_expired_locked()
+            self._projects[project.project_id] = project
+            self._total_bytes += project.size
+            self._evict_locked()
+        print(f"🗂️ 프레임 보관: {project.project_id} ({project_name}, {len(project.frames)} frames)")
+        return project
+
+    def get(self, project_id: str) -> Optional[StoredProject]:
+        """프로젝트 조회 (만료 시 None), 조회 시 TTL 갱신"""
+        with self._lock:
+            self._purge_expired_locked()
+            project = self._projects.get(project_id)
+            if project is None:
+                return None
+            project.accessed_at = time.time()
+            self._projects.move_to_end(project_id)
+            return project
+
+    def splice(
+        self,
+        project_id: str,
+        start_index: int,
+        end_index: int,
+        new_frames: List[bytes],
+        expected_version: Optional[int] = None,
+        new_proxies: Optional[List[bytes]] = None
+    ) -> StoredProject:
+        """
+        start_index 와 end_index 사이(양 끝 제외)를 new_frames 로 교체
+        ? 클라이언트의 구간 재생성 결과 반영 방식과 동일 (양 끝 키 프레임 유지)
+        ? 프록시를 보관 중인 프로젝트에 new_proxies 가 없으면 순서가 어긋나지 않도록 프록시를 버림
+
+        Raises:
+            KeyError: 프로젝트가 없거나 만료된 경우
+            ValueError: 인덱스가 범위를 벗어났거나 다른 요청으로 이미 수정된 경우
+        """
+        with self._lock:
+            project = self._projects.get(project_id)
+            if project is None:
+                raise KeyError(project_id)
+            if expected_version is not None and project.version != expected_version:
+                raise ValueError("다른 요청으로 프로젝트 프레임이 변경되었습니다. 다시 시도하세요.")
+            if not 0 <= start_index < end_index < len(project.frames):
+                raise ValueError(f"프레임 인덱스 범위 오류: {start_index} ~ {end_index}")
+
+            old_size = project.size
+            project.frames = project.frames[:start_index + 1] + list(new_frames) + project.frames[end_index:]
+            if project.proxies is not None:
+                if new_proxies is not None and len(new_proxies) == len(new_frames):
+                    project.proxies = (
+                        project.proxies[:start_index + 1] + list(new_proxies) + project.proxies[end_index:]
+                    )
+                else:
+                    project.proxies = None
+            project.version += 1
+            project.accessed_at = time.time()
+            self._projects.move_to_end(project_id)
+            self._total_bytes += project.size - old_size
+            self._evict_locked()
+            return project
+
+    def delete(self, project_id: str) -> bool:
+        with self._lock:
+            project = self._projects.pop(project_id, None)
+            if project is None:
+                return False
+            self._total_bytes -= project.size
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "projects": len(self._projects),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+            }
+
+    # -------------------------------------------------------------------------
+    # 내부 유틸리티
+    # -------------------------------------------------------------------------
+    def _purge_expired_locked(self) -> None:
+        now = time.time()
+        expired = [
+            project_id for project_id, project in self._projects.items()
+            if now - project.accessed_at > self.ttl
+        ]
+        for project_id in expired:
+            project = self._projects.pop(project_id)
+            self._total_bytes -= project.size
+            print(f"🗂️ 프레임 보관 만료: {project_id}")
+
+    def _evict_locked(self) -> None:
+        # ! 가장 최근 프로젝트(방금 등록/수정)는 상한을 넘더라도 유지
+        while self._total_bytes > self.max_bytes and len(self._projects) > 1:
+            project_id, project = self._projects.popitem(last=False)
+            self._total_bytes -= project.size
+            print(f"🗂️ 프레임 보관 삭제 (LRU): {project_id}")
+
+
+# 싱글톤 인스턴스
+frame_store = FrameStore(
+    ttl=settings.FRAME_STORE_TTL_SECONDS,
+    max_bytes=settings.FRAME_STORE_MAX_BYTES
+)
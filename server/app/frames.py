@@ -0,0 +1,434 @@
+"""
+Frames Module - 메모리 기반 프레임 추출 및 인코딩
+
+비디오에서 디코딩한 프레임을 디스크에 쓰지 않고 JPEG 바이트(또는 디코딩된 배열)로 바로 넘겨줍니다.
+디코딩은 별도 스레드에서 앞서 진행되며, 대기 중인 프레임 수는 window 로 제한되어
+영상 길이와 관계없이 최대 메모리 사용량이 일정하게 유지됩니다.
+
+다운로드 중인 비디오는 StreamingVideoBuffer 로 감싸서 넘기면
+바이트가 도착하는 대로 디코딩을 시작합니다 (네트워크 수신과 디코딩 병행).
+
+반대 방향(이미지 바이트 → 디코딩된 프레임, 렌더링용)은 iter_decoded 가
+공용 스레드 풀에서 병렬로 디코딩하고 입력 순서대로 돌려줍니다.
+
+리뷰 화면용 저해상도 프레임(프록시)은 make_proxy / make_proxies 로 만듭니다.
+"""
+import io
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Union
+
+import cv2
+import numpy as np
+
+from app.metrics import stage_seconds
+from config.settings import settings
+
+Frame = Union[bytes, np.ndarray]
+VideoSource = Union[str, "StreamingVideoBuffer"]
+
+# 디코딩 스레드 종료 신호
+_END = object()
+
+
+def encode_jpeg(frame: np.ndarray, quality: Optional[int] = None) -> bytes:
+    """
+    디코딩된 프레임(BGR)을 JPEG 바이트로 인코딩
+    """
+    if quality is None:
+        quality = settings.FRAME_JPEG_QUALITY
+    ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("JPEG 인코딩 실패")
+    return buffer.tobytes()
+
+
+def decode_image(data: bytes) -> Optional[np.ndarray]:
+    """
+    이미지 바이트(JPEG/PNG 등)를 BGR 배열로 디코딩 (실패 시 None)
+    """
+    return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+# 이미지 디코딩 공용 스레드 풀 (최초 사용 시 생성)
+_decode_pool: Optional[ThreadPoolExecutor] = None
+_decode_pool_lock = threading.Lock()
+
+
+def _decode_workers() -> int:
+    return settings.FRAME_DECODE_WORKERS or os.cpu_count() or 4
+
+
+def _get_decode_pool() -> ThreadPoolExecutor:
+    global _decode_pool
+    with _decode_pool_lock:
+        if _decode_pool is None:
+            _decode_pool = ThreadPoolExecutor(max_workers=_decode_workers(), thread_name_prefix="image-decoder")
+        return _decode_pool
+
+
+def make_proxy(data: bytes, max_side: Optional[int] = None, quality: Optional[int] = None) -> bytes:
+    """
+    리뷰용 저해상도 프레임 (긴 변을 max_side 이하로 축소하고 낮은 품질로 JPEG 인코딩)
+    ? 이미 작은 프레임은 크기를 유지하고 품질만 낮춤
+    """
+    max_side = max_side or settings.PROXY_MAX_SIDE
+    quality = quality or settings.PROXY_JPEG_QUALITY
+    frame = decode_image(data)
+    if frame is None:
+        raise ValueError("이미지를 디코딩할 수 없습니다")
+    height, width = frame.shape[:2]
+    scale = max_side / max(height, width)
+    if scale < 1.0:
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+    return encode_jpeg(frame, quality)
+
+
+def make_proxies(images: Iterable[bytes]) -> List[bytes]:
+    """여러 프레임의 리뷰용 프레임을 공용 스레드 풀에서 병렬 생성 (입력 순서 유지)"""
+    return list(_get_decode_pool().map(make_proxy, images))
+
+
+def iter_decoded(images: Iterable[bytes], window: Optional[int] = None) -> Iterator[Optional[np.ndarray]]:
+    """
+    이미지 바이트들을 스레드 풀에서 병렬 디코딩하여 입력 순서대로 반환 (실패 항목은 None)
+
+    Args:
+        images: 이미지 바이트 이터러블 (제너레이터면 필요한 만큼만 읽음)
+        window: 동시에 디코딩 중이거나 소비를 기다리는 최대 프레임 수 (메모리 상한)
+    ? cv2.imdecode 는 GIL 을 해제하므로 코어 수만큼 병렬로 진행됨
+    """
+    if window is None:
+        window = max(settings.FRAME_DECODE_WINDOW, _decode_workers() * 2)
+
+    pool = _get_decode_pool()
+    pending: Deque[Future] = deque()
+    try:
+        for data in images:
+            pending.append(pool.submit(decode_image, data))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        # 소비 측이 중단한 경우 남은 작업 취소
+        for future in pending:
+            future.cancel()
+
+
+class StreamingVideoBuffer(io.BufferedIOBase):
+    """
+    다운로드 중인 비디오 파일을 OpenCV 에 스트림으로 제공하는 버퍼
+
+    다운로드 측(append)은 받은 청크를 파일에 기록하고, 디코딩 측(read/seek)은
+    아직 도착하지 않은 구간을 요청하면 데이터가 도착할 때까지 대기합니다.
+    파일 끝 기준 seek 은 전체 크기(Content-Length)를 알아야 하므로,
+    크기를 모르면 다운로드 완료까지 대기합니다.
+    ? faststart(moov 선행) MP4 는 즉시 디코딩이 시작되고, moov 가 끝에 있으면 완료 후 시작됨
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._writer = open(path, "wb")
+        self._reader = open(path, "rb")
+        self._cond = threading.Condition()
+        self._available = 0
+        self._total: Optional[int] = None
+        self._finished = False
+        self._pos = 0
+        self.error: Optional[BaseException] = None
+
+    # --- 다운로드 측 ---------------------------------------------------------
+    def set_total(self, total: Optional[int]) -> None:
+        with self._cond:
+            self._total = total
+            self._cond.notify_all()
+
+    def append(self, chunk: bytes) -> None:
+        self._writer.write(chunk)
+        self._writer.flush()
+        with self._cond:
+            self._available += len(chunk)
+            self._cond.notify_all()
+
+    def finish(self) -> None:
+        self._writer.close()
+        with self._cond:
+            self._finished = True
+            self._total = self._available
+            self._cond.notify_all()
+
+    def fail(self, error: BaseException) -> None:
+        if not self._writer.closed:
+            self._writer.close()
+        with self._cond:
+            self.error = error
+            self._finished = True
+            self._cond.notify_all()
+
+    def wait_complete(self) -> None:
+        with self._cond:
+            self._cond.wait_for(lambda: self._finished)
+
+    # --- 디코딩 측 (io.BufferedIOBase) ---------------------------------------
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        with self._cond:
+            if size is None or size < 0:
+                self._cond.wait_for(lambda: self._finished)
+            else:
+                self._cond.wait_for(lambda: self._finished or self._available >= self._pos + size)
+            if self.error is not None:
+                # 다운로드 실패 시 EOF 로 처리 (오류는 호출 측에서 error 로 확인)
+                return b""
+            end = self._available if size is None or size < 0 else min(self._available, self._pos + size)
+        self._reader.seek(self._pos)
+        data = self._reader.read(end - self._pos)
+        self._pos += len(data)
+        return data
+
+    def read1(self, size: int = -1) -> bytes:
+        return self.read(size)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        elif whence == io.SEEK_END:
+            with self._cond:
+                self._cond.wait_for(lambda: self._total is not None or self._finished)
+                total = self._total if self._total is not None else self._available
+            self._pos = total + offset
+        else:
+            raise ValueError(f"invalid whence: {whence}")
+        self._pos = max(0, self._pos)
+        return self._pos
+
+    def close(self) -> None:
+        if not self._writer.closed:
+            self._writer.close()
+        self._reader.close()
+        super().close()
+
+
+def sample_indices(total: int, count: int) -> List[int]:
+    """
+    전체 total 프레임 중 count 장을 고르게 선택한 인덱스 (선형 샘플링)
+    - count == 1: 가운데 프레임
+    - total <= count: 전체 프레임
+    """
+    if count <= 0 or total <= 0:
+        return []
+    if count == 1:
+        return [total // 2]
+    if total <= count:
+        return list(range(total))
+    # ? 정수 연산으로 계산 (부동소수점 오차로 인덱스가 하나 작아지는 것 방지)
+    return ((np.arange(count) * (total - 1)) // (count - 1)).tolist()
+
+
+def _open_capture(video_source: VideoSource) -> cv2.VideoCapture:
+    """
+    경로 또는 StreamingVideoBuffer 로 VideoCapture 생성
+    ? 스트림 입력을 지원하지 않는 OpenCV 빌드(4.9 미만)는 다운로드 완료 후 파일 경로로 폴백
+    """
+    if isinstance(video_source, StreamingVideoBuffer):
+        try:
+            cap = cv2.VideoCapture(video_source, cv2.CAP_FFMPEG, [])
+            if cap.isOpened():
+                return cap
+            cap.release()
+        except (TypeError, cv2.error):
+            pass
+        video_source.wait_complete()
+        if video_source.error is not None:
+            raise IOError(f"비디오 다운로드 실패: {video_source.error}")
+        return cv2.VideoCapture(video_source.path)
+    return cv2.VideoCapture(video_source)
+
+
+def _count_frames(cap: cv2.VideoCapture, video_source: VideoSource) -> "tuple[int, cv2.VideoCapture]":
+    """
+    컨테이너 메타데이터로 전체 프레임 수 확인
+    ? 메타데이터가 없으면 grab() 으로 끝까지 세고 캡처를 다시 열어 반환
+    ! 메타데이터 값은 추정치일 수 있음 (실제보다 짧으면 iter_frames 는 디코딩된 만큼만 반환)
+    """
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    if total > 0:
+        return total, cap
+
+    while cap.grab():
+        total += 1
+    cap.release()
+    if isinstance(video_source, StreamingVideoBuffer):
+        # 끝까지 읽었으므로 다운로드는 완료된 상태
+        video_source.wait_complete()
+        return total, cv2.VideoCapture(video_source.path)
+    return total, cv2.VideoCapture(video_source)
+
+
+def _video_info(cap: cv2.VideoCapture, frame_count: Optional[int]) -> Dict[str, Any]:
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    return {
+        "frame_count": frame_count,
+        "fps": fps if fps > 0 else None,
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or None,
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or None,
+    }
+
+
+def probe_video(path: str) -> Dict[str, Any]:
+    """
+    비디오 메타데이터 조회 (frame_count, fps, width, height / 알 수 없으면 None)
+    """
+    cap = cv2.VideoCapture(path)
+    try:
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) if cap.isOpened() else 0
+        return _video_info(cap, total if total > 0 else None)
+    finally:
+        cap.release()
+
+
+def iter_frames(
+    video_source: VideoSource,
+    frame_skip: int = 1,
+    encode: bool = True,
+    window: Optional[int] = None,
+    quality: Optional[int] = None,
+    sample_count: Optional[int] = None,
+    on_start: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Iterator[Frame]:
+    """
+    비디오 프레임을 순서대로 생성하는 제너레이터
+
+    Args:
+        video_source: 비디오 파일 경로 또는 다운로드 중인 StreamingVideoBuffer
+        frame_skip: N 프레임마다 1장씩 추출
+        encode: True 면 JPEG 바이트, False 면 디코딩된 BGR 배열 반환
+        window: 소비 측보다 앞서 디코딩해 둘 최대 프레임 수 (메모리 상한)
+        quality: JPEG 품질 (encode=True 일 때)
+        sample_count: 지정 시 전체에서 고르게 sample_count 장만 반환 (sample_indices 기준, frame_skip 무시)
+            선택되지 않은 프레임은 grab() 으로 건너뛰어 색 변환/JPEG 인코딩을 하지 않음
+            ! 메타데이터 프레임 수가 실제보다 크면 sample_count 보다 적게 반환될 수 있음
+        on_start: 첫 프레임 전에 디코딩 스레드에서 호출되는 콜백
+            (반환 예정 frame_count, fps, width, height / 알 수 없는 값은 None)
+
+    Raises:
+        IOError: 비디오를 열 수 없는 경우
+    """
+    if window is None:
+        window = settings.FRAME_DECODE_WINDOW
+
+    cap = _open_capture(video_source)
+    if not cap.isOpened():
+        cap.release()
+        raise IOError(f"비디오 파일을 열 수 없습니다: {getattr(video_source, 'path', video_source)}")
+
+    buffer: "queue.Queue" = queue.Queue(maxsize=max(1, window))
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        # 소비 측이 중단한 경우 블로킹되지 않도록 주기적으로 확인
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def decode_worker() -> None:
+        nonlocal cap
+        frame_count = 0
+        emitted = 0
+        # 디코딩/JPEG 인코딩 누적 시간 (프레임마다 기록하지 않고 영상 1개당 한 번 기록)
+        decode_seconds = 0.0
+        encode_seconds = 0.0
+        try:
+            wanted = None
+            if sample_count is not None:
+                total, cap = _count_frames(cap, video_source)
+                wanted = set(sample_indices(total, sample_count))
+                last_wanted = max(wanted, default=-1)
+                expected = len(wanted)
+            else:
+                total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+                expected = -(-total // frame_skip) if total > 0 else None
+            if on_start:
+                on_start(_video_info(cap, expected))
+
+            while not stop.is_set():
+                if wanted is None:
+                    selected = frame_count % frame_skip == 0
+                else:
+                    if frame_count > last_wanted:
+                        break
+                    selected = frame_count in wanted
+
+                # ! 선택되지 않은 프레임은 grab() 만 수행 (retrieve/인코딩 생략)
+                started = time.perf_counter()
+                if not cap.grab():
+                    break
+                if selected:
+                    ret, frame = cap.retrieve()
+                    decode_seconds += time.perf_counter() - started
+                    if not ret:
+                        break
+                    if encode:
+                        started = time.perf_counter()
+                        item = encode_jpeg(frame, quality)
+                        encode_seconds += time.perf_counter() - started
+                    else:
+                        item = frame
+                    if not put(item):
+                        break
+                    emitted += 1
+                frame_count += 1
+            if wanted is not None and emitted < expected and not stop.is_set():
+                # ! CAP_PROP_FRAME_COUNT 는 스트리밍/조각화된 MP4·WebM 에서 추정값이라 실제보다 클 수 있음
+                # ? 같은 프레임으로 채우지 않고 디코딩된 만큼만 반환 (부족한 장수는 호출 측에서 retime 으로 보간)
+                print(f"⚠️ 메타데이터 프레임 수({total})보다 일찍 끝남: {frame_count} frames, "
+                      f"{emitted}/{expected}장만 반환")
+            error = getattr(video_source, "error", None)
+            if error is not None:
+                put(IOError(f"비디오 다운로드 실패: {error}"))
+        except Exception as e:
+            put(e)
+        finally:
+            cap.release()
+            # ? 다운로드 중인 비디오는 grab() 이 데이터 도착을 기다리므로 decode 시간에 수신 대기가 포함될 수 있음
+            stage_seconds.labels(stage="decode").observe(decode_seconds)
+            if encode:
+                stage_seconds.labels(stage="jpeg_encode").observe(encode_seconds)
+            put(_END)
+
+    # ? OpenCV 디코딩/인코딩은 GIL 을 해제하므로 소비 측(Base64 변환 등)과 병렬로 진행됨
+    worker = threading.Thread(target=decode_worker, name="frame-decoder", daemon=True)
+    worker.start()
+
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        worker.join()
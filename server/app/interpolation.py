@@ -0,0 +1,118 @@
+"""
+Interpolation Module - 광학 흐름(Optical Flow) 기반 중간 프레임 합성
+
+두 프레임 사이의 양방향 흐름(Farneback)을 한 번 계산한 뒤,
+원하는 시점 t 마다 양쪽 프레임을 흐름을 따라 옮겨(remap) 섞어서 중간 프레임을 만듭니다.
+    F(t→0) ≈ t · F(1→0),  F(t→1) ≈ (1 - t) · F(0→1)
+    I(t) = (1 - t) · warp(I0, F(t→0)) + t · warp(I1, F(t→1))
+흐름은 축소한 회색조 이미지에서 계산하고 원본 크기로 확대하므로 CPU 에서도 수 초 안에 끝납니다.
+
+원격 생성 없이 구간을 채우는 로컬 재생성 모드와, 리타이밍(retiming.py)의 flow 방식에 사용합니다.
+JPEG 바이트 입출력 함수(*_jpeg)는 미디어 워커에서 실행할 수 있도록 모듈 최상위 함수로 둡니다.
+"""
+from typing import List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+from config.settings import settings
+from app.frames import decode_image, encode_jpeg
+
+
+class FlowPair:
+    """
+    두 프레임 사이의 양방향 광학 흐름 (한 번 계산 후 여러 시점에 재사용)
+    """
+
+    def __init__(self, start: np.ndarray, end: np.ndarray, max_side: Optional[int] = None):
+        """
+        Args:
+            start, end: BGR 프레임 (크기가 다르면 end 를 start 크기로 맞춤)
+            max_side: 흐름 계산 해상도의 긴 변 길이 (작을수록 빠르고 거침)
+        """
+        height, width = start.shape[:2]
+        if end.shape[:2] != (height, width):
+            end = cv2.resize(end, (width, height), interpolation=cv2.INTER_AREA)
+        self.start = start
+        self.end = end
+
+        if max_side is None:
+            max_side = settings.INTERPOLATION_FLOW_MAX_SIDE
+        scale = min(1.0, max_side / max(height, width))
+        self.forward = self._flow(start, end, scale)   # F(0→1)
+        self.backward = self._flow(end, start, scale)  # F(1→0)
+
+        # 원본 좌표 격자 (remap 기준)
+        self._grid_x, self._grid_y = np.meshgrid(
+            np.arange(width, dtype=np.float32), np.arange(height, dtype=np.float32)
+        )
+
+    def at(self, t: float) -> np.ndarray:
+        """시점 t (0 = start, 1 = end) 의 중간 프레임"""
+        if t <= 0.0:
+            return self.start.copy()
+        if t >= 1.0:
+            return self.end.copy()
+        from_start = self._warp(self.start, self.backward, t)
+        from_end = self._warp(self.end, self.forward, 1.0 - t)
+        return cv2.addWeighted(from_start, 1.0 - t, from_end, t, 0.0)
+
+    def frames(self, times: Sequence[float]) -> List[np.ndarray]:
+        return [self.at(float(t)) for t in times]
+
+    # -------------------------------------------------------------------------
+    # 내부 유틸리티
+    # -------------------------------------------------------------------------
+    def _warp(self, frame: np.ndarray, flow: np.ndarray, amount: float) -> np.ndarray:
+        # ! 역방향 매핑: 출력 픽셀 x 는 frame 의 x + amount · flow(x) 위치에서 가져옴
+        # ? remap 은 float32 좌표만 받으므로 amount 가 numpy 스칼라여도 float32 유지
+        amount = np.float32(amount)
+        map_x = self._grid_x + amount * flow[..., 0]
+        map_y = self._grid_y + amount * flow[..., 1]
+        return cv2.remap(frame, map_x, map_y, cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+
+    @staticmethod
+    def _flow(source: np.ndarray, target: np.ndarray, scale: float) -> np.ndarray:
+        height, width = source.shape[:2]
+        a = cv2.cvtColor(source, cv2.COLOR_BGR2GRAY)
+        b = cv2.cvtColor(target, cv2.COLOR_BGR2GRAY)
+        if scale < 1.0:
+            size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            a = cv2.resize(a, size, interpolation=cv2.INTER_AREA)
+            b = cv2.resize(b, size, interpolation=cv2.INTER_AREA)
+
+        flow = cv2.calcOpticalFlowFarneback(
+            a, b, None,
+            pyr_scale=0.5, levels=4, winsize=21, iterations=3,
+            poly_n=7, poly_sigma=1.5, flags=cv2.OPTFLOW_FARNEBACK_GAUSSIAN
+        )
+        if scale < 1.0:
+            # 원본 해상도로 확대 (흐름 벡터 길이도 같은 비율로 확대)
+            flow = cv2.resize(flow, (width, height), interpolation=cv2.INTER_LINEAR) / scale
+        return flow
+
+
+def inbetween(start: np.ndarray, end: np.ndarray, count: int) -> List[np.ndarray]:
+    """
+    start 와 end 사이를 고르게 나눈 중간 프레임 count 장 (양 끝 프레임 제외)
+    """
+    if count <= 0:
+        return []
+    times = np.arange(1, count + 1, dtype=np.float64) / (count + 1)
+    return FlowPair(start, end).frames(times)
+
+
+# -----------------------------------------------------------------------------
+# JPEG 바이트 입출력 (미디어 워커 실행용)
+# -----------------------------------------------------------------------------
+def _decode_all(images: Sequence[bytes]) -> List[np.ndarray]:
+    decoded = [decode_image(image) for image in images]
+    if any(frame is None for frame in decoded):
+        raise ValueError("이미지를 디코딩할 수 없습니다")
+    return decoded
+
+
+def inbetween_jpeg(start: bytes, end: bytes, count: int, quality: Optional[int] = None) -> List[bytes]:
+    """JPEG 키 프레임 사이의 중간 프레임 count 장 (JPEG 바이트)"""
+    start_frame, end_frame = _decode_all([start, end])
+    return [encode_jpeg(frame, quality) for frame in inbetween(start_frame, end_frame, count)]
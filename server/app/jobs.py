@@ -0,0 +1,193 @@
+"""
+Jobs Module - 비동기 작업(Job) 관리
+
+/generate-video 처럼 수 분 이상 걸리는 작업을 요청-응답 사이클에서 분리합니다.
+POST 요청은 job_id 만 즉시 반환하고, 실제 작업은 백그라운드 태스크로 실행됩니다.
+클라이언트는 상태 조회(GET /jobs/{id}) 또는 SSE 스트림(GET /jobs/{id}/events)으로 진행 상황을 확인합니다.
+"""
+import asyncio
+import contextvars
+import json
+import time
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from config.settings import settings
+
+# 현재 실행 중인 작업의 job_id (작업 태스크 안에서만 설정됨)
+current_job_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_job_id", default=None)
+
+
+class Job:
+    """
+    단일 작업의 상태 및 결과 보관 객체
+    """
+
+    # 작업 상태 값
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    def __init__(self, kind: str, project_name: str, job_id: Optional[str] = None):
+        self.job_id = job_id or uuid.uuid4().hex
+        self.kind = kind
+        self.project_name = project_name
+        self.status = Job.QUEUED
+        self.stage = "queued"
+        self.progress: Dict[str, Any] = {}
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.finished_at: Optional[float] = None
+        # SSE 구독자별 이벤트 큐
+        self._subscribers: List[asyncio.Queue] = []
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (Job.SUCCEEDED, Job.FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """상태 조회 응답용 직렬화 (결과 본문 제외)"""
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "project_name": self.project_name,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": self.progress,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobManager:
+    """
+    작업 등록, 실행, 상태 조회, 진행 이벤트 발행을 담당하는 클래스
+    """
+
+    def __init__(self, result_ttl: int):
+        self._result_ttl = result_ttl
+        self._jobs: Dict[str, Job] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._purge_expired()
+        return self._jobs.get(job_id)
+
+    def submit(
+        self,
+        kind: str,
+        project_name: str,
+        func: Callable[..., Awaitable[Dict[str, Any]]],
+        *args: Any,
+        job_id: Optional[str] = None,
+        **kwargs: Any
+    ) -> Job:
+        """
+        코루틴 함수를 작업으로 등록하고 즉시 Job 반환
+        ! 블로킹 구간(OpenCV, 파일 입출력)은 func 안에서 스레드/미디어 워커로 넘겨야 함 (이벤트 루프에서 실행됨)
+
+        func 는 progress_callback 키워드 인자를 받아 진행 상황을 보고해야 하며,
+        VideoService 와 동일한 {"status": ..., "data"/"message": ...} 딕셔너리를 반환합니다.
+        job_id 지정 시 해당 ID 로 등록 (재시작 후 이어서 처리하는 작업에 기존 ID 유지)
+        """
+        self._purge_expired()
+
+        job = Job(kind, project_name, job_id)
+        self._jobs[job.job_id] = job
+
+        loop = asyncio.get_running_loop()
+
+        def progress_callback(stage: str, **info: Any) -> None:
+            # 워커 스레드에서도 호출될 수 있으므로 이벤트 루프 스레드로 넘겨서 상태 갱신
+            loop.call_soon_threadsafe(self._update, job, stage, info)
+
+        async def runner() -> None:
+            current_job_id.set(job.job_id)
+            self._set_status(job, Job.RUNNING, "running")
+            try:
+                result = await func(*args, progress_callback=progress_callback, **kwargs)
+            except Exception as e:
+                job.error = str(e)
+                self._set_status(job, Job.FAILED, "failed")
+                return
+            finally:
+                self._tasks.pop(job.job_id, None)
+
+            job.result = result
+            if result.get("status") == "success":
+                self._set_status(job, Job.SUCCEEDED, "done")
+            else:
+                job.error = result.get("message")
+                self._set_status(job, Job.FAILED, "failed")
+
+        self._tasks[job.job_id] = asyncio.create_task(runner())
+        print(f"🧾 작업 등록: {job.job_id} ({kind}, {project_name})")
+        return job
+
+    async def events(self, job: Job) -> AsyncIterator[str]:
+        """
+        SSE(text/event-stream) 형식의 진행 이벤트 스트림
+        현재 상태를 먼저 보낸 뒤, 작업이 끝날 때까지 변경 사항을 전달합니다.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        job._subscribers.append(queue)
+        try:
+            yield self._format_event(job)
+            while not job.is_finished:
+                try:
+                    await asyncio.wait_for(queue.get(), timeout=settings.JOB_SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # ? 프록시 유휴 연결 종료 방지를 위한 주석 라인
+                    yield ": keep-alive\n\n"
+                    continue
+                yield self._format_event(job)
+        finally:
+            job._subscribers.remove(queue)
+
+    # -------------------------------------------------------------------------
+    # 내부 유틸리티
+    # -------------------------------------------------------------------------
+    def _update(self, job: Job, stage: str, info: Dict[str, Any]) -> None:
+        # 스레드에서 예약된 보고가 종료 이후 도착할 수 있으므로 무시
+        if job.is_finished:
+            return
+        job.stage = stage
+        job.progress = info
+        job.updated_at = time.time()
+        self._notify(job)
+
+    def _set_status(self, job: Job, status: str, stage: str) -> None:
+        job.status = status
+        job.stage = stage
+        job.updated_at = time.time()
+        if job.is_finished:
+            job.finished_at = job.updated_at
+            print(f"🧾 작업 종료: {job.job_id} ({status})")
+        self._notify(job)
+
+    def _notify(self, job: Job) -> None:
+        for queue in job._subscribers:
+            queue.put_nowait(job.status)
+
+    def _format_event(self, job: Job) -> str:
+        event = "done" if job.is_finished else "progress"
+        return f"event: {event}\ndata: {json.dumps(job.to_dict(), ensure_ascii=False)}\n\n"
+
+    def _purge_expired(self) -> None:
+        """TTL 이 지난 완료 작업 정리 (결과 본문이 커서 메모리에 오래 두지 않음)"""
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.is_finished and job.finished_at and now - job.finished_at > self._result_ttl
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+# 싱글톤 인스턴스
+job_manager = JobManager(result_ttl=settings.JOB_RESULT_TTL_SECONDS)
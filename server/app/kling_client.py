@@ -0,0 +1,261 @@
+"""
+Kling Client Module - Kling AI API 비동기 HTTP 클라이언트
+
+커넥션 풀(keep-alive)을 재사용하여 작업 요청, 상태 조회, 결과 다운로드 시
+매번 TCP/TLS 연결을 새로 맺지 않도록 합니다.
+JWT 토큰은 만료 직전까지 캐시하여 재사용합니다.
+"""
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from config.settings import settings
+
+# HTTP/2 는 h2 패키지가 설치된 경우에만 활성화 (선택 의존성)
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class KlingAPIError(Exception):
+    """Kling API 가 오류 응답을 반환했을 때 발생하는 예외"""
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        body: str = "",
+        retry_after: Optional[float] = None
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = body
+        # 429 응답의 Retry-After 헤더 값 (초)
+        self.retry_after = retry_after
+
+
+class KlingClient:
+    """
+    Kling AI image2video API 비동기 클라이언트
+    """
+
+    IMAGE2VIDEO_PATH = "/v1/videos/image2video"
+
+    def __init__(
+        self,
+        access_key: str,
+        secret_key: str,
+        base_url: str,
+        connect_timeout: float = 10.0,
+        submit_timeout: float = 120.0,
+        status_timeout: float = 10.0,
+        download_timeout: float = 60.0,
+        max_connections: int = 20,
+        token_ttl: int = 1800,
+        token_refresh_margin: int = 300,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Args:
+            base_url: API 베이스 URL (로컬 대체 서버로 교체하여 테스트 가능)
+            transport: httpx 전송 계층 주입용 (테스트 시 httpx.MockTransport 등)
+        """
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.base_url = base_url.rstrip("/")
+        self.connect_timeout = connect_timeout
+        self.submit_timeout = submit_timeout
+        self.status_timeout = status_timeout
+        self.download_timeout = download_timeout
+        self.max_connections = max_connections
+        self.token_ttl = token_ttl
+        self.token_refresh_margin = token_refresh_margin
+        self._transport = transport
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._token: str = ""
+        self._token_expires_at: float = 0.0
+
+    @property
+    def image2video_url(self) -> str:
+        return f"{self.base_url}{self.IMAGE2VIDEO_PATH}"
+
+    # -------------------------------------------------------------------------
+    # 연결 및 인증
+    # -------------------------------------------------------------------------
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        이벤트 루프별 공유 AsyncClient 반환
+        ? 커넥션 풀은 생성된 루프에 묶이므로 루프가 바뀌면(스크립트의 asyncio.run 등) 새로 생성
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=httpx.Timeout(self.status_timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                transport=self._transport
+            )
+            self._client_loop = loop
+        return self._client
+
+    def _get_token(self) -> str:
+        """
+        Kling AI API 인증용 JWT 반환 (만료 refresh_margin 초 전까지 캐시 재사용)
+        """
+        import jwt
+
+        now = time.time()
+        if self._token and now < self._token_expires_at - self.token_refresh_margin:
+            return self._token
+
+        if not self.access_key or not self.secret_key:
+            print("❌ Error: KLING_ACCESS_KEY or KLING_SECRET_KEY is missing!")
+            return ""
+
+        headers = {
+            "alg": "HS256",
+            "typ": "JWT"
+        }
+        expires_at = int(now) + self.token_ttl
+        payload = {
+            "iss": self.access_key,
+            "exp": expires_at,
+            "nbf": int(now) - 5
+        }
+
+        token = jwt.encode(payload, self.secret_key.strip(), algorithm="HS256", headers=headers)
+        if isinstance(token, bytes):
+            token = token.decode('utf-8')
+
+        self._token = token
+        self._token_expires_at = expires_at
+        return token
+
+    def _auth_headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self._get_token()}",
+            "Content-Type": "application/json"
+        }
+
+    # -------------------------------------------------------------------------
+    # API 호출
+    # -------------------------------------------------------------------------
+    async def submit_image2video(self, payload: Dict[str, Any]) -> str:
+        """
+        image2video 작업 요청 후 task_id 반환
+        """
+        client = self._get_client()
+        response = await client.post(
+            self.image2video_url,
+            headers=self._auth_headers(),
+            json=payload,
+            timeout=httpx.Timeout(self.submit_timeout, connect=self.connect_timeout)
+        )
+
+        if response.status_code == 400:
+            print(">>> 400 Bad Request 서버 응답 상세:")
+            print(response.text)
+            raise KlingAPIError("Kling API 요청 오류 (400)", 400, response.text)
+        await self._raise_for_status(response)
+
+        result = response.json()
+        task_id = result.get("data", {}).get("task_id")
+        if not task_id:
+            raise KlingAPIError(f"작업 ID를 가져올 수 없습니다: {result}", response.status_code, response.text)
+        return task_id
+
+    async def get_task(self, task_id: str) -> Dict[str, Any]:
+        """
+        작업 상태 조회 (응답 JSON 전체 반환)
+        """
+        client = self._get_client()
+        response = await client.get(
+            f"{self.image2video_url}/{task_id}",
+            headers=self._auth_headers()
+        )
+        await self._raise_for_status(response)
+        return response.json()
+
+    async def download(self, url: str, output_path: str, chunk_size: int = 64 * 1024) -> str:
+        """
+        결과 비디오를 스트리밍으로 파일에 저장
+        """
+        client = self._get_client()
+        tmp_path = f"{output_path}.part"
+        try:
+            async with client.stream(
+                "GET",
+                url,
+                timeout=httpx.Timeout(self.download_timeout, connect=self.connect_timeout)
+            ) as response:
+                await self._raise_for_status(response)
+                with open(tmp_path, "wb") as f:
+                    async for chunk in response.aiter_bytes(chunk_size):
+                        f.write(chunk)
+            os.replace(tmp_path, output_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return output_path
+
+    async def stream_to(self, url: str, sink: Any, chunk_size: int = 256 * 1024) -> None:
+        """
+        결과 비디오를 받는 대로 sink 에 전달 (다운로드 중 디코딩용)
+
+        sink 는 set_total(Content-Length 또는 None), append(chunk), finish() 를 제공해야 하며
+        (frames.StreamingVideoBuffer), 실패 시 예외는 호출 측에서 sink.fail() 로 전달합니다.
+        """
+        client = self._get_client()
+        async with client.stream(
+            "GET",
+            url,
+            timeout=httpx.Timeout(self.download_timeout, connect=self.connect_timeout)
+        ) as response:
+            await self._raise_for_status(response)
+            length = response.headers.get("Content-Length")
+            sink.set_total(int(length) if length and length.isdigit() else None)
+            async for chunk in response.aiter_bytes(chunk_size):
+                sink.append(chunk)
+        sink.finish()
+
+    async def aclose(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    async def _raise_for_status(self, response: httpx.Response) -> None:
+        if response.status_code >= 400:
+            # 스트리밍 응답은 본문을 먼저 읽어야 오류 내용을 확인 가능
+            await response.aread()
+            retry_after = response.headers.get("Retry-After")
+            raise KlingAPIError(
+                f"Kling API 오류 응답: {response.status_code}",
+                response.status_code,
+                response.text,
+                retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None
+            )
+
+
+# 싱글톤 인스턴스
+kling_client = KlingClient(
+    access_key=settings.KLING_ACCESS_KEY,
+    secret_key=settings.KLING_SECRET_KEY,
+    base_url=settings.KLING_API_BASE_URL,
+    connect_timeout=settings.KLING_CONNECT_TIMEOUT,
+    submit_timeout=settings.KLING_SUBMIT_TIMEOUT,
+    status_timeout=settings.KLING_STATUS_TIMEOUT,
+    download_timeout=settings.KLING_DOWNLOAD_TIMEOUT,
+    max_connections=settings.KLING_MAX_CONNECTIONS,
+    token_ttl=settings.KLING_TOKEN_TTL_SECONDS,
+    token_refresh_margin=settings.KLING_TOKEN_REFRESH_MARGIN_SECONDS
+)
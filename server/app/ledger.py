@@ -0,0 +1,202 @@
+"""
+Ledger Module - Kling 작업(task) 영구 기록
+
+제출한 Kling 작업의 task_id, 입력 해시(캐시 키), 상태, 결과 URL 을 SQLite 파일에 기록합니다.
+서버가 폴링/다운로드 도중 재시작되어도 기록된 작업을 이어서 처리하므로
+이미 비용이 청구된 작업을 다시 제출하거나 수 분간 다시 생성할 필요가 없습니다.
+
+상태 흐름:
+    submitted (폴링 중) → succeeded (결과 URL 확보, 다운로드 대기) → completed (결과 캐시 저장)
+                        ↘ failed
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from config.settings import settings
+
+
+class LedgerEntry:
+    """
+    기록된 Kling 작업 1건
+    """
+
+    # 작업 상태 값
+    SUBMITTED = "submitted"
+    SUCCEEDED = "succeeded"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+    # 재시작 시 이어서 처리할 상태
+    PENDING = (SUBMITTED, SUCCEEDED)
+
+    def __init__(self, row: sqlite3.Row):
+        self.task_id: str = row["task_id"]
+        self.cache_key: str = row["cache_key"]
+        self.project_name: str = row["project_name"]
+        self.poll_key: str = row["poll_key"]
+        self.job_id: Optional[str] = row["job_id"]
+        self.status: str = row["status"]
+        self.video_url: Optional[str] = row["video_url"]
+        self.error: Optional[str] = row["error"]
+        self.created_at: float = row["created_at"]
+        self.updated_at: float = row["updated_at"]
+
+    @property
+    def is_pending(self) -> bool:
+        return self.status in LedgerEntry.PENDING
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "task_id": self.task_id,
+            "cache_key": self.cache_key,
+            "project_name": self.project_name,
+            "job_id": self.job_id,
+            "status": self.status,
+            "video_url": self.video_url,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+class TaskLedger:
+    """
+    SQLite 기반 Kling 작업 기록 (프로세스 재시작 후에도 유지)
+    """
+
+    def __init__(self, path: str, retention: float, enabled: bool = True):
+        """
+        Args:
+            path: SQLite 파일 경로
+            retention: 완료/실패 기록 보관 시간 (초)
+            enabled: False 면 모든 기록 요청 무시
+        """
+        self.path = path
+        self.retention = retention
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.enabled:
+            self._open()
+
+    def record_submitted(
+        self,
+        task_id: str,
+        cache_key: str,
+        project_name: str,
+        poll_key: str,
+        job_id: Optional[str] = None
+    ) -> None:
+        """작업 제출 직후 기록 (! 폴링 시작 전에 기록해야 재시작 시 이어서 처리 가능)"""
+        now = time.time()
+        self._execute(
+            "INSERT OR REPLACE INTO tasks "
+            "(task_id, cache_key, project_name, poll_key, job_id, status, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (task_id, cache_key, project_name, poll_key, job_id, LedgerEntry.SUBMITTED, now, now)
+        )
+
+    def mark_succeeded(self, task_id: str, video_url: str) -> None:
+        self._update(task_id, LedgerEntry.SUCCEEDED, video_url=video_url)
+
+    def mark_completed(self, task_id: str) -> None:
+        self._update(task_id, LedgerEntry.COMPLETED)
+
+    def mark_failed(self, task_id: str, error: Optional[str]) -> None:
+        self._update(task_id, LedgerEntry.FAILED, error=error)
+
+    def get(self, task_id: str) -> Optional[LedgerEntry]:
+        rows = self._query("SELECT * FROM tasks WHERE task_id = ?", (task_id,))
+        return rows[0] if rows else None
+
+    def find_pending(self, cache_key: str) -> Optional[LedgerEntry]:
+        """같은 입력으로 제출되어 아직 끝나지 않은 작업 조회 (재제출 대신 이어서 사용)"""
+        rows = self._query(
+            "SELECT * FROM tasks WHERE cache_key = ? AND status IN (?, ?) "
+            "ORDER BY created_at DESC LIMIT 1",
+            (cache_key, *LedgerEntry.PENDING)
+        )
+        return rows[0] if rows else None
+
+    def pending(self) -> List[LedgerEntry]:
+        """재시작 시 이어서 처리할 작업 목록 (제출 순)"""
+        return self._query(
+            "SELECT * FROM tasks WHERE status IN (?, ?) ORDER BY created_at",
+            LedgerEntry.PENDING
+        )
+
+    def list(self, limit: int = 100) -> List[LedgerEntry]:
+        return self._query("SELECT * FROM tasks ORDER BY created_at DESC LIMIT ?", (limit,))
+
+    def prune(self) -> int:
+        """보관 시간이 지난 완료/실패 기록 삭제, 삭제 건수 반환"""
+        cursor = self._execute(
+            "DELETE FROM tasks WHERE status IN (?, ?) AND updated_at < ?",
+            (LedgerEntry.COMPLETED, LedgerEntry.FAILED, time.time() - self.retention)
+        )
+        return cursor.rowcount if cursor else 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # -------------------------------------------------------------------------
+    # 내부 유틸리티
+    # -------------------------------------------------------------------------
+    def _open(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # ? 이벤트 루프와 작업 스레드에서 함께 사용하므로 잠금으로 직렬화
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            " task_id TEXT PRIMARY KEY,"
+            " cache_key TEXT NOT NULL,"
+            " project_name TEXT NOT NULL,"
+            " poll_key TEXT NOT NULL,"
+            " job_id TEXT,"
+            " status TEXT NOT NULL,"
+            " video_url TEXT,"
+            " error TEXT,"
+            " created_at REAL NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS tasks_cache_key ON tasks (cache_key, status)")
+
+    def _update(self, task_id: str, status: str, **fields: Any) -> None:
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        sql = f"UPDATE tasks SET status = ?, updated_at = ?{', ' + assignments if fields else ''} WHERE task_id = ?"
+        self._execute(sql, (status, time.time(), *fields.values(), task_id))
+
+    def _execute(self, sql: str, params: tuple = ()) -> Optional[sqlite3.Cursor]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            if self._conn is None:
+                return None
+            return self._conn.execute(sql, params)
+
+    def _query(self, sql: str, params: tuple = ()) -> List[LedgerEntry]:
+        if not self.enabled:
+            return []
+        with self._lock:
+            if self._conn is None:
+                return []
+            return [LedgerEntry(row) for row in self._conn.execute(sql, params).fetchall()]
+
+
+# 싱글톤 인스턴스
+task_ledger = TaskLedger(
+    path=settings.TASK_LEDGER_PATH,
+    retention=settings.TASK_LEDGER_RETENTION_SECONDS,
+    enabled=settings.TASK_LEDGER_ENABLED
+)
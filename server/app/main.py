@@ -6,23 +6,65 @@
 
 import sys
 import os
+import asyncio
+import itertools
+from contextlib import asynccontextmanager
+from urllib.parse import quote
 
 # 상위 경로를 시스템 경로에 추가
 # ! 타 폴더 모듈 참조 환경 구축
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fastapi import FastAPI, UploadFile, File, Form
+from fastapi import FastAPI, UploadFile, File, Form, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 import uvicorn
 from config.settings import settings
 from app.services import VideoService
-from pydantic import BaseModel
-from typing import List
+from app.jobs import job_manager
+from app.kling_client import kling_client
+from app.cache import result_cache
+from app.frame_store import frame_store
+from app.result_store import result_store
+from app.workspace import workspace_manager, WorkspaceQuotaError
+from app.ledger import task_ledger
+from app.workers import media_pool, MediaPoolBusyError
+from app.scheduler import kling_scheduler, SchedulerBusyError
+from app.video_codecs import codec_registry
+from app.metrics import CONTENT_TYPE, MetricsMiddleware, record_error, registry, track_stage
+from app.tracing import TracingMiddleware, trace_store
+from app import transport
+from pydantic import BaseModel, Field, PositiveFloat, ValidationError
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Type, TypeVar, Union
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    서버 시작/종료 시 공용 리소스 관리
+    """
+    # 이전 실행의 결과 파일 정리 (목록은 메모리에만 있으므로 재시작 후에는 참조 불가)
+    result_store.clear()
+    # 재시작 전에 진행 중이던 Kling 작업 이어서 처리
+    VideoService.resume_pending_tasks()
+    # 사용 가능 코덱 미리 시험 (첫 렌더링 지연 방지, 미디어 워커 프로세스는 각자 한 번 시험)
+    codec_registry.available()
+    # 방치된 작업 디렉토리 주기적 회수 (시작 직후 1회: 이전 실행이 남긴 디렉토리)
+    janitor = asyncio.create_task(workspace_manager.run_janitor())
+    yield
+    janitor.cancel()
+    # Kling API 커넥션 풀, 미디어 워커, 작업 기록 정리
+    await kling_client.aclose()
+    media_pool.shutdown()
+    task_ledger.close()
 
 # 1. FastAPI 앱(서버) 만들기
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    version=settings.VERSION
+    version=settings.VERSION,
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -35,6 +77,129 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 엔드포인트별 요청 수, 수신/송신 바이트 지표
+app.add_middleware(MetricsMiddleware)
+
+# X-Trace / X-Profile 헤더 요청 추적 (TRACING_ENABLED=True 일 때만)
+app.add_middleware(TracingMiddleware)
+
+# 다른 모듈 현황은 /metrics 조회 시점에 stats() 로 읽음
+registry.callback(
+    "kling_tasks_in_flight", "진행 중인 Kling 작업 수",
+    lambda: kling_scheduler.stats()["in_flight"]
+)
+registry.callback(
+    "kling_tasks_waiting", "Kling 대기열에서 기다리는 요청 수",
+    lambda: kling_scheduler.stats()["waiting"]
+)
+registry.callback(
+    "cache_lookups_total", "결과 캐시 조회 수 (result=hit/miss)",
+    lambda: {"hit": result_cache.stats()["hits"], "miss": result_cache.stats()["misses"]},
+    kind="counter", labelname="result"
+)
+registry.callback(
+    "cache_hit_ratio", "결과 캐시 적중률 (서버 시작 이후 누적)",
+    lambda: result_cache.stats()["hit_rate"]
+)
+registry.callback(
+    "media_pool_pending", "미디어 워커에서 실행/대기 중인 작업 수",
+    lambda: media_pool.stats()["pending"]
+)
+registry.callback(
+    "result_store_bytes", "결과 보관소 사용량 (바이트)",
+    lambda: result_store.stats()["bytes"]
+)
+registry.callback(
+    "workspace_bytes", "임시 작업 디렉토리 사용량 (바이트)",
+    workspace_manager.usage
+)
+
+@app.exception_handler(MediaPoolBusyError)
+async def media_pool_busy_handler(request: Request, exc: MediaPoolBusyError):
+    """미디어 워커 대기열 초과 시 503 + Retry-After"""
+    record_error("media_pool_busy")
+    return JSONResponse(
+        status_code=503,
+        content={"status": "error", "message": str(exc)},
+        headers={"Retry-After": str(int(exc.retry_after))}
+    )
+
+@app.exception_handler(WorkspaceQuotaError)
+async def workspace_quota_handler(request: Request, exc: WorkspaceQuotaError):
+    """임시 작업 공간 용량 초과 시 503 + Retry-After"""
+    record_error("workspace_quota")
+    return JSONResponse(
+        status_code=503,
+        content={"status": "error", "message": str(exc)},
+        headers={"Retry-After": str(int(exc.retry_after))}
+    )
+
+@app.exception_handler(SchedulerBusyError)
+async def scheduler_busy_handler(request: Request, exc: SchedulerBusyError):
+    """Kling 작업 대기열 초과 시 429 + Retry-After"""
+    record_error("scheduler_busy")
+    return JSONResponse(
+        status_code=429,
+        content={"status": "error", "message": str(exc)},
+        headers={"Retry-After": str(int(exc.retry_after))}
+    )
+
+# --- 전송 형식 협상 (JSON Base64 / 바이너리 프레임 컨테이너) ---
+
+async def _respond(request: Request, result: Dict[str, Any]) -> Any:
+    """
+    Accept 헤더에 따라 서비스 결과를 직렬화
+    ? application/x-anime-frames 요청 시 바이너리 컨테이너, 그 외에는 기존 Base64 JSON
+    ! 프레임 수가 많으면 Base64 변환이 오래 걸리므로 스레드에서 실행
+    """
+    if transport.wants_container(request.headers.get("accept")):
+        # ! 컨테이너는 매니페스트 다음 파트(프레임)를 하나씩 전송 (본문 전체를 메모리에 모으지 않음)
+        chunks = transport.iter_container(result)
+        with track_stage("serialize_container"):
+            manifest = await asyncio.to_thread(next, chunks)
+        return StreamingResponse(
+            itertools.chain((manifest,), chunks), media_type=transport.FRAME_CONTAINER_MIME
+        )
+    with track_stage("serialize_json"):
+        content = await asyncio.to_thread(transport.to_json, result)
+    return JSONResponse(content=content)
+
+def _stream(request: Request, events: AsyncIterator[Dict[str, Any]]) -> StreamingResponse:
+    """
+    이벤트 스트림 응답 (Accept: text/event-stream 이면 SSE, 그 외 NDJSON)
+    ? header → frame * N → done 순서로 도착하므로 클라이언트는 첫 프레임부터 바로 표시 가능
+    """
+    media_type = transport.stream_media_type(request.headers.get("accept"))
+
+    async def body():
+        async for event in events:
+            yield transport.format_stream_event(event, media_type)
+
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _parse_body(request: Request, model: Type[ModelT]) -> ModelT:
+    """
+    요청 본문(JSON 또는 프레임 컨테이너)을 Pydantic 모델로 변환
+
+    Raises:
+        RequestValidationError: 형식/필드 검증 실패 (422)
+    """
+    body = await request.body()
+    try:
+        if transport.is_container(request.headers.get("content-type")):
+            return model.model_validate(transport.decode_container(body))
+        return model.model_validate_json(body)
+    except ValueError as e:
+        # ? ValidationError 도 ValueError 하위 클래스
+        errors = e.errors() if isinstance(e, ValidationError) else [
+            {"type": "value_error", "loc": ("body",), "msg": str(e), "input": None}
+        ]
+        raise RequestValidationError(errors)
+
 # 2. 기본 접속 주소 ("/") 만들기
 @app.get("/")
 def read_root():
@@ -49,60 +214,483 @@ def read_root():
 
 @app.post("/generate-video")
 async def generate_video_endpoint(
+    request: Request,
     start_image: UploadFile = File(...),
     end_image: UploadFile = File(...),
     prompt: str = Form(...),
-    project_name: str = Form(...)
+    project_name: str = Form(...),
+    proxy: bool = Form(False) # True 면 응답 프레임은 리뷰용 저해상도 프레임
 ):
     """
-    비디오 생성 및 Base64 반환 (파일 즉시 삭제)
+    비디오 생성 및 프레임/비디오 반환 (파일 즉시 삭제)
     Service 계층에 로직 위임
     """
-    return await VideoService.generate_video(
-        start_image, end_image, prompt, project_name
+    result = await VideoService.generate_video(
+        start_image, end_image, prompt, project_name, proxy=proxy
+    )
+    return await _respond(request, result)
+
+@app.post("/generate-video/stream")
+async def generate_video_stream_endpoint(
+    request: Request,
+    start_image: UploadFile = File(...),
+    end_image: UploadFile = File(...),
+    prompt: str = Form(...),
+    project_name: str = Form(...),
+    proxy: bool = Form(False) # True 면 응답 프레임은 리뷰용 저해상도 프레임
+):
+    """
+    비디오 생성 후 프레임을 추출되는 대로 스트리밍 (NDJSON / SSE)
+    마지막 done 이벤트에 project_id, video_url 포함
+    """
+    return _stream(request, VideoService.stream_generation(
+        start_image, end_image, prompt, project_name, proxy=proxy
+    ))
+
+# --- Async Job Endpoints ---
+
+@app.post("/jobs/generate-video")
+async def submit_generate_video_job(
+    start_image: UploadFile = File(...),
+    end_image: UploadFile = File(...),
+    prompt: str = Form(...),
+    project_name: str = Form(...),
+    proxy: bool = Form(False) # True 면 응답 프레임은 리뷰용 저해상도 프레임
+):
+    """
+    비디오 생성 작업 등록 (job_id 즉시 반환)
+    결과는 /jobs/{job_id}/result 로 조회
+    """
+    return await VideoService.submit_generate_job(
+        start_image, end_image, prompt, project_name, proxy=proxy
+    )
+
+def _job_not_found(job_id: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=404,
+        content={"status": "error", "message": f"작업을 찾을 수 없습니다: {job_id}"}
     )
 
+@app.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """
+    작업 상태 및 진행 단계 조회
+    """
+    job = job_manager.get(job_id)
+    if not job:
+        return _job_not_found(job_id)
+    return {"status": "success", "data": job.to_dict()}
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str, request: Request):
+    """
+    작업 결과 조회 (완료 전에는 pending 반환)
+    """
+    job = job_manager.get(job_id)
+    if not job:
+        return _job_not_found(job_id)
+    if not job.is_finished:
+        return JSONResponse(
+            status_code=202,
+            content={"status": "pending", "data": job.to_dict()}
+        )
+    return await _respond(request, job.result or {"status": "error", "message": job.error})
+
+@app.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """
+    작업 진행 상황 SSE 스트림 (완료 시 done 이벤트 후 종료)
+    """
+    job = job_manager.get(job_id)
+    if not job:
+        return _job_not_found(job_id)
+    return StreamingResponse(
+        job_manager.events(job),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/tasks")
+def list_tasks(limit: int = 50):
+    """
+    Kling 작업 기록 조회 (최근 순, 재시작 후 이어서 처리 중인 작업은 job_id 로 결과 조회)
+    """
+    return {"status": "success", "data": [entry.to_dict() for entry in task_ledger.list(limit)]}
+
+@app.get("/cache/stats")
+def get_cache_stats():
+    """
+    생성 결과 캐시 적중/미스 통계 조회
+    """
+    return {"status": "success", "data": result_cache.stats()}
+
+@app.get("/scheduler/stats")
+def get_scheduler_stats():
+    """
+    Kling 작업 스케줄러 현황 조회 (진행 중/대기 중 작업 수, 프로젝트별 진행 수)
+    """
+    return {"status": "success", "data": kling_scheduler.stats()}
+
+@app.get("/codecs")
+def get_codecs():
+    """
+    사용 가능한 비디오 코덱과 용도별(fast/small) 선택 결과 조회
+    """
+    return {"status": "success", "data": codec_registry.stats()}
+
+@app.get("/workers/stats")
+def get_worker_stats():
+    """
+    미디어 워커 풀 사용 현황 조회 (실행/대기 중, 완료, 거절 수)
+    """
+    return {"status": "success", "data": media_pool.stats()}
+
+@app.get("/workspaces/stats")
+def get_workspace_stats():
+    """
+    임시 작업 디렉토리 현황 조회 (위치, RAM 디스크 여부, 사용량, 회수 수)
+    """
+    return {"status": "success", "data": workspace_manager.stats()}
+
+@app.get("/metrics")
+def get_metrics():
+    """
+    Prometheus 지표 (텍스트 형식): 단계별 소요 시간 히스토그램, 처리 프레임 수, 원인별 오류 수,
+    엔드포인트별 요청/바이트, 진행 중 Kling 작업 수, 캐시 적중/미스
+    """
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
+
+@app.get("/traces")
+def list_traces():
+    """
+    최근 요청 추적 목록 (X-Trace / X-Profile 헤더 요청, TRACING_ENABLED=True 일 때만 기록)
+    """
+    return {"status": "success", "data": trace_store.list()}
+
+@app.get("/traces/{trace_id}")
+def get_trace(trace_id: str):
+    """
+    요청 추적 결과 조회 (구간별 시작 시각, 소요 시간, 프레임 수/바이트 등 속성)
+    """
+    trace = trace_store.get(trace_id)
+    if trace is None:
+        return JSONResponse(
+            status_code=404,
+            content={"status": "error", "message": f"추적 결과를 찾을 수 없습니다: {trace_id}"}
+        )
+    return {"status": "success", "data": trace.to_dict()}
+
+@app.get("/traces/{trace_id}/profile")
+def get_trace_profile(trace_id: str):
+    """
+    요청 프로파일 (collapsed stack 텍스트, flamegraph.pl / speedscope 로 시각화)
+    """
+    trace = trace_store.get(trace_id)
+    if trace is None or trace.profile is None:
+        return JSONResponse(
+            status_code=404,
+            content={"status": "error", "message": f"프로파일을 찾을 수 없습니다: {trace_id}"}
+        )
+    return Response(content=trace.profile, media_type="text/plain; charset=utf-8")
+
+# --- Project Frame Store Endpoints ---
+
+def _attachment(filename: str) -> str:
+    """첨부 파일 Content-Disposition (한글 등 비 ASCII 파일명은 RFC 5987 형식)"""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+def _project_not_found(project_id: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=404,
+        content={"status": "error", "message": f"프로젝트 프레임을 찾을 수 없습니다 (만료 가능): {project_id}"}
+    )
+
+def _proxy_upload_rejected() -> JSONResponse:
+    """
+    업로드한 프레임이 리뷰용 프록시인 경우 (보관 원본 만료 후 클라이언트 폴백)
+    ! 프록시로 렌더링/재생성하면 결과가 조용히 저해상도가 되므로 거절하고 다시 생성하도록 안내
+    """
+    return JSONResponse(
+        status_code=409,
+        content={
+            "status": "error",
+            "message": "리뷰용 저해상도(프록시) 프레임으로는 원본 해상도 결과를 만들 수 없습니다. "
+                       "서버 보관 원본이 만료되었으면 다시 생성하세요."
+        }
+    )
+
+@app.get("/projects/{project_id}")
+def get_project(project_id: str):
+    """
+    서버에 보관 중인 프로젝트 프레임 정보 조회 (프레임 수, 버전, 만료 시각)
+    """
+    project = frame_store.get(project_id)
+    if not project:
+        return _project_not_found(project_id)
+    return {"status": "success", "data": project.to_dict(frame_store.ttl)}
+
+@app.get("/projects/{project_id}/frames")
+async def get_project_frames(
+    request: Request,
+    project_id: str,
+    start: int = 0,
+    end: Optional[int] = None,
+    proxy: bool = False
+):
+    """
+    보관 중인 프레임 범위 [start, end) 조회 (내보내기 등 원본 해상도가 필요할 때)
+    Accept: application/x-anime-frames 요청 시 바이너리 컨테이너
+    """
+    if not frame_store.get(project_id):
+        return _project_not_found(project_id)
+    result = VideoService.get_project_frames(project_id, start, end, proxy=proxy)
+    return await _respond(request, result)
+
+@app.get("/projects/{project_id}/frames/{index}")
+def get_project_frame(project_id: str, index: int, proxy: bool = False):
+    """
+    보관 중인 프레임 1장 조회 (image/jpeg, proxy=true 면 리뷰용 저해상도 프레임)
+    """
+    project = frame_store.get(project_id)
+    if not project:
+        return _project_not_found(project_id)
+    if not 0 <= index < len(project.frames):
+        return JSONResponse(
+            status_code=404,
+            content={"status": "error", "message": f"프레임 인덱스 범위 오류: {index}"}
+        )
+    frames = project.proxies if proxy and project.proxies is not None else project.frames
+    return Response(
+        content=frames[index],
+        media_type="image/jpeg",
+        headers={"X-Project-Version": str(project.version)}
+    )
+
+@app.get("/projects/{project_id}/frames.zip")
+def export_project_zip(project_id: str, proxy: bool = False):
+    """
+    보관 중인 프레임 전체를 ZIP 으로 스트리밍 (JPEG 무압축 저장, 만들어지는 대로 전송)
+    ! 프레임 수와 무관하게 서버 메모리 사용량 일정 (브라우저에서 ZIP 을 만들 필요 없음)
+    """
+    export = VideoService.export_project_zip(project_id, proxy=proxy)
+    if export is None:
+        return _project_not_found(project_id)
+    filename, chunks = export
+    # ? 동기 이터레이터는 스레드 풀에서 순회 (CRC 계산이 이벤트 루프를 막지 않음)
+    return StreamingResponse(
+        chunks,
+        media_type="application/zip",
+        headers={"Content-Disposition": _attachment(filename)}
+    )
+
+@app.delete("/projects/{project_id}")
+def delete_project(project_id: str):
+    """
+    보관 중인 프로젝트 프레임 삭제
+    """
+    if not frame_store.delete(project_id):
+        return _project_not_found(project_id)
+    return {"status": "success", "message": "프로젝트 프레임이 삭제되었습니다"}
+
+# --- Result File Endpoints ---
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    # ? If-None-Match 는 약한 비교: W/ 접두어 무시
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+@app.get("/results/{result_id}")
+def get_result(request: Request, result_id: str, download: bool = False):
+    """
+    렌더링/생성된 비디오 파일 다운로드
+    Range 요청 지원 (브라우저 재생/탐색, 이어받기), ETag 일치 시 304
+    download=true 면 첨부 파일(Content-Disposition: attachment)로 응답
+    """
+    result = result_store.get(result_id)
+    if not result:
+        return JSONResponse(
+            status_code=404,
+            content={"status": "error", "message": f"결과 파일을 찾을 수 없습니다 (만료 가능): {result_id}"}
+        )
+    headers = {
+        "ETag": result.etag,
+        # ! 같은 result_id 의 내용은 바뀌지 않음
+        "Cache-Control": f"private, max-age={int(result_store.ttl)}, immutable",
+    }
+    if _etag_matches(request, result.etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(
+        result.path,
+        media_type=result.mime,
+        headers=headers,
+        filename=result.filename,
+        content_disposition_type="attachment" if download else "inline"
+    )
+
+@app.delete("/results/{result_id}")
+def delete_result(result_id: str):
+    """
+    결과 파일 삭제 (다운로드 완료 후 즉시 용량 확보용)
+    """
+    if not result_store.delete(result_id):
+        return JSONResponse(
+            status_code=404,
+            content={"status": "error", "message": f"결과 파일을 찾을 수 없습니다 (만료 가능): {result_id}"}
+        )
+    return {"status": "success", "message": "결과 파일이 삭제되었습니다"}
+
 # --- Revision & Export Endpoints ---
 
 class RegenerateRequest(BaseModel):
     project_name: str
-    start_image: str  # Base64
-    end_image: str    # Base64
+    # ? project_id 지정 시 서버 보관 프레임의 start_index/end_index 를 사용 (이미지 업로드 불필요)
+    project_id: Optional[str] = None
+    start_index: Optional[int] = None
+    end_index: Optional[int] = None
+    start_image: Optional[Union[str, bytes]] = None  # Base64 (JSON) 또는 바이너리 (프레임 컨테이너)
+    end_image: Optional[Union[str, bytes]] = None    # Base64 (JSON) 또는 바이너리 (프레임 컨테이너)
     prompt: str
     revision_prompt: str = "" # Optional specific prompt for revision
-    target_frame_count: int
+    target_frame_count: Optional[int] = None
+    # kling: 원격 재생성 / local: 키 프레임 사이 광학 흐름 보간 (수 초, Kling 호출 없음)
+    mode: Literal["kling", "local"] = "kling"
+    proxy: bool = False # True 면 응답 프레임은 리뷰용 저해상도 프레임
+    proxy_frames: bool = False # True 면 업로드한 start_image/end_image 가 리뷰용 프록시 (409 로 거절)
 
 @app.post("/regenerate")
-async def regenerate_endpoint(req: RegenerateRequest):
+async def regenerate_endpoint(request: Request):
     """
     특정 구간 재생성 엔드포인트
+    본문: RegenerateRequest (JSON 또는 프레임 컨테이너)
     Service 계층에 로직 위임
     """
-    return VideoService.regenerate_segment(
+    req = await _parse_body(request, RegenerateRequest)
+    if req.project_id and not frame_store.get(req.project_id):
+        return _project_not_found(req.project_id)
+    if req.proxy_frames and not req.project_id:
+        return _proxy_upload_rejected()
+    result = await VideoService.regenerate_segment(
         req.project_name,
         req.start_image,
         req.end_image,
         req.prompt,
         req.revision_prompt,
-        req.target_frame_count
+        req.target_frame_count,
+        project_id=req.project_id,
+        start_index=req.start_index,
+        end_index=req.end_index,
+        mode=req.mode,
+        proxy=req.proxy
     )
+    return await _respond(request, result)
+
+@app.post("/regenerate/stream")
+async def regenerate_stream_endpoint(request: Request):
+    """
+    특정 구간 재생성 후 프레임을 추출되는 대로 스트리밍 (NDJSON / SSE)
+    본문: RegenerateRequest (JSON 또는 프레임 컨테이너)
+    """
+    req = await _parse_body(request, RegenerateRequest)
+    if req.project_id and not frame_store.get(req.project_id):
+        return _project_not_found(req.project_id)
+    if req.proxy_frames and not req.project_id:
+        return _proxy_upload_rejected()
+    return _stream(request, VideoService.stream_regeneration(
+        project_name=req.project_name,
+        start_image=req.start_image,
+        end_image=req.end_image,
+        prompt=req.prompt,
+        revision_prompt=req.revision_prompt,
+        target_frame_count=req.target_frame_count,
+        project_id=req.project_id,
+        start_index=req.start_index,
+        end_index=req.end_index,
+        mode=req.mode,
+        proxy=req.proxy
+    ))
 
 class RenderRequest(BaseModel):
     project_name: str
-    frames: List[str] # Base64 list
+    frames: List[Union[str, bytes]] = [] # Base64 list 또는 바이너리 (프레임 컨테이너)
+    project_id: Optional[str] = None # 지정 시 서버 보관 프레임으로 렌더링 (frames 생략)
     fps: int = 10
+    # 리타이밍 (지정 시 렌더링 전에 프레임 수/재생 속도 조정, 생략 시 원본 그대로)
+    frame_count: Optional[int] = Field(default=None, ge=1)
+    speed: Optional[List[PositiveFloat]] = Field(default=None, min_length=1) # 재생 속도 배율 곡선 (0.5 = 절반 속도)
+    retime_mode: Optional[Literal["nearest", "linear", "flow"]] = None # 생략 시 RETIME_MODE
+    codec_preference: Optional[Literal["fast", "small"]] = None # 생략 시 VIDEO_CODEC_PREFERENCE
+    proxy_frames: bool = False # True 면 업로드한 frames 가 리뷰용 프록시 (409 로 거절)
 
 @app.post("/render-video")
-async def render_video_endpoint(req: RenderRequest):
+async def render_video_endpoint(request: Request):
     """
-    클라이언트가 보낸 프레임(Base64)들을 모아 MP4 비디오로 렌더링 후 Base64 반환.
+    클라이언트가 보낸 프레임들을 모아 비디오로 렌더링 후 반환.
+    본문: RenderRequest (JSON, 프레임 컨테이너 또는 NDJSON)
+    ? 프레임 컨테이너/NDJSON 본문은 스트림으로 읽어 프레임 전체를 메모리에 올리지 않음
     Service 계층에 로직 위임
     """
-    return VideoService.render_video(
+    content_type = request.headers.get("content-type")
+    if transport.is_container(content_type) or transport.is_ndjson(content_type):
+        return await _render_video_upload(request, content_type)
+
+    req = await _parse_body(request, RenderRequest)
+    if req.project_id and not frame_store.get(req.project_id):
+        return _project_not_found(req.project_id)
+    if req.proxy_frames and not req.project_id:
+        return _proxy_upload_rejected()
+    result = await VideoService.render_video(
         req.project_name,
         req.frames,
-        req.fps
+        req.fps,
+        project_id=req.project_id,
+        **_render_options(req)
     )
+    return await _respond(request, result)
+
+def _render_options(req: RenderRequest) -> Dict[str, Any]:
+    return {
+        "frame_count": req.frame_count,
+        "speed": req.speed,
+        "retime_mode": req.retime_mode,
+        "codec_preference": req.codec_preference,
+    }
+
+async def _render_video_upload(request: Request, content_type: str) -> Any:
+    """
+    스트리밍 업로드 렌더링 (매니페스트 검증 후 프레임을 순차적으로 서비스에 전달)
+    """
+    # ! 업로드를 모두 받은 뒤 거절하지 않도록 대기열 여유를 먼저 확인
+    media_pool.ensure_capacity()
+    try:
+        manifest, frames = await transport.open_frame_upload(request.stream(), content_type)
+        req = RenderRequest.model_validate({**manifest, "frames": []})
+    except ValueError as e:
+        errors = e.errors() if isinstance(e, ValidationError) else [
+            {"type": "value_error", "loc": ("body",), "msg": str(e), "input": None}
+        ]
+        raise RequestValidationError(errors)
+
+    if req.project_id:
+        # 보관 프레임 렌더링 (업로드 프레임 없음)
+        if not frame_store.get(req.project_id):
+            return _project_not_found(req.project_id)
+        result = await VideoService.render_video(
+            req.project_name, [], req.fps, project_id=req.project_id, **_render_options(req)
+        )
+    elif req.proxy_frames:
+        # ? 매니페스트만 읽은 상태에서 거절 (프레임 본문은 받지 않음)
+        return _proxy_upload_rejected()
+    else:
+        result = await VideoService.render_video_upload(
+            req.project_name, req.fps, frames, order=manifest["frames"], **_render_options(req)
+        )
+    return await _respond(request, result)
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
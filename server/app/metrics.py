@@ -0,0 +1,316 @@
+"""
+Metrics Module - 파이프라인 단계별 지표 수집 (Prometheus 텍스트 형식)
+
+생성/재생성/렌더링 요청이 어느 단계(업로드, Kling 대기열, Kling 생성 대기, 다운로드, 디코딩, JPEG 인코딩,
+직렬화 등)에서 시간을 썼는지 히스토그램으로 기록하고 /metrics 로 내보냅니다.
+    - anime_stage_seconds{stage}: 단계별 소요 시간
+    - anime_frames_processed_total{stage}: 단계별 처리 프레임 수 (rate() 로 초당 처리량)
+    - anime_errors_total{cause}: 원인별 오류 수
+    - anime_http_*: 엔드포인트별 요청 수, 수신/송신 바이트 (MetricsMiddleware)
+    - 진행 중 Kling 작업 수, 캐시 적중/미스 등은 조회 시점에 각 모듈 stats() 에서 읽음 (registry.callback)
+
+? prometheus_client 와 같은 사용법 (labels().inc()/observe()/time()) 으로 필요 시 그대로 교체 가능
+! 지표는 프로세스 메모리에 있으므로 미디어 워커 프로세스 내부 시간은 API 프로세스에서 감싼 단계 시간으로만 보임
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app import tracing
+
+# 단계 소요 시간 구간 (초): 프레임 단위 작업 ~ Kling 생성 대기
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Value:
+    """카운터/게이지 값 1개"""
+
+    def __init__(self, lock: threading.Lock):
+        self._lock = lock
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self.value = value
+
+
+class _HistogramValue:
+    """히스토그램 1개 (구간별 누적 개수, 합계, 개수)"""
+
+    def __init__(self, lock: threading.Lock, buckets: Sequence[float]):
+        self._lock = lock
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.sum += value
+            self.count += 1
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[index] += 1
+                    break
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """with 블록 소요 시간 기록 (예외로 끝나도 기록)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Metric:
+    """
+    이름 + 레이블 조합별 값 모음
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        kind: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = STAGE_BUCKETS
+    ):
+        self.name = name
+        self.description = description
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], Any] = {}
+
+    def labels(self, **labels: Any) -> Any:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = (
+                    _HistogramValue(self._lock, self.buckets) if self.kind == "histogram"
+                    else _Value(self._lock)
+                )
+                self._children[key] = child
+            return child
+
+    # 레이블 없는 지표용 단축 메서드
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._children.items())
+            for key, child in items:
+                if self.kind != "histogram":
+                    lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(child.buckets, child.counts):
+                    cumulative += count
+                    labels = _format_labels(self.labelnames + ("le",), key + (_format_value(bound),))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labelnames + ("le",), key + ("+Inf",))
+                lines.append(f"{self.name}_bucket{labels} {child.count}")
+                plain = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{plain} {_format_value(child.sum)}")
+                lines.append(f"{self.name}_count{plain} {child.count}")
+        return lines
+
+
+class _CallbackMetric:
+    """조회 시점에 값을 읽는 지표 (다른 모듈의 stats() 재사용)"""
+
+    def __init__(self, name: str, description: str, kind: str, read: Callable[[], Any], labelname: Optional[str]):
+        self.name = name
+        self.description = description
+        self.kind = kind
+        self._read = read
+        self._labelname = labelname
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+        try:
+            value = self._read()
+        except Exception as e:
+            print(f"⚠️ 지표 조회 실패 ({self.name}): {e}")
+            return []
+        if self._labelname is None:
+            lines.append(f"{self.name} {_format_value(value)}")
+        else:
+            for label, item in sorted(value.items()):
+                lines.append(f"{self.name}{_format_labels((self._labelname,), (label,))} {_format_value(item)}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    지표 등록 및 Prometheus 텍스트 형식 출력
+    """
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, description: str, labelnames: Sequence[str] = ()) -> Metric:
+        return self._add(Metric(f"{self.namespace}_{name}", description, "counter", labelnames))
+
+    def gauge(self, name: str, description: str, labelnames: Sequence[str] = ()) -> Metric:
+        return self._add(Metric(f"{self.namespace}_{name}", description, "gauge", labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = STAGE_BUCKETS
+    ) -> Metric:
+        return self._add(Metric(f"{self.namespace}_{name}", description, "histogram", labelnames, buckets))
+
+    def callback(
+        self,
+        name: str,
+        description: str,
+        read: Callable[[], Any],
+        kind: str = "gauge",
+        labelname: Optional[str] = None
+    ) -> None:
+        """
+        조회 시점에 read() 로 값을 읽는 지표 등록
+        labelname 지정 시 read() 는 {레이블 값: 값} 딕셔너리 반환
+        """
+        self._add(_CallbackMetric(f"{self.namespace}_{name}", description, kind, read, labelname))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _add(self, metric: Any) -> Any:
+        with self._lock:
+            # ? 같은 이름은 한 번만 등록 (모듈 재로드 등)
+            return self._metrics.setdefault(metric.name, metric)
+
+
+class MetricsMiddleware:
+    """
+    엔드포인트별 요청 수, 수신/송신 바이트 기록 (ASGI 미들웨어, 스트리밍 응답도 조각마다 집계)
+    ? 엔드포인트 레이블은 경로 템플릿 (/projects/{project_id} 등, 값마다 레이블이 늘지 않도록)
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        received = 0
+        sent = 0
+        status = 500
+
+        async def counting_receive() -> Dict[str, Any]:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message: Dict[str, Any]) -> None:
+            nonlocal sent, status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                sent += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            route = scope.get("route")
+            endpoint = getattr(route, "path", None) or "unmatched"
+            http_requests.labels(endpoint=endpoint, method=scope["method"], status=status).inc()
+            http_request_bytes.labels(endpoint=endpoint).inc(received)
+            http_response_bytes.labels(endpoint=endpoint).inc(sent)
+
+
+@contextmanager
+def track_stage(stage: str) -> Iterator[None]:
+    """
+    파이프라인 단계 소요 시간 기록 (with 블록, 동기/비동기 코드 모두 사용 가능)
+    요청 추적 중이면 같은 이름의 구간도 기록 (tracing.span)
+    """
+    with tracing.span(stage), stage_seconds.labels(stage=stage).time():
+        yield
+
+
+def record_error(cause: str) -> None:
+    errors.labels(cause=cause).inc()
+
+
+# 싱글톤 인스턴스
+registry = MetricsRegistry("anime")
+
+stage_seconds = registry.histogram(
+    "stage_seconds", "파이프라인 단계별 소요 시간 (초)", ["stage"]
+)
+frames_processed = registry.counter(
+    "frames_processed_total", "단계별 처리 프레임 수", ["stage"]
+)
+errors = registry.counter(
+    "errors_total", "원인별 오류 수", ["cause"]
+)
+http_requests = registry.counter(
+    "http_requests_total", "엔드포인트별 요청 수", ["endpoint", "method", "status"]
+)
+http_request_bytes = registry.counter(
+    "http_request_bytes_total", "엔드포인트별 수신 바이트", ["endpoint"]
+)
+http_response_bytes = registry.counter(
+    "http_response_bytes_total", "엔드포인트별 송신 바이트", ["endpoint"]
+)
@@ -0,0 +1,283 @@
+"""
+Poller Module - Kling 작업 상태 공용 폴링 스케줄러
+
+진행 중인 모든 task_id 를 하나의 루프에서 추적합니다.
+작업마다 10초 고정 간격으로 폴링하는 대신, 과거 작업 소요 시간으로 학습한
+예상 완료 시점에 맞춰 간격을 조절합니다 (초반에는 드물게, 완료 예상 시점 근처에서는 촘촘하게).
+"""
+import asyncio
+import random
+import time
+from typing import Any, Callable, Dict, Optional
+
+from config.settings import settings
+from app.kling_client import KlingClient, KlingAPIError, kling_client
+
+# 작업 종료 상태 값
+DONE_STATUSES = ("succeed", "completed", "failed")
+
+
+class _TrackedTask:
+    """폴링 대상 작업 1건의 추적 정보"""
+
+    def __init__(
+        self,
+        task_id: str,
+        key: str,
+        future: asyncio.Future,
+        on_status: Optional[Callable[[str, int], None]]
+    ):
+        self.task_id = task_id
+        self.key = key
+        self.future = future
+        self.on_status = on_status
+        self.submitted_at = time.monotonic()
+        self.next_poll_at = self.submitted_at
+        self.attempts = 0
+
+
+class TaskPoller:
+    """
+    모든 in-flight Kling 작업을 하나의 백그라운드 루프에서 폴링하는 스케줄러
+    """
+
+    def __init__(
+        self,
+        client: KlingClient,
+        min_interval: float = 2.0,
+        max_interval: float = 30.0,
+        expected_duration: float = 180.0,
+        rate_limit: float = 5.0,
+        jitter: float = 0.2,
+        timeout: float = 1800.0
+    ):
+        """
+        Args:
+            min_interval: 최소 폴링 간격 (완료 예상 시점 근처)
+            max_interval: 최대 폴링 간격 (작업 초반)
+            expected_duration: 학습 데이터가 없을 때 사용하는 예상 소요 시간 (초)
+            rate_limit: 초당 최대 상태 조회 요청 수 (전체 작업 합산)
+            jitter: 간격 무작위 편차 비율 (동시 제출 작업의 폴링이 몰리지 않도록)
+            timeout: 작업당 최대 대기 시간 (초)
+        """
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.default_expected = expected_duration
+        self.rate_limit = rate_limit
+        self.jitter = jitter
+        self.timeout = timeout
+
+        self._tasks: Dict[str, _TrackedTask] = {}
+        # 작업 종류(모델/모드/길이)별 평균 소요 시간 (지수 이동 평균)
+        self._expected: Dict[str, float] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        # 토큰 버킷 (rate_limit 초과 방지) 및 429 응답 시 전체 일시 정지 시각
+        self._tokens = rate_limit
+        self._tokens_updated = time.monotonic()
+        self._paused_until = 0.0
+
+    # -------------------------------------------------------------------------
+    # 공개 API
+    # -------------------------------------------------------------------------
+    async def wait(
+        self,
+        task_id: str,
+        key: str = "default",
+        on_status: Optional[Callable[[str, int], None]] = None,
+        age: float = 0.0
+    ) -> Dict[str, Any]:
+        """
+        작업이 종료(succeed/failed)될 때까지 대기 후 마지막 상태 응답 반환
+
+        Args:
+            key: 소요 시간 학습 단위 (예: "kling-v1:pro:5")
+            on_status: 상태 조회마다 호출되는 콜백 (task_status, attempt)
+            age: 작업 제출 후 이미 지난 시간 (초) - 재시작 후 이어서 폴링할 때 간격/타임아웃 계산용
+
+        Raises:
+            asyncio.TimeoutError: timeout 초 안에 작업이 끝나지 않은 경우
+        """
+        self._ensure_runner()
+        future = self._loop.create_future()
+        tracked = _TrackedTask(task_id, key, future, on_status)
+        tracked.submitted_at -= max(age, 0.0)
+        tracked.next_poll_at = tracked.submitted_at + self._next_interval(tracked)
+        self._tasks[task_id] = tracked
+        self._wakeup.set()
+
+        try:
+            return await future
+        finally:
+            # 호출 측 취소 시에도 추적 목록에서 제거
+            self._tasks.pop(task_id, None)
+
+    def expected_duration(self, key: str) -> float:
+        return self._expected.get(key, self.default_expected)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._tasks),
+            "expected_durations": dict(self._expected),
+        }
+
+    # -------------------------------------------------------------------------
+    # 스케줄링
+    # -------------------------------------------------------------------------
+    def _ensure_runner(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._runner is None or self._runner.done():
+            # ? 루프가 바뀐 경우(스크립트의 asyncio.run 등) 이전 루프의 상태는 버림
+            if self._loop is not loop:
+                self._tasks.clear()
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._start_runner()
+
+    def _start_runner(self) -> None:
+        self._runner = self._loop.create_task(self._run())
+        self._runner.add_done_callback(self._watchdog)
+
+    def _watchdog(self, runner: asyncio.Task) -> None:
+        """
+        폴링 루프가 예기치 않게 종료되면 다시 시작
+        ! 루프가 멈추면 대기 중인 모든 wait() 가 끝나지 않으므로 (작업/스케줄러 슬롯까지 묶임)
+        """
+        if runner is not self._runner or runner.cancelled() or self._loop.is_closed():
+            return
+        print(f"⚠️ 폴링 루프 종료 ({runner.exception()!r}), 다시 시작합니다")
+        self._start_runner()
+        self._wakeup.set()
+
+    def _next_interval(self, tracked: _TrackedTask) -> float:
+        """
+        다음 폴링까지의 간격 계산
+        - 예상 완료 전: 남은 시간의 절반 (초반엔 max_interval 로 드물게, 가까워질수록 촘촘하게)
+        - 예상 완료 후: 초과 시간에 비례해 다시 느슨하게
+        """
+        expected = self.expected_duration(tracked.key)
+        elapsed = time.monotonic() - tracked.submitted_at
+        remaining = expected - elapsed
+
+        if remaining > 0:
+            interval = remaining * 0.5
+        else:
+            interval = self.min_interval * (1 + 4 * (-remaining) / expected)
+
+        interval = min(max(interval, self.min_interval), self.max_interval)
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def _run(self) -> None:
+        while True:
+            if not self._tasks:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            now = time.monotonic()
+            next_due = min(t.next_poll_at for t in self._tasks.values())
+            next_due = max(next_due, self._paused_until)
+            if next_due > now:
+                # 새 작업이 등록되면 대기 중단 후 일정 재계산
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=next_due - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            due = [t for t in self._tasks.values() if t.next_poll_at <= now and not t.future.done()]
+            await asyncio.gather(*(self._poll_isolated(t) for t in due))
+
+    async def _poll_isolated(self, tracked: _TrackedTask) -> None:
+        """예상하지 못한 오류는 해당 작업의 future 로만 전달 (공용 루프는 계속 실행)"""
+        try:
+            await self._poll(tracked)
+        except Exception as e:
+            print(f"상태 조회 처리 오류 ({tracked.task_id}): {e}")
+            self._resolve(tracked, exception=e)
+
+    async def _poll(self, tracked: _TrackedTask) -> None:
+        await self._acquire_token()
+        tracked.attempts += 1
+        elapsed = time.monotonic() - tracked.submitted_at
+        if elapsed > self.timeout:
+            self._resolve(tracked, exception=asyncio.TimeoutError())
+            return
+
+        try:
+            status_result = await self.client.get_task(tracked.task_id)
+            # ? "data": null 등 형식이 어긋난 응답은 일시 오류로 보고 다음 주기에 재시도
+            task_status = (status_result.get("data") or {}).get("task_status")
+        except KlingAPIError as e:
+            if e.status_code == 429:
+                # 요청 한도 초과 → 전체 폴링 일시 정지 (Retry-After 우선)
+                pause = e.retry_after or self.max_interval
+                self._paused_until = time.monotonic() + pause
+                print(f"⏳ 상태 조회 한도 초과, {pause:.0f}초 대기")
+            elif e.status_code is not None and 400 <= e.status_code < 500:
+                self._resolve(tracked, exception=e)
+                return
+            tracked.next_poll_at = time.monotonic() + self._next_interval(tracked)
+            return
+        except Exception as e:
+            # 일시적 네트워크 오류는 다음 주기에 재시도
+            print(f"상태 조회 오류 ({tracked.task_id}): {e}")
+            tracked.next_poll_at = time.monotonic() + self._next_interval(tracked)
+            return
+
+        if tracked.on_status:
+            try:
+                tracked.on_status(task_status, tracked.attempts)
+            except Exception as e:
+                # 진행 보고 실패가 작업 대기를 막지 않도록 기록만 남김
+                print(f"상태 콜백 오류 ({tracked.task_id}): {e}")
+
+        if task_status in DONE_STATUSES:
+            if task_status != "failed":
+                self._learn(tracked.key, elapsed)
+            self._resolve(tracked, result=status_result)
+        else:
+            tracked.next_poll_at = time.monotonic() + self._next_interval(tracked)
+
+    def _resolve(self, tracked: _TrackedTask, result: Any = None, exception: Optional[BaseException] = None) -> None:
+        self._tasks.pop(tracked.task_id, None)
+        if tracked.future.done():
+            return
+        if exception is not None:
+            tracked.future.set_exception(exception)
+        else:
+            tracked.future.set_result(result)
+
+    def _learn(self, key: str, duration: float) -> None:
+        """완료 소요 시간을 지수 이동 평균으로 반영"""
+        previous = self._expected.get(key)
+        self._expected[key] = duration if previous is None else previous * 0.7 + duration * 0.3
+
+    async def _acquire_token(self) -> None:
+        """토큰 버킷 방식의 전역 요청 속도 제한"""
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._tokens_updated) * self.rate_limit)
+            self._tokens_updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate_limit)
+
+
+# 싱글톤 인스턴스
+task_poller = TaskPoller(
+    client=kling_client,
+    min_interval=settings.KLING_POLL_MIN_INTERVAL,
+    max_interval=settings.KLING_POLL_MAX_INTERVAL,
+    expected_duration=settings.KLING_POLL_EXPECTED_SECONDS,
+    rate_limit=settings.KLING_POLL_RATE_LIMIT,
+    jitter=settings.KLING_POLL_JITTER,
+    timeout=settings.KLING_POLL_TIMEOUT_SECONDS
+)
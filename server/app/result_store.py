@@ -0,0 +1,163 @@
+"""
+Result Store Module - 렌더링/생성 결과 파일 임시 보관소
+
+완성된 비디오(MP4/WebM)를 메모리에 읽어 Base64 로 응답에 담는 대신, 파일 그대로 잠시 보관하고
+/results/{result_id} 로 내려줍니다 (Range 요청 지원 → 브라우저가 바로 재생/탐색, ETag 로 재다운로드 방지).
+
+마지막 접근 후 TTL 이 지난 결과는 삭제되며, 전체 용량이 상한을 넘으면
+가장 오래 사용되지 않은 결과(LRU)부터 삭제합니다.
+! 등록(adopt)은 API 프로세스에서만 수행 (보관 목록은 프로세스 메모리에 있음)
+"""
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from config.settings import settings
+
+
+class StoredResult:
+    """
+    보관 중인 결과 파일 1건
+    """
+
+    def __init__(self, result_id: str, path: str, mime: str, filename: str):
+        self.result_id = result_id
+        self.path = path
+        self.mime = mime
+        self.filename = filename
+        self.size = os.path.getsize(path)
+        self.created_at = time.time()
+        self.accessed_at = self.created_at
+
+    @property
+    def etag(self) -> str:
+        # ? 보관 파일은 수정되지 않으므로 result_id 가 곧 내용 식별자 (강한 ETag)
+        return f'"{self.result_id}"'
+
+    @property
+    def url(self) -> str:
+        return f"/results/{self.result_id}"
+
+    def to_dict(self, ttl: float) -> Dict[str, Any]:
+        return {
+            "result_id": self.result_id,
+            "url": self.url,
+            "mime": self.mime,
+            "filename": self.filename,
+            "size": self.size,
+            "expires_at": self.accessed_at + ttl,
+        }
+
+
+class ResultStore:
+    """
+    디스크 기반 결과 파일 보관소 (TTL + 용량 상한 LRU)
+    """
+
+    def __init__(self, directory: str, ttl: float, max_bytes: int):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # result_id -> StoredResult, 순서 = 최근 사용 순 (마지막이 최신)
+        self._results: "OrderedDict[str, StoredResult]" = OrderedDict()
+        self._total_bytes = 0
+
+    def adopt(self, path: str, mime: str, filename: str) -> StoredResult:
+        """
+        파일을 보관 디렉토리로 옮겨(result_id 로 이름 변경) 등록하고 반환
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        result_id = uuid.uuid4().hex
+        ext = os.path.splitext(path)[1]
+        target = os.path.join(self.directory, f"{result_id}{ext}")
+        # ! 같은 파일 시스템이면 이름만 바뀌므로 복사 비용 없음 (RAM 디스크 작업 디렉토리에서는 복사)
+        shutil.move(path, target)
+
+        result = StoredResult(result_id, target, mime, filename)
+        with self._lock:
+            self._purge_expired_locked()
+            self._results[result_id] = result
+            self._total_bytes += result.size
+            self._evict_locked()
+        print(f"📦 결과 보관: {result_id} ({filename}, {result.size / (1 << 20):.1f}MB)")
+        return result
+
+    def get(self, result_id: str) -> Optional[StoredResult]:
+        """결과 조회 (만료 시 None), 조회 시 TTL 갱신"""
+        with self._lock:
+            self._purge_expired_locked()
+            result = self._results.get(result_id)
+            if result is None:
+                return None
+            result.accessed_at = time.time()
+            self._results.move_to_end(result_id)
+            return result
+
+    def delete(self, result_id: str) -> bool:
+        with self._lock:
+            result = self._results.pop(result_id, None)
+            if result is None:
+                return False
+            self._remove_locked(result)
+            return True
+
+    def clear(self) -> None:
+        """
+        보관 디렉토리 비우기 (서버 시작 시 이전 실행의 결과/기록 중이던 파일 정리)
+        """
+        with self._lock:
+            self._results.clear()
+            self._total_bytes = 0
+        if os.path.isdir(self.directory):
+            shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "results": len(self._results),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+            }
+
+    # -------------------------------------------------------------------------
+    # 내부 유틸리티
+    # -------------------------------------------------------------------------
+    def _remove_locked(self, result: StoredResult) -> None:
+        self._total_bytes -= result.size
+        # ? 다운로드 중인 파일을 지워도 열린 핸들은 유지되므로 전송은 끝까지 진행됨
+        try:
+            os.remove(result.path)
+        except OSError:
+            pass
+
+    def _purge_expired_locked(self) -> None:
+        now = time.time()
+        expired = [
+            result_id for result_id, result in self._results.items()
+            if now - result.accessed_at > self.ttl
+        ]
+        for result_id in expired:
+            self._remove_locked(self._results.pop(result_id))
+            print(f"📦 결과 보관 만료: {result_id}")
+
+    def _evict_locked(self) -> None:
+        # ! 가장 최근 결과(방금 등록)는 상한을 넘더라도 유지
+        while self._total_bytes > self.max_bytes and len(self._results) > 1:
+            result_id, result = self._results.popitem(last=False)
+            self._remove_locked(result)
+            print(f"📦 결과 보관 삭제 (LRU): {result_id}")
+
+
+# 싱글톤 인스턴스
+result_store = ResultStore(
+    directory=settings.RESULT_STORE_DIR,
+    ttl=settings.RESULT_STORE_TTL_SECONDS,
+    max_bytes=settings.RESULT_STORE_MAX_BYTES
+)
@@ -0,0 +1,202 @@
+"""
+Retiming Module - 프레임 수/재생 속도 재조정 (NumPy 일괄 처리)
+
+프레임 스택(N, H, W, C)을 목표 프레임 수 또는 속도 곡선에 맞춰 다시 샘플링합니다.
+1. source_positions: 출력 프레임마다 대응하는 원본 위치(실수) 계산
+2. retime: 위치에 맞춰 프레임 합성 (스택 전체를 한 번에 인덱싱/연산)
+    - nearest: 가장 가까운 원본 프레임 (복사만, 가장 빠름)
+    - linear:  이웃 프레임 선형 혼합 (고정 소수점 uint16 연산)
+    - flow:    이웃 프레임 사이 광학 흐름 보간 (interpolation.FlowPair, 이웃 쌍마다 흐름 1회 계산)
+
+속도 곡선은 원본 타임라인에 고르게 배치한 재생 속도 배율 목록입니다 (1.0 = 원래 속도, 0.5 = 절반 속도).
+재생성 결과의 프레임 수 보정과 렌더링 시 슬로우 모션에 사용하므로,
+정확한 프레임 수를 맞추기 위해 Kling 생성을 다시 요청할 필요가 없습니다.
+"""
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+from app.frames import decode_image, encode_jpeg
+from app.interpolation import FlowPair
+
+MODE_NEAREST = "nearest"
+MODE_LINEAR = "linear"
+MODE_FLOW = "flow"
+MODES = (MODE_NEAREST, MODE_LINEAR, MODE_FLOW)
+
+# 한 번에 연산할 최대 프레임 수 (linear 중간 버퍼, iter_retime 창 크기)
+_BATCH_FRAMES = 16
+# 이 값보다 원본 위치에 가까우면 합성 없이 원본 프레임 사용
+_EPSILON = 1e-3
+
+
+def source_positions(
+    total: int,
+    count: Optional[int] = None,
+    speed: Optional[Sequence[float]] = None
+) -> np.ndarray:
+    """
+    출력 프레임별 원본 위치 (0 ~ total-1, 단조 증가)
+
+    Args:
+        total: 원본 프레임 수
+        count: 출력 프레임 수 (None 이면 원본 수 또는 속도 곡선으로 결정)
+        speed: 재생 속도 배율 곡선 (원본 타임라인에 고르게 배치, 사이는 선형 보간)
+               count 와 함께 지정하면 길이는 count 로 고정하고 곡선은 속도 분포로만 사용
+
+    Raises:
+        ValueError: 속도 곡선이 비어 있거나 0 이하 값이 있는 경우
+    """
+    if total <= 0 or count == 0:
+        return np.empty(0, dtype=np.float64)
+    if count is not None and count < 0:
+        raise ValueError(f"출력 프레임 수는 0 이상이어야 합니다: {count}")
+    source = np.arange(total, dtype=np.float64)
+
+    if speed is not None:
+        curve = np.asarray(speed, dtype=np.float64)
+        if curve.ndim != 1 or curve.size == 0 or np.any(curve <= 0):
+            raise ValueError("속도 곡선은 0 보다 큰 값의 목록이어야 합니다")
+        # 원본 구간 [i, i+1] 의 속도 → 출력 타임라인에서 차지하는 길이 = 1 / 속도
+        midpoints = source[:-1] + 0.5
+        segment_speed = np.interp(midpoints, np.linspace(0.0, total - 1, curve.size), curve)
+        output_time = np.concatenate(([0.0], np.cumsum(1.0 / segment_speed)))
+        if count is None:
+            ticks = np.arange(int(np.floor(output_time[-1] + _EPSILON)) + 1, dtype=np.float64)
+        else:
+            ticks = np.linspace(0.0, output_time[-1], count)
+        return np.interp(ticks, output_time, source)
+
+    if count is None:
+        return source
+    if count == 1:
+        return np.array([(total - 1) / 2.0])
+    return np.linspace(0.0, total - 1, count)
+
+
+def retime(stack: np.ndarray, positions: Sequence[float], mode: str = MODE_LINEAR) -> np.ndarray:
+    """
+    프레임 스택을 positions 에 맞춰 다시 샘플링
+
+    Args:
+        stack: (N, H, W, C) uint8 프레임 스택
+        positions: 출력 프레임별 원본 위치 (source_positions)
+        mode: nearest / linear / flow
+
+    Returns:
+        (len(positions), H, W, C) uint8 프레임 스택
+    """
+    if mode not in MODES:
+        raise ValueError(f"지원하지 않는 리타이밍 방식입니다: {mode}")
+    positions = np.clip(np.asarray(positions, dtype=np.float64), 0, len(stack) - 1)
+    if mode == MODE_NEAREST or len(stack) == 1:
+        return stack[np.rint(positions).astype(np.intp)]
+
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, len(stack) - 1)
+    frac = positions - lower
+
+    if mode == MODE_LINEAR:
+        out = np.empty((len(positions), *stack.shape[1:]), dtype=np.uint8)
+        # ? 8비트 고정 소수점 가중치: a·(256-w) + b·w 가 uint16 범위 안에 들어옴
+        weights = np.rint(frac * 256).astype(np.uint16)
+        for begin in range(0, len(positions), _BATCH_FRAMES):
+            batch = slice(begin, begin + _BATCH_FRAMES)
+            w = weights[batch, None, None, None]
+            a = stack[lower[batch]].astype(np.uint16)
+            b = stack[upper[batch]].astype(np.uint16)
+            out[batch] = ((a * (256 - w) + b * w + 128) >> 8).astype(np.uint8)
+        return out
+
+    # flow: 원본과 겹치는 위치는 복사, 나머지는 이웃 쌍별로 흐름을 한 번 계산해 여러 시점 합성
+    out = stack[np.rint(positions).astype(np.intp)]
+    between = (frac > _EPSILON) & (frac < 1.0 - _EPSILON)
+    for pair in np.unique(lower[between]):
+        targets = np.flatnonzero(between & (lower == pair))
+        flow = FlowPair(stack[pair], stack[pair + 1])
+        for target in targets:
+            out[target] = flow.at(float(frac[target]))
+    return out
+
+
+def iter_retime(
+    frames: Iterable[np.ndarray],
+    positions: Sequence[float],
+    mode: str = MODE_LINEAR
+) -> Iterator[np.ndarray]:
+    """
+    프레임 스트림을 positions 에 맞춰 다시 샘플링 (렌더링용, 메모리에는 최대 _BATCH_FRAMES 장만 유지)
+    ? 원본이 positions 가 가정한 수보다 짧으면 남은 출력은 마지막 프레임 기준으로 채움
+    """
+    positions = np.maximum.accumulate(np.asarray(positions, dtype=np.float64))
+    if positions.size == 0:
+        return
+    if mode == MODE_NEAREST:
+        # ! 창 기준(positions - base)으로 반올림하면 .5 위치가 base 홀짝에 따라 달라지므로 (np.rint 는 짝수 쪽)
+        #   원본 번호 기준으로 먼저 반올림해 retime(전체 스택) 과 같은 프레임을 고름
+        positions = np.rint(positions)
+    # 출력 프레임별로 필요한 마지막 원본 번호
+    needed = positions if mode == MODE_NEAREST else np.ceil(positions)
+
+    window: List[np.ndarray] = []
+    base = 0    # window[0] 의 원본 번호
+    cursor = 0  # 다음에 만들 출력 번호
+    for index, frame in enumerate(frames):
+        window.append(frame)
+        if len(window) < _BATCH_FRAMES:
+            continue
+        ready = int(np.searchsorted(needed, index, side="right"))
+        if ready > cursor:
+            yield from retime(np.stack(window), positions[cursor:ready] - base, mode)
+            cursor = ready
+        if cursor >= positions.size:
+            return
+        # 다음 출력에 필요한 원본부터 유지 (최소 1장은 남겨 창이 계속 줄어들도록)
+        keep_from = min(int(np.floor(positions[cursor])), index) - base
+        window = window[max(0, min(keep_from, len(window) - 1)):]
+        base = index - len(window) + 1
+
+    if window and cursor < positions.size:
+        yield from retime(np.stack(window), positions[cursor:] - base, mode)
+
+
+# -----------------------------------------------------------------------------
+# JPEG 바이트 입출력 (미디어 워커 실행용)
+# -----------------------------------------------------------------------------
+def _decode_stack(images: Sequence[bytes]) -> np.ndarray:
+    """JPEG 목록을 (N, H, W, 3) 스택으로 디코딩 (크기가 다르면 첫 프레임 크기로 맞춤)"""
+    decoded = [decode_image(image) for image in images]
+    if any(frame is None for frame in decoded):
+        raise ValueError("이미지를 디코딩할 수 없습니다")
+    height, width = decoded[0].shape[:2]
+    return np.stack([
+        frame if frame.shape[:2] == (height, width)
+        else cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+        for frame in decoded
+    ])
+
+
+def retime_jpeg(
+    frames: List[bytes],
+    count: Optional[int] = None,
+    speed: Optional[Sequence[float]] = None,
+    mode: str = MODE_LINEAR,
+    quality: Optional[int] = None
+) -> List[bytes]:
+    """
+    JPEG 프레임 목록 리타이밍 (원본과 겹치는 위치는 원본 바이트를 다시 인코딩하지 않고 사용)
+    """
+    positions = source_positions(len(frames), count, speed)
+    nearest = np.rint(positions).astype(np.intp)
+    if mode == MODE_NEAREST:
+        return [frames[index] for index in nearest]
+
+    exact = np.abs(positions - nearest) <= _EPSILON
+    if exact.all():
+        return [frames[index] for index in nearest]
+    synthesized = retime(_decode_stack(frames), positions, mode)
+    return [
+        frames[index] if is_exact else encode_jpeg(frame, quality)
+        for index, is_exact, frame in zip(nearest, exact, synthesized)
+    ]
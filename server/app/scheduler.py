@@ -0,0 +1,213 @@
+"""
+Scheduler Module - Kling 작업 제출 승인(Admission) 및 공정 분배 스케줄러
+
+Kling 에 동시에 진행 중인 작업 수를 max_in_flight 로 제한합니다.
+빈 자리가 없으면 대기열에 넣고, 자리가 나면 다음 순서로 배정합니다.
+    1. 우선순위 (구간 재생성 → 새 생성)
+    2. 프로젝트별 진행 중 작업 수가 적은 쪽 (한 프로젝트가 자리를 독점하지 않도록)
+    3. 가장 오래전에 자리를 배정받은 프로젝트 (라운드 로빈)
+    4. 먼저 도착한 요청
+대기열도 가득 차면 SchedulerBusyError 로 즉시 거절합니다 (엔드포인트에서 429 + Retry-After).
+"""
+import asyncio
+import itertools
+from typing import Any, Callable, Dict, List, Optional
+
+from config.settings import settings
+
+# 우선순위 (작을수록 먼저)
+PRIORITY_REVISION = 0
+PRIORITY_GENERATE = 1
+
+
+class SchedulerBusyError(RuntimeError):
+    """Kling 작업 대기열이 가득 찬 경우"""
+
+    def __init__(self, retry_after: float):
+        super().__init__("생성 요청이 많아 대기열이 가득 찼습니다. 잠시 후 다시 시도하세요.")
+        self.retry_after = retry_after
+
+
+class SchedulerSlot:
+    """
+    배정된 Kling 작업 자리 1개 (작업 종료 시 release)
+    """
+
+    def __init__(self, scheduler: "KlingScheduler", project_name: str):
+        self._scheduler = scheduler
+        self.project_name = project_name
+        self._released = False
+
+    def release(self) -> None:
+        """자리 반납 (여러 번 호출해도 한 번만 반영)"""
+        if self._released:
+            return
+        self._released = True
+        self._scheduler._release(self.project_name)
+
+
+class _Ticket:
+    """대기 중인 요청 1건"""
+
+    __slots__ = ("project_name", "priority", "seq", "future", "on_position")
+
+    def __init__(
+        self,
+        project_name: str,
+        priority: int,
+        seq: int,
+        future: asyncio.Future,
+        on_position: Optional[Callable[[int, int], None]]
+    ):
+        self.project_name = project_name
+        self.priority = priority
+        self.seq = seq
+        self.future = future
+        self.on_position = on_position
+
+
+class KlingScheduler:
+    """
+    동시 진행 수 제한 + 우선순위/프로젝트 공정 분배 대기열
+    ! 이벤트 루프 스레드에서만 사용 (잠금 없음)
+    """
+
+    def __init__(self, max_in_flight: int, max_queue: int, retry_after: float):
+        """
+        Args:
+            max_in_flight: Kling 에 동시에 진행 가능한 최대 작업 수
+            max_queue: 자리를 기다릴 수 있는 최대 요청 수 (초과 시 거절)
+            retry_after: 거절 시 안내할 재시도 대기 시간 (초)
+        """
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+
+        self._in_flight = 0
+        # 프로젝트별 진행 중 작업 수
+        self._running: Dict[str, int] = {}
+        # 프로젝트별 마지막 배정 번호 (대기 중이거나 진행 중인 프로젝트만 유지)
+        self._last_grant: Dict[str, int] = {}
+        self._waiting: List[_Ticket] = []
+        self._seq = itertools.count()
+        self._granted = 0
+        self._rejected = 0
+
+    def ensure_capacity(self) -> None:
+        """
+        새 요청을 받을 수 있는지 확인 (acquire 에서 대기열에 넣기 전 확인)
+        ! 캐시 결과로 끝나는 요청까지 거절하지 않도록 엔드포인트에서 미리 호출하지 않음
+
+        Raises:
+            SchedulerBusyError: 빈 자리도 없고 대기열도 가득 찬 경우
+        """
+        if self._in_flight >= self.max_in_flight and len(self._waiting) >= self.max_queue:
+            self._rejected += 1
+            raise SchedulerBusyError(self.retry_after)
+
+    async def acquire(
+        self,
+        project_name: str,
+        priority: int = PRIORITY_GENERATE,
+        on_position: Optional[Callable[[int, int], None]] = None
+    ) -> SchedulerSlot:
+        """
+        자리를 배정받을 때까지 대기 후 SchedulerSlot 반환
+
+        Args:
+            on_position: 대기 순번이 바뀔 때마다 호출 (순번(1부터), 전체 대기 수)
+
+        Raises:
+            SchedulerBusyError: 대기열이 가득 찬 경우
+        """
+        if self._in_flight < self.max_in_flight and not self._waiting:
+            return self._grant(project_name)
+        self.ensure_capacity()
+
+        ticket = _Ticket(
+            project_name, priority, next(self._seq),
+            asyncio.get_running_loop().create_future(), on_position
+        )
+        self._waiting.append(ticket)
+        self._report_positions()
+        try:
+            return await ticket.future
+        except asyncio.CancelledError:
+            if ticket in self._waiting:
+                self._waiting.remove(ticket)
+                self._report_positions()
+            elif ticket.future.done() and not ticket.future.cancelled():
+                # 배정 직후 취소된 경우 자리 반납
+                ticket.future.result().release()
+            raise
+
+    def occupy(self, project_name: str) -> SchedulerSlot:
+        """
+        대기 없이 자리 차지 (재시작 전에 이미 제출된 작업처럼 Kling 에서 진행 중인 작업용)
+        ? 상한을 넘을 수 있으며, 넘은 만큼 새 요청의 배정이 늦어짐
+        """
+        return self._grant(project_name)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiting),
+            "running_by_project": dict(self._running),
+            "granted": self._granted,
+            "rejected": self._rejected,
+        }
+
+    # -------------------------------------------------------------------------
+    # 내부 유틸리티
+    # -------------------------------------------------------------------------
+    def _grant(self, project_name: str) -> SchedulerSlot:
+        self._in_flight += 1
+        self._running[project_name] = self._running.get(project_name, 0) + 1
+        self._granted += 1
+        self._last_grant[project_name] = self._granted
+        return SchedulerSlot(self, project_name)
+
+    def _release(self, project_name: str) -> None:
+        self._in_flight -= 1
+        remaining = self._running.get(project_name, 1) - 1
+        if remaining > 0:
+            self._running[project_name] = remaining
+        else:
+            self._running.pop(project_name, None)
+            if not any(ticket.project_name == project_name for ticket in self._waiting):
+                self._last_grant.pop(project_name, None)
+        self._dispatch()
+
+    def _order(self, ticket: _Ticket) -> tuple:
+        return (
+            ticket.priority,
+            self._running.get(ticket.project_name, 0),
+            self._last_grant.get(ticket.project_name, 0),
+            ticket.seq
+        )
+
+    def _dispatch(self) -> None:
+        """빈 자리에 대기 요청 배정 (우선순위 → 프로젝트 공정 분배 → 도착 순)"""
+        while self._waiting and self._in_flight < self.max_in_flight:
+            ticket = min(self._waiting, key=self._order)
+            self._waiting.remove(ticket)
+            if ticket.future.done():
+                continue
+            ticket.future.set_result(self._grant(ticket.project_name))
+        self._report_positions()
+
+    def _report_positions(self) -> None:
+        ordered = sorted(self._waiting, key=self._order)
+        for position, ticket in enumerate(ordered, start=1):
+            if ticket.on_position:
+                ticket.on_position(position, len(ordered))
+
+
+# 싱글톤 인스턴스
+kling_scheduler = KlingScheduler(
+    max_in_flight=settings.KLING_MAX_IN_FLIGHT,
+    max_queue=settings.KLING_QUEUE_MAX_WAITING,
+    retry_after=settings.KLING_QUEUE_RETRY_AFTER_SECONDS
+)
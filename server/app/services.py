@@ -1,210 +1,836 @@
 import os
-import shutil
-import base64
+import asyncio
 import traceback
-from typing import List, Optional, Tuple, Dict, Any
+from typing import List, Optional, Tuple, Dict, Any, Callable, Iterable, Iterator, Union, AsyncIterator, Awaitable
 from fastapi import UploadFile
 from app.animator import animator
+from app.jobs import job_manager
+from app.ledger import LedgerEntry, task_ledger
+from app.frame_store import frame_store
+from app.result_store import result_store
+from app.workspace import WorkspaceQuotaError, workspace_manager
+from app import frames as frames_lib
+from app.workers import media_pool, MediaPoolBusyError
+from app.scheduler import SchedulerBusyError
+from app import interpolation, retiming
+from app.transport import Blob, decode_data_url
+from app.video_codecs import mime_for
+from app.metrics import frames_processed, record_error, track_stage
+from app.tracing import annotate, traced
+from config.settings import settings
+
+# 스트리밍 응답 종료 신호
+_STREAM_END = object()
+
+# 구간 재생성 방식: Kling 재생성 / 로컬 광학 흐름 보간
+REGENERATE_MODE_KLING = "kling"
+REGENERATE_MODE_LOCAL = "local"
 
 class VideoService:
     @staticmethod
+    @traced()
     async def generate_video(
         start_image: UploadFile,
         end_image: UploadFile,
         prompt: str,
-        project_name: str
+        project_name: str,
+        proxy: bool = False
     ) -> Dict[str, Any]:
         """
-        비디오 생성 및 Base64 반환 서비스 로직
+        비디오 생성 서비스 로직
+        ? 프레임/비디오는 Blob 으로 반환 (엔드포인트에서 Base64 JSON 또는 바이너리 컨테이너로 직렬화)
+        proxy=True 면 응답 프레임은 리뷰용 저해상도 프레임 (원본은 /projects/{project_id}/frames 로 조회)
         """
         try:
             # 1. 이미지 읽기
             start_bytes = await start_image.read()
             end_bytes = await end_image.read()
-            
+        except Exception as e:
+            print(f"Error processing files: {e}")
+            return {"status": "error", "message": f"파일 처리 중 오류: {str(e)}"}
+        annotate(project_name=project_name, input_bytes=len(start_bytes) + len(end_bytes))
+
+        return await VideoService.generate_video_from_bytes(
+            project_name, start_bytes, end_bytes, prompt, proxy=proxy
+        )
+
+    @staticmethod
+    async def submit_generate_job(
+        start_image: UploadFile,
+        end_image: UploadFile,
+        prompt: str,
+        project_name: str,
+        proxy: bool = False
+    ) -> Dict[str, Any]:
+        """
+        비디오 생성 작업 등록 후 job_id 즉시 반환 (proxy 는 generate_video 와 동일)
+        """
+        try:
+            start_bytes = await start_image.read()
+            end_bytes = await end_image.read()
+        except Exception as e:
+            print(f"Error processing files: {e}")
+            return {"status": "error", "message": f"파일 처리 중 오류: {str(e)}"}
+
+        job = job_manager.submit(
+            "generate-video",
+            project_name,
+            VideoService.generate_video_from_bytes,
+            project_name, start_bytes, end_bytes, prompt,
+            proxy=proxy
+        )
+        return {
+            "status": "success",
+            "message": "비디오 생성 작업이 등록되었습니다",
+            "data": job.to_dict()
+        }
+
+    @staticmethod
+    @traced()
+    async def generate_video_from_bytes(
+        project_name: str,
+        start_bytes: bytes,
+        end_bytes: bytes,
+        prompt: str,
+        progress_callback: Optional[Callable[..., None]] = None,
+        proxy: bool = False
+    ) -> Dict[str, Any]:
+        """
+        이미지 바이트로 비디오 생성 후 응답 구성
+        /generate-video 와 비동기 작업(Job) 양쪽에서 공용으로 사용
+        """
+        try:
             # Animator 호출 및 프레임 생성
-            result = animator.generate_video_from_images(
+            result = await animator.generate_video_from_images(
                 project_name=project_name,
                 start_image_bytes=start_bytes,
                 end_image_bytes=end_bytes,
-                prompt=prompt
+                prompt=prompt,
+                progress_callback=progress_callback
             )
             
             if not result:
                 return {"status": "error", "message": "비디오 생성 실패"}
                 
-            frame_paths, video_path = result
-        
-            video_data_b64 = None
-            frames_b64 = []
-            
-            # 3. 파일들을 Base64로 읽기
-            
-            # 3-1. 프레임 이미지 읽기
-            for path in frame_paths:
-                with open(path, "rb") as img_file:
-                    b64_str = base64.b64encode(img_file.read()).decode('utf-8')
-                    ext = os.path.splitext(path)[1].lower().replace('.', '')
-                    if ext == 'jpg': ext = 'jpeg'
-                    frames_b64.append(f"data:image/{ext};base64,{b64_str}")
-            
-            # 3-2. 비디오 파일 읽기
-            if video_path and os.path.exists(video_path):
-                with open(video_path, "rb") as vid_file:
-                    b64_vid = base64.b64encode(vid_file.read()).decode('utf-8')
-                    video_data_b64 = f"data:video/mp4;base64,{b64_vid}"
-    
-            # 임시 파일 정리 및 용량 확보
-            first_frame_dir = os.path.dirname(frame_paths[0])
-            if os.path.exists(first_frame_dir):
-                shutil.rmtree(first_frame_dir)
-                print(f"서버 정리 완료: {first_frame_dir}")
-                
-            return {
-                "status": "success",
-                "message": "비디오 생성 및 변환 완료",
-                "data": {
-                    "project_name": project_name,
-                    "frame_count": len(frames_b64),
-                    "frames": frames_b64,
-                    "video_data": video_data_b64
-                }
-            }
+            frames, video_path = result
+            if progress_callback:
+                progress_callback("encoding", frame_count=len(frames))
+
+            # 파일 읽기 및 정리는 블로킹이므로 스레드에서 실행
+            return await asyncio.to_thread(
+                VideoService._pack_generation_result,
+                project_name, frames, video_path, proxy
+            )
             
+        except (SchedulerBusyError, WorkspaceQuotaError):
+            raise
         except Exception as e:
             print(f"Error processing files: {e}")
             return {"status": "error", "message": f"파일 처리 중 오류: {str(e)}"}
 
     @staticmethod
-    def regenerate_segment(
+    def resume_pending_tasks() -> int:
+        """
+        재시작 전에 제출된 Kling 작업을 비동기 작업(Job)으로 다시 등록 (서버 시작 시 호출)
+        ? 기존 job_id 를 유지하므로 클라이언트는 같은 /jobs/{job_id} 로 결과를 다시 조회할 수 있음
+        """
+        pruned = task_ledger.prune()
+        if pruned:
+            print(f"🧾 오래된 작업 기록 정리: {pruned}건")
+
+        entries = task_ledger.pending()
+        for entry in entries:
+            job_manager.submit(
+                "generate-video",
+                entry.project_name,
+                VideoService.resume_generation,
+                entry,
+                job_id=entry.job_id
+            )
+        if entries:
+            print(f"🔁 이어서 처리할 Kling 작업: {len(entries)}건")
+        return len(entries)
+
+    @staticmethod
+    async def resume_generation(
+        entry: LedgerEntry,
+        progress_callback: Optional[Callable[..., None]] = None
+    ) -> Dict[str, Any]:
+        """
+        기록된 Kling 작업의 결과를 받아 생성 응답 구성 (결과는 캐시에도 저장됨)
+        """
+        try:
+            result = await animator.resume_task(entry, progress_callback=progress_callback)
+            if not result:
+                # 다른 요청이 먼저 처리했다면 같은 입력 재요청 시 캐시에서 반환됨
+                return {"status": "error", "message": f"작업을 이어서 처리하지 못했습니다: {entry.task_id}"}
+
+            frames, video_path = result
+            if progress_callback:
+                progress_callback("encoding", frame_count=len(frames))
+            return await asyncio.to_thread(
+                VideoService._pack_generation_result,
+                entry.project_name, frames, video_path
+            )
+        except Exception as e:
+            traceback.print_exc()
+            return {"status": "error", "message": str(e)}
+
+    @staticmethod
+    async def stream_generation(
+        start_image: UploadFile,
+        end_image: UploadFile,
+        prompt: str,
+        project_name: str,
+        proxy: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        비디오 생성 스트리밍 서비스 로직
+        전체 결과를 모으지 않고 프레임이 추출되는 대로 이벤트로 전달
+        proxy=True 면 frame 이벤트는 추출 중에 만든 리뷰용 저해상도 프레임 (프레임 보관소에 그대로 재사용)
+        """
+        try:
+            start_bytes = await start_image.read()
+            end_bytes = await end_image.read()
+        except Exception as e:
+            print(f"Error processing files: {e}")
+            yield {"type": "done", "status": "error", "message": f"파일 처리 중 오류: {str(e)}"}
+            return
+
+        async def run(on_frame: Callable[[int, bytes], None], **frame_callbacks: Any) -> Dict[str, Any]:
+            proxies: Dict[int, bytes] = {}
+
+            def proxy_frame(index: int, data: bytes) -> None:
+                # ? 추출 스레드에서 실행되므로 프록시 생성이 추출과 함께 진행됨
+                proxies[index] = frames_lib.make_proxy(data)
+                on_frame(index, proxies[index])
+
+            use_proxy = proxy and settings.PROXY_ENABLED
+            result = await animator.generate_video_from_images(
+                project_name=project_name,
+                start_image_bytes=start_bytes,
+                end_image_bytes=end_bytes,
+                prompt=prompt,
+                on_frame=proxy_frame if use_proxy else on_frame,
+                **frame_callbacks
+            )
+            if not result:
+                return {"status": "error", "message": "비디오 생성 실패"}
+            frames, video_path = result
+            streamed = [proxies.get(index) for index in range(len(frames))]
+            packed = await asyncio.to_thread(
+                VideoService._pack_generation_result,
+                project_name, frames, video_path, proxy,
+                streamed if use_proxy and None not in streamed else None
+            )
+            # 프레임은 이미 frame 이벤트로 전송됨
+            packed["data"].pop("frames")
+            return packed
+
+        async for event in VideoService._stream_events(run):
+            yield event
+
+    @staticmethod
+    async def stream_regeneration(**kwargs: Any) -> AsyncIterator[Dict[str, Any]]:
+        """
+        구간 재생성 스트리밍 서비스 로직 (인자는 regenerate_segment 와 동일)
+        ? 샘플링 후 보간으로 프레임이 보충된 경우 done 이벤트에 최종 프레임 전체를 포함
+        """
+        async def run(on_frame: Callable[[int, bytes], None], **frame_callbacks: Any) -> Dict[str, Any]:
+            streamed = 0
+
+            def count_frame(index: int, data: bytes) -> None:
+                nonlocal streamed
+                streamed += 1
+                on_frame(index, frames_lib.make_proxy(data) if use_proxy else data)
+
+            use_proxy = kwargs.get("proxy") and settings.PROXY_ENABLED
+
+            result = await VideoService.regenerate_segment(**kwargs, on_frame=count_frame, **frame_callbacks)
+            if result.get("status") == "success" and len(result["data"]["frames"]) == streamed:
+                result["data"].pop("frames")
+            return result
+
+        async for event in VideoService._stream_events(run):
+            yield event
+
+    @staticmethod
+    async def _stream_events(
+        run: Callable[..., Awaitable[Dict[str, Any]]]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        run 을 실행하면서 진행 상황과 프레임을 순서대로 이벤트로 내보내는 스트림
+
+        이벤트 순서:
+            progress * N → header (frame_count, fps, width, height) → frame * N → done
+            작업이 길어지면 중간에 keepalive 이벤트 전송
+        ! 프레임은 추출 스레드에서 도착하므로 이벤트 루프로 넘겨서 순서 보장
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def emit(event: Any) -> None:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+        def progress_callback(stage: str, **info: Any) -> None:
+            emit({"type": "progress", "stage": stage, **info})
+
+        def on_video_info(info: Dict[str, Any]) -> None:
+            emit({"type": "header", **info})
+
+        def on_frame(index: int, data: bytes) -> None:
+            emit({"type": "frame", "index": index, "data": Blob(data, "image/jpeg")})
+
+        task = asyncio.create_task(run(
+            progress_callback=progress_callback,
+            on_video_info=on_video_info,
+            on_frame=on_frame
+        ))
+        task.add_done_callback(lambda _: queue.put_nowait(_STREAM_END))
+
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.JOB_SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield {"type": "keepalive"}
+                    continue
+                if event is _STREAM_END:
+                    break
+                yield event
+
+            try:
+                result = task.result()
+            except (SchedulerBusyError, MediaPoolBusyError, WorkspaceQuotaError) as e:
+                # ! 스트림 시작 후에는 상태 코드(429/503)를 바꿀 수 없으므로 재시도 대기 시간을 이벤트로 전달
+                result = {"status": "error", "message": str(e), "retry_after": e.retry_after}
+            except Exception as e:
+                traceback.print_exc()
+                result = {"status": "error", "message": str(e)}
+            yield {"type": "done", **result}
+        finally:
+            # 클라이언트 연결 종료 시 작업 중단
+            if not task.done():
+                task.cancel()
+
+    @staticmethod
+    @traced()
+    def _pack_generation_result(
+        project_name: str,
+        frames: Iterable[bytes],
+        video_path: Optional[str],
+        proxy: bool = False,
+        proxies: Optional[List[bytes]] = None
+    ) -> Dict[str, Any]:
+        """
+        생성된 프레임(JPEG 바이트)/비디오 파일을 응답(Blob)으로 구성 후 임시 파일 삭제
+        프레임은 프레임 보관소에, 비디오는 결과 보관소에 등록 (비디오는 video_url 로 다운로드)
+        proxy=True 면 응답 프레임은 리뷰용 저해상도 프레임 (proxies 가 없으면 여기서 생성)
+        """
+        video_fields: Dict[str, Any] = {"video_data": None}
+        
+        # 3. 응답 데이터 구성
+        try:
+            # 3-1. 프레임 (메모리 내 JPEG 바이트)
+            frames = list(frames)
+            if proxies is None and settings.PROXY_ENABLED:
+                with track_stage("proxy"):
+                    proxies = frames_lib.make_proxies(frames)
+                frames_processed.labels(stage="proxy").inc(len(frames))
+            stored = frame_store.create(project_name, frames, proxies)
+            annotate(frame_count=len(frames), frame_bytes=sum(map(len, frames)))
+            proxy = proxy and stored.proxies is not None
+            frame_blobs = [Blob(frame, "image/jpeg") for frame in (stored.proxies if proxy else frames)]
+
+            # 3-2. 비디오 파일 보관 (메모리로 읽지 않고 결과 보관소로 이동)
+            if video_path and os.path.exists(video_path):
+                video_fields = VideoService._publish_video(video_path, "video/mp4", f"{project_name}.mp4")
+        finally:
+            # 다운로드 작업 디렉토리 정리 및 용량 확보
+            if video_path:
+                workspace_manager.release(os.path.dirname(video_path))
+            
+        return {
+            "status": "success",
+            "message": "비디오 생성 및 변환 완료",
+            "data": {
+                "project_name": project_name,
+                "project_id": stored.project_id,
+                "version": stored.version,
+                "frame_count": len(frame_blobs),
+                "frames": frame_blobs,
+                "proxy": proxy,
+                **video_fields
+            }
+        }
+
+    @staticmethod
+    def _publish_video(path: str, mime: str, filename: str) -> Dict[str, Any]:
+        """
+        비디오 파일을 결과 보관소에 등록하고 응답 필드 구성 (블로킹, API 프로세스에서 실행)
+        ? video_data(Base64)는 RESULT_INLINE_VIDEO 설정 시에만 포함 (이전 클라이언트 호환용)
+        """
+        with track_stage("publish"):
+            stored = result_store.adopt(path, mime, filename)
+        annotate(video_size=stored.size, video_mime=mime)
+        video_data = None
+        if settings.RESULT_INLINE_VIDEO:
+            with open(stored.path, "rb") as f:
+                video_data = Blob(f.read(), mime)
+        return {
+            "video_id": stored.result_id,
+            "video_url": stored.url,
+            "video_mime": mime,
+            "video_size": stored.size,
+            "video_data": video_data,
+        }
+
+    @staticmethod
+    @traced()
+    def _publish_render(project_name: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """미디어 워커 렌더링 결과(작업 디렉토리에 기록된 파일)를 결과 보관소로 옮겨 등록 (작업 디렉토리 정리 전에 호출)"""
+        if result.get("status") != "success":
+            return result
+        path = result["data"]["video_path"]
+        ext = os.path.splitext(path)[1]
+        return {
+            "status": "success",
+            "data": VideoService._publish_video(path, mime_for(path), f"{project_name}{ext}")
+        }
+
+    @staticmethod
+    @traced()
+    async def regenerate_segment(
         project_name: str,
-        start_image_b64: str,
-        end_image_b64: str,
+        start_image: Optional[Union[str, bytes]],
+        end_image: Optional[Union[str, bytes]],
         prompt: str,
         revision_prompt: str,
-        target_frame_count: int
+        target_frame_count: Optional[int],
+        project_id: Optional[str] = None,
+        start_index: Optional[int] = None,
+        end_index: Optional[int] = None,
+        mode: str = REGENERATE_MODE_KLING,
+        proxy: bool = False,
+        **frame_callbacks: Any
     ) -> Dict[str, Any]:
         """
         특정 구간 재생성 서비스 로직
+        - project_id 지정 시: 보관 중인 프레임의 start_index/end_index 를 키 프레임으로 사용하고,
+          결과를 서버에서 바로 이어 붙임 (프레임 업로드 불필요)
+        - 그 외: start_image/end_image 는 Base64(data URL) 문자열 또는 바이너리
+        mode: "kling" (원격 재생성, 프레임 수는 리타이밍으로 보정) 또는 "local" (키 프레임 사이 광학 흐름 보간만 수행)
+        proxy: True 면 응답 프레임은 리뷰용 저해상도 프레임 (project_id 지정 시 보관소 프록시도 함께 갱신)
+        frame_callbacks: progress_callback/on_video_info/on_frame (스트리밍 응답용, Animator 로 전달)
+
+        Raises:
+            SchedulerBusyError: Kling 작업 대기열이 가득 찬 경우
+            MediaPoolBusyError: 보간용 미디어 워커 대기열이 가득 찬 경우
+            WorkspaceQuotaError: 임시 작업 공간이 부족한 경우
         """
-        temp_dir = f"temp_{project_name}_regen"
+        version = None
+        if project_id:
+            project = frame_store.get(project_id)
+            if project is None:
+                return {"status": "error", "message": f"프로젝트 프레임을 찾을 수 없습니다 (만료 가능): {project_id}"}
+            if start_index is None or end_index is None or not 0 <= start_index < end_index < len(project.frames):
+                return {"status": "error", "message": f"프레임 인덱스 범위 오류: {start_index} ~ {end_index}"}
+            start_image = project.frames[start_index]
+            end_image = project.frames[end_index]
+            version = project.version
+            if target_frame_count is None:
+                # 클라이언트 구간 선택과 동일한 기준
+                target_frame_count = end_index - start_index
+        elif start_image is None or end_image is None or target_frame_count is None:
+            return {
+                "status": "error",
+                "message": "project_id/start_index/end_index 또는 start_image/end_image/target_frame_count 가 필요합니다"
+            }
+
+        annotate(mode=mode, target_frame_count=target_frame_count)
         try:
-            # 1. Base64 디코딩 및 임시 파일 저장
-            os.makedirs(temp_dir, exist_ok=True)
-            
-            start_path = os.path.join(temp_dir, "start.jpg")
-            end_path = os.path.join(temp_dir, "end.jpg")
-            
-            # Remove header if present
-            start_data = start_image_b64.split(",")[1] if "," in start_image_b64 else start_image_b64
-            end_data = end_image_b64.split(",")[1] if "," in end_image_b64 else end_image_b64
+            if mode == REGENERATE_MODE_LOCAL:
+                # 로컬 보간: Kling 호출 없이 키 프레임 사이를 광학 흐름으로 합성
+                new_frames = await VideoService._interpolate_segment(
+                    decode_data_url(start_image), decode_data_url(end_image), target_frame_count,
+                    **frame_callbacks
+                )
+            else:
+                new_frames = await VideoService._regenerate_with_kling(
+                    project_name, start_image, end_image, prompt, revision_prompt,
+                    target_frame_count, **frame_callbacks
+                )
+
+            if not new_frames:
+                record_error("regeneration")
+                return {"status": "error", "message": "재생성 실패"}
+            annotate(frame_count=len(new_frames), frame_bytes=sum(map(len, new_frames)))
+                
+            # 3. 결과 구성 (메모리 내 JPEG 바이트)
+            new_proxies = None
+            if settings.PROXY_ENABLED and (proxy or project_id):
+                with track_stage("proxy"):
+                    new_proxies = await asyncio.to_thread(frames_lib.make_proxies, new_frames)
+                frames_processed.labels(stage="proxy").inc(len(new_frames))
+            data: Dict[str, Any] = {
+                "frames": [Blob(frame, "image/jpeg") for frame in (new_proxies if proxy and new_proxies else new_frames)],
+                "proxy": bool(proxy and new_proxies)
+            }
+            if project_id:
+                # 보관 중인 프레임에 반영 (양 끝 키 프레임 유지)
+                try:
+                    project = frame_store.splice(
+                        project_id, start_index, end_index, new_frames,
+                        expected_version=version, new_proxies=new_proxies
+                    )
+                except KeyError:
+                    return {"status": "error", "message": f"프로젝트 프레임을 찾을 수 없습니다 (만료 가능): {project_id}"}
+                except ValueError as e:
+                    return {"status": "error", "message": str(e)}
+                data.update({
+                    "project_id": project_id,
+                    "version": project.version,
+                    "frame_count": len(project.frames)
+                })
+
+            return {
+                "status": "success",
+                "data": data
+            }
+        except (SchedulerBusyError, MediaPoolBusyError, WorkspaceQuotaError):
+            raise
+        except Exception as e:
+            record_error("regeneration")
+            traceback.print_exc()
+            return {"status": "error", "message": str(e)}
+
+    @staticmethod
+    @traced()
+    async def _regenerate_with_kling(
+        project_name: str,
+        start_image: Union[str, bytes],
+        end_image: Union[str, bytes],
+        prompt: str,
+        revision_prompt: str,
+        target_frame_count: int,
+        **frame_callbacks: Any
+    ) -> Optional[List[bytes]]:
+        """
+        Kling 으로 구간 재생성 후 목표 프레임 수만큼 샘플링
+        ? 생성된 영상의 프레임이 목표보다 적으면 RETIME_MODE 로 리타이밍하여 정확히 맞춤 (재생성 재요청 불필요)
+        """
+        # 1. 이미지 디코딩 및 요청별 작업 디렉토리에 저장 (같은 프로젝트 동시 재생성 시에도 분리)
+        with workspace_manager.create("regen") as workspace:
+            start_path = workspace.file("start.jpg")
+            end_path = workspace.file("end.jpg")
 
             with open(start_path, "wb") as f:
-                f.write(base64.b64decode(start_data))
+                f.write(decode_data_url(start_image))
             with open(end_path, "wb") as f:
-                f.write(base64.b64decode(end_data))
-                
+                f.write(decode_data_url(end_image))
+
             # 2. Animator 호출
-            new_frames = animator.regenerate_video_segment(
+            new_frames = await animator.regenerate_video_segment(
                 project_name=project_name,
                 start_image_path=start_path,
                 end_image_path=end_path,
                 target_frame_count=target_frame_count,
                 original_prompt=prompt,
-                revision_prompt=revision_prompt
+                revision_prompt=revision_prompt,
+                **frame_callbacks
             )
-            
-            if not new_frames:
-                if os.path.exists(temp_dir):
-                    shutil.rmtree(temp_dir)
-                return {"status": "error", "message": "재생성 실패"}
-                
-            # 3. 결과 Base64 변환
-            frames_b64 = []
-            for path in new_frames:
-                with open(path, "rb") as img_file:
-                    b64_str = base64.b64encode(img_file.read()).decode('utf-8')
-                    ext = os.path.splitext(path)[1].lower().replace('.', '')
-                    if ext == 'jpg': ext = 'jpeg'
-                    frames_b64.append(f"data:image/{ext};base64,{b64_str}")
-            
-            # 4. Cleanup
-            # new_frames의 부모 디렉토리도 삭제 (generated_frames/...)
-            if new_frames:
-                first_frame_dir = os.path.dirname(new_frames[0])
-                if os.path.exists(first_frame_dir) and "generated_frames" in first_frame_dir:
-                    shutil.rmtree(first_frame_dir)
 
-            return {
-                "status": "success",
-                "data": {
-                    "frames": frames_b64
-                }
+        # 3. 프레임 수 보정
+        if new_frames and len(new_frames) != target_frame_count:
+            print(f"🎞️ 샘플링 프레임 수 보정 ({len(new_frames)} → {target_frame_count}, {settings.RETIME_MODE})")
+            with track_stage("retime"):
+                new_frames = await media_pool.run(
+                    retiming.retime_jpeg, new_frames, target_frame_count, mode=settings.RETIME_MODE
+                )
+            frames_processed.labels(stage="retime").inc(target_frame_count)
+        return new_frames
+
+    @staticmethod
+    @traced()
+    async def _interpolate_segment(
+        start_bytes: bytes,
+        end_bytes: bytes,
+        count: int,
+        progress_callback: Optional[Callable[..., None]] = None,
+        on_video_info: Optional[Callable[[Dict[str, Any]], None]] = None,
+        on_frame: Optional[Callable[[int, bytes], None]] = None
+    ) -> List[bytes]:
+        """
+        키 프레임 사이 중간 프레임 count 장을 로컬에서 합성 (미디어 워커에서 실행)
+        콜백은 Animator 재생성 경로와 같은 순서로 호출 (스트리밍 응답 호환)
+        """
+        if count <= 0:
+            return []
+        if progress_callback:
+            progress_callback("interpolating", frame_count=count)
+        with track_stage("interpolate"):
+            frames = await media_pool.run(interpolation.inbetween_jpeg, start_bytes, end_bytes, count)
+        frames_processed.labels(stage="interpolate").inc(len(frames))
+
+        if on_video_info:
+            on_video_info({"frame_count": len(frames), "fps": None, "width": None, "height": None})
+        if on_frame:
+            for index, frame in enumerate(frames):
+                on_frame(index, frame)
+        return frames
+
+    @staticmethod
+    def get_project_frames(
+        project_id: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        proxy: bool = False
+    ) -> Dict[str, Any]:
+        """
+        보관 중인 프레임 범위 [start, end) 조회 (end 생략 시 마지막까지)
+        proxy=True 면 리뷰용 저해상도 프레임 (프록시가 없으면 원본)
+        """
+        project = frame_store.get(project_id)
+        if project is None:
+            return {"status": "error", "message": f"프로젝트 프레임을 찾을 수 없습니다 (만료 가능): {project_id}"}
+        total = len(project.frames)
+        end = total if end is None else end
+        if not 0 <= start < end <= total:
+            return {"status": "error", "message": f"프레임 인덱스 범위 오류: {start} ~ {end}"}
+
+        use_proxy = proxy and project.proxies is not None
+        source = project.proxies if use_proxy else project.frames
+        return {
+            "status": "success",
+            "data": {
+                "project_id": project_id,
+                "version": project.version,
+                "frame_count": total,
+                "start": start,
+                "end": end,
+                "proxy": use_proxy,
+                "frames": [Blob(frame, "image/jpeg") for frame in source[start:end]]
             }
-        except Exception as e:
-            traceback.print_exc()
-            return {"status": "error", "message": str(e)}
-        finally:
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
+        }
+
+    @staticmethod
+    def export_project_zip(project_id: str, proxy: bool = False) -> Optional[Tuple[str, Iterator[bytes]]]:
+        """
+        보관 중인 프로젝트 프레임을 ZIP 스트림으로 내보내기 (파일명, ZIP 조각 이터레이터)
+        프로젝트가 없으면 None
+        """
+        project = frame_store.get(project_id)
+        if project is None:
+            return None
+        frames = project.proxies if proxy and project.proxies is not None else project.frames
+        # ? 요청 시점의 프레임 목록으로 고정 (다운로드 도중 재생성되어도 섞이지 않음)
+        named = ((f"frame_{index:03d}.jpg", frame) for index, frame in enumerate(list(frames)))
+        return f"{project.project_name}_frames.zip", animator.iter_zip_from_frames(named)
 
     @staticmethod
-    def render_video(
+    @traced()
+    async def render_video(
         project_name: str,
-        frames_b64: List[str],
-        fps: int
+        frames: List[Union[str, bytes]],
+        fps: int,
+        project_id: Optional[str] = None,
+        **options: Any
     ) -> Dict[str, Any]:
         """
         프레임 리스트를 비디오로 렌더링하는 서비스 로직
+        frames 는 Base64(data URL) 문자열 또는 바이너리
+        project_id 지정 시 보관 중인 프레임으로 렌더링 (frames 무시)
+        options: frame_count/speed/retime_mode/codec_preference (render_spool 참고)
+
+        Raises:
+            MediaPoolBusyError: 미디어 워커 대기열이 가득 찬 경우
+            WorkspaceQuotaError: 임시 작업 공간이 부족한 경우
+        """
+        if project_id:
+            project = frame_store.get(project_id)
+            if project is None:
+                return {"status": "error", "message": f"프로젝트 프레임을 찾을 수 없습니다 (만료 가능): {project_id}"}
+            # ? 요청 시점의 프레임 목록으로 고정 (렌더링 도중 재생성되어도 섞이지 않음)
+            frames = list(project.frames)
+        annotate(frame_count=len(frames), fps=fps)
+
+        # ! 디코딩/인코딩은 미디어 워커에서 실행 (이벤트 루프 차단 방지)
+        # ! 프레임은 작업 디렉토리의 스풀 파일로 넘기고 워커에는 경로와 오프셋만 전달
+        #   (프로세스 워커에 전체 프레임 리스트를 pickle 로 복사하지 않음)
+        # ? 작업 디렉토리는 이 프로세스에서 발급/정리 (워커가 비정상 종료해도 회수됨)
+        with workspace_manager.create("render") as workspace:
+            spool_path = workspace.file("frames.spool")
+            try:
+                segments = await asyncio.to_thread(VideoService._spool_frames, spool_path, frames)
+            except ValueError as e:
+                # 잘못된 Base64 등 (binascii.Error 는 ValueError 하위 클래스)
+                record_error("render")
+                return {"status": "error", "message": f"프레임 디코딩 실패: {e}"}
+            with track_stage("render"):
+                result = await media_pool.run(
+                    VideoService.render_spool, project_name, spool_path, segments, fps, workspace.path, **options
+                )
+            VideoService._record_render(result, len(segments))
+            return await asyncio.to_thread(VideoService._publish_render, project_name, result)
+
+    @staticmethod
+    @traced()
+    async def render_video_upload(
+        project_name: str,
+        fps: int,
+        frames: AsyncIterator[bytes],
+        order: Optional[List[int]] = None,
+        **options: Any
+    ) -> Dict[str, Any]:
+        """
+        요청 본문에서 순차적으로 읽은 프레임을 렌더링하는 서비스 로직
+        ! 프레임은 도착하는 대로 임시 스풀 파일에 기록하므로 메모리 사용량이 클립 길이와 무관
+
+        Args:
+            frames: 프레임 바이트 비동기 이터레이터 (transport.open_frame_upload)
+            order: 렌더링 순서 (스풀에 기록된 프레임 번호 목록, None 이면 도착 순서)
+            options: frame_count/speed/retime_mode/codec_preference (render_spool 참고)
+
+        Raises:
+            MediaPoolBusyError: 미디어 워커 대기열이 가득 찬 경우
+            WorkspaceQuotaError: 임시 작업 공간이 부족한 경우
+        """
+        # 스풀 파일과 렌더링 결과를 같은 요청별 작업 디렉토리에 기록 (RAM 디스크 사용 시 I/O 대기 없음)
+        with workspace_manager.create("render") as workspace:
+            spool_path = workspace.file("upload.frames")
+            segments: List[Tuple[int, int]] = []
+            offset = 0
+            try:
+                with track_stage("upload_receive"), open(spool_path, "wb") as spool:
+                    async for frame in frames:
+                        # ? 프레임 1장 단위 기록 (페이지 캐시 쓰기라 이벤트 루프 지연이 작음)
+                        spool.write(frame)
+                        segments.append((offset, len(frame)))
+                        offset += len(frame)
+            except ValueError as e:
+                record_error("upload_parse")
+                return {"status": "error", "message": f"프레임 업로드 파싱 실패: {e}"}
+
+            if order is not None:
+                if any(not 0 <= index < len(segments) for index in order):
+                    return {"status": "error", "message": "존재하지 않는 프레임 파트를 참조했습니다"}
+                segments = [segments[index] for index in order]
+            if not segments:
+                return {"status": "error", "message": "렌더링할 프레임이 없습니다"}
+
+            print(f"📥 프레임 업로드 수신: {len(segments)} frames ({offset / (1 << 20):.1f}MB)")
+            annotate(frame_count=len(segments), upload_bytes=offset, fps=fps)
+            with track_stage("render"):
+                result = await media_pool.run(
+                    VideoService.render_spool, project_name, spool_path, segments, fps, workspace.path, **options
+                )
+            VideoService._record_render(result, len(segments))
+            return await asyncio.to_thread(VideoService._publish_render, project_name, result)
+
+    @staticmethod
+    def _record_render(result: Dict[str, Any], frame_count: int) -> None:
+        """렌더링 결과 지표 기록 (처리 프레임 수는 리타이밍 전 입력 기준)"""
+        if result.get("status") == "success":
+            frames_processed.labels(stage="render").inc(frame_count)
+        else:
+            record_error("render")
+
+    @staticmethod
+    def _spool_frames(spool_path: str, frames: List[Union[str, bytes]]) -> List[Tuple[int, int]]:
+        """
+        프레임(Base64 data URL 또는 바이너리)을 스풀 파일에 이어 쓰고 (오프셋, 길이) 목록 반환 (블로킹)
+        """
+        segments: List[Tuple[int, int]] = []
+        offset = 0
+        with open(spool_path, "wb") as spool:
+            for frame in frames:
+                data = decode_data_url(frame)
+                spool.write(data)
+                segments.append((offset, len(data)))
+                offset += len(data)
+        return segments
+
+    @staticmethod
+    def render_spool(
+        project_name: str,
+        spool_path: str,
+        segments: List[Tuple[int, int]],
+        fps: int,
+        workspace_dir: str,
+        frame_count: Optional[int] = None,
+        speed: Optional[List[float]] = None,
+        retime_mode: Optional[str] = None,
+        codec_preference: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        스풀 파일의 프레임을 순서대로 읽어 렌더링 (블로킹, 미디어 워커에서 실행)
+        segments: (오프셋, 길이) 목록 - 렌더링 순서
+        workspace_dir: 호출 측이 발급한 요청별 작업 디렉토리 (인코딩 중간 파일 기록)
+        frame_count/speed 지정 시 리타이밍 후 인코딩 (retiming.source_positions, retime_mode 기본값은 RETIME_MODE)
+        codec_preference: fast / small (기본값은 VIDEO_CODEC_PREFERENCE)
+        """
+        def read_frames() -> Iterable[bytes]:
+            with open(spool_path, "rb") as spool:
+                for offset, length in segments:
+                    spool.seek(offset)
+                    yield spool.read(length)
+
+        return VideoService._encode_video(
+            project_name, read_frames(), fps, workspace_dir,
+            VideoService._retime_positions(len(segments), frame_count, speed), retime_mode, codec_preference
+        )
+
+    @staticmethod
+    def _retime_positions(
+        total: int,
+        frame_count: Optional[int],
+        speed: Optional[List[float]]
+    ) -> Optional[List[float]]:
+        """렌더링 리타이밍 위치 (frame_count/speed 모두 없으면 None = 원본 그대로)"""
+        if frame_count is None and speed is None:
+            return None
+        return retiming.source_positions(total, frame_count, speed).tolist()
+
+    @staticmethod
+    def _encode_video(
+        project_name: str,
+        frames: Iterable[bytes],
+        fps: int,
+        workspace_dir: str,
+        positions: Optional[List[float]] = None,
+        retime_mode: Optional[str] = None,
+        codec_preference: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        인코딩된 이미지 바이트 스트림을 비디오로 렌더링
+        positions 지정 시 리타이밍하여 기록
+        ! 완성된 파일 경로만 반환 (결과 보관소 등록과 작업 디렉토리 정리는 API 프로세스에서)
         """
-        temp_dir = f"temp_{project_name}_render"
         try:
-            # 1. 임시 디렉토리 생성
-            os.makedirs(temp_dir, exist_ok=True)
+            # 1. 출력 경로 (프레임은 파일로 쓰지 않고 메모리에서 바로 디코딩)
+            # 2. 비디오 생성 (Animator, 코덱/확장자는 codec_registry 가 선택)
+            output_path = os.path.join(workspace_dir, f"{project_name}_final")
             
-            frame_paths = []
-            for i, frame_b64 in enumerate(frames_b64):
-                file_path = os.path.join(temp_dir, f"frame_{i:05d}.jpg")
-                # header 제거 (data:image/jpeg;base64,...)
-                if "," in frame_b64:
-                    b64_data = frame_b64.split(",")[1]
-                else:
-                    b64_data = frame_b64
-                
-                with open(file_path, "wb") as f:
-                    f.write(base64.b64decode(b64_data))
-                frame_paths.append(file_path)
-                
-            # 2. 비디오 생성 (OpenCV via Animator)
-            # 브라우저 호환성을 위해 WebM(VP8) 형식 사용
-            output_filename = f"{project_name}_final.webm"
-            output_path = os.path.join(temp_dir, output_filename)
-            
-            result_video_path = animator.create_video_from_frames(
-                frame_paths=frame_paths,
+            result_video_path = animator.create_video_from_frame_bytes(
+                frames=frames,
                 output_path=output_path,
-                fps=fps
+                fps=fps,
+                positions=positions,
+                retime_mode=retime_mode or settings.RETIME_MODE,
+                codec_preference=codec_preference
             )
             
-            # 3. 비디오 Base64 변환
-            video_b64 = None
-            if result_video_path and os.path.exists(result_video_path):
-                with open(result_video_path, "rb") as f:
-                    video_b64 = "data:video/webm;base64," + base64.b64encode(f.read()).decode('utf-8')
-            
-            if not video_b64:
+            if not result_video_path or not os.path.exists(result_video_path):
                 return {"status": "error", "message": "비디오 렌더링 실패"}
-                
+
+            # 3. 선택된 코덱에 따라 확장자가 다름
             return {
                 "status": "success",
                 "data": {
-                    "video_data": video_b64
+                    "video_path": result_video_path
                 }
             }
     
         except Exception as e:
             traceback.print_exc()
             return {"status": "error", "message": str(e)}
-        finally:
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
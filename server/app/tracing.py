@@ -0,0 +1,333 @@
+"""
+Tracing Module - 요청별 구간(span) 추적 및 샘플링 프로파일러
+
+집계 지표(/metrics)로는 알 수 없는 "이 요청이 왜 느렸는지"를 보기 위한 요청 단위 추적입니다.
+    1. TRACING_ENABLED=True 일 때만 동작 (관리자 플래그), 요청 헤더로 추적 대상 지정
+        - X-Trace: 1   → 구간(span) 시간/크기 기록
+        - X-Profile: 1 → 구간 기록 + 요청 처리 동안 샘플링 프로파일러 실행
+    2. 응답 헤더 X-Trace-Id 로 추적 ID 를 돌려주며, 결과는 최근 TRACE_STORE_MAX_TRACES 건 보관
+        - GET /traces/{trace_id}: 구간 목록 (부모 구간, 시작 시각, 소요 시간, 크기 등 속성)
+        - GET /traces/{trace_id}/profile: 프로파일 (collapsed stack 형식, flamegraph.pl/speedscope 호환)
+    3. 구간은 contextvars 로 전달되므로 asyncio.to_thread 로 넘긴 작업도 같은 요청의 구간으로 기록됨
+
+! 추적 중이 아닌 요청은 span() 이 ContextVar 조회 1회로 끝나므로 비활성 시 오버헤드는 무시할 수준
+? 프로파일러는 프로세스 전체 스레드를 샘플링하므로 동시에 처리 중인 다른 요청도 섞일 수 있음 (스레드 이름으로 구분)
+"""
+import functools
+import inspect
+import itertools
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar, Union
+
+from config.settings import settings
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# 대기 중인 스레드로 보고 샘플에서 제외할 모듈 (스레드 대기, 이벤트 루프 select, 작업 대기열)
+_IDLE_FILES = ("threading.py", "selectors.py", "queue.py", "thread.py")
+
+
+class Span:
+    """
+    추적 구간 1개 (이름, 부모, 시작/소요 시간, 속성)
+    """
+
+    def __init__(self, trace: "Trace", span_id: int, parent_id: Optional[int], name: str, attrs: Dict[str, Any]):
+        self.trace = trace
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.name = name
+        self.attrs = attrs
+        self.thread = threading.current_thread().name
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+
+    def set(self, **attrs: Any) -> None:
+        """속성 추가 (프레임 수, 바이트 크기 등)"""
+        self.attrs.update(attrs)
+
+    def finish(self) -> None:
+        self.end = time.perf_counter()
+
+    def to_dict(self) -> Dict[str, Any]:
+        end = self.end if self.end is not None else time.perf_counter()
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "thread": self.thread,
+            "start_ms": round((self.start - self.trace.start) * 1000, 3),
+            "duration_ms": round((end - self.start) * 1000, 3),
+            "finished": self.end is not None,
+            "attrs": self.attrs,
+        }
+
+
+class _NullSpan:
+    """추적 중이 아닐 때 반환되는 빈 구간 (속성 기록 무시)"""
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+# 현재 요청의 추적 / 현재 구간 (asyncio 태스크, to_thread 로 복사되어 전달)
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("span", default=None)
+
+
+class Trace:
+    """
+    요청 1건의 구간 모음 (+ 프로파일)
+    """
+
+    def __init__(self, name: str):
+        self.trace_id = uuid.uuid4().hex
+        self.name = name
+        self.created_at = time.time()
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.spans: List[Span] = []
+        self.profile: Optional[str] = None
+        self.profile_samples = 0
+        self._ids = itertools.count(1)
+
+    def start_span(self, name: str, parent: Optional[Span], attrs: Dict[str, Any]) -> Span:
+        # ? 여러 스레드에서 호출되지만 count/append 는 GIL 아래에서 원자적
+        span = Span(self, next(self._ids), parent.span_id if parent else None, name, attrs)
+        self.spans.append(span)
+        return span
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end if self.end is not None else time.perf_counter()
+        return round((end - self.start) * 1000, 3)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "created_at": self.created_at,
+            "duration_ms": self.duration_ms,
+            "span_count": len(self.spans),
+            "profiled": self.profile is not None,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **self.summary(),
+            "profile_samples": self.profile_samples,
+            "spans": [span.to_dict() for span in list(self.spans)],
+        }
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Union[Span, _NullSpan]]:
+    """
+    구간 기록 (with 블록, 동기/비동기 코드 모두 사용 가능)
+    추적 중이 아니면 아무것도 기록하지 않는 빈 구간을 반환
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield _NULL_SPAN
+        return
+    current = trace.start_span(name, _current_span.get(), attrs)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.attrs["error"] = type(e).__name__
+        raise
+    finally:
+        current.finish()
+        _current_span.reset(token)
+
+
+def traced(name: Optional[str] = None) -> Callable[[F], F]:
+    """
+    함수 전체를 구간으로 기록하는 데코레이터 (이름 생략 시 "클래스.메서드")
+    ! 제너레이터 함수에는 사용하지 않음 (생성 시점만 기록됨)
+    """
+    def decorator(func: F) -> F:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _current_trace.get() is None:
+                    return await func(*args, **kwargs)
+                with span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _current_trace.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def annotate(**attrs: Any) -> None:
+    """현재 구간에 속성 추가 (추적 중이 아니면 무시)"""
+    current = _current_span.get()
+    if current is not None:
+        current.set(**attrs)
+
+
+class SamplingProfiler:
+    """
+    sys._current_frames() 를 주기적으로 읽어 호출 스택별 샘플 수를 세는 프로파일러
+    결과는 collapsed stack 형식 ("스레드;함수 (파일:줄);... 샘플 수" 한 줄씩)
+    """
+
+    def __init__(self, interval: float, max_seconds: float):
+        """
+        Args:
+            interval: 샘플링 간격 (초)
+            max_seconds: 최대 샘플링 시간 (초, 지나면 자동 중지)
+        """
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.samples = 0
+        self._counts: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> str:
+        """샘플링 중지 후 collapsed stack 텍스트 반환 (샘플 수 많은 순)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        lines = [f"{stack} {count}" for stack, count in sorted(self._counts.items(), key=lambda item: -item[1])]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        deadline = time.monotonic() + self.max_seconds
+        while not self._stop.wait(self.interval) and time.monotonic() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = self._collapse(frame)
+                if stack is None:
+                    continue
+                key = f"{names.get(ident, ident)};{stack}"
+                self._counts[key] = self._counts.get(key, 0) + 1
+            self.samples += 1
+
+    @staticmethod
+    def _collapse(frame: Any) -> Optional[str]:
+        """스택을 바깥 → 안쪽 순 "함수 (파일:줄)" 목록으로 (대기 중인 스레드는 None)"""
+        code = frame.f_code
+        if code.co_filename.endswith(_IDLE_FILES):
+            return None
+        parts = []
+        while frame is not None:
+            code = frame.f_code
+            filename = code.co_filename.rsplit("/", 1)[-1]
+            parts.append(f"{code.co_name} ({filename}:{frame.f_lineno})")
+            frame = frame.f_back
+        return ";".join(reversed(parts))
+
+
+class TraceStore:
+    """
+    최근 추적 결과 보관 (개수 상한, 오래된 순 삭제)
+    """
+
+    def __init__(self, max_traces: int):
+        self.max_traces = max_traces
+        self._lock = threading.Lock()
+        self._traces: "OrderedDict[str, Trace]" = OrderedDict()
+
+    def add(self, trace: Trace) -> None:
+        with self._lock:
+            self._traces[trace.trace_id] = trace
+            while len(self._traces) > self.max_traces:
+                self._traces.popitem(last=False)
+
+    def get(self, trace_id: str) -> Optional[Trace]:
+        with self._lock:
+            return self._traces.get(trace_id)
+
+    def list(self) -> List[Dict[str, Any]]:
+        """최근 추적 요약 (최신 순)"""
+        with self._lock:
+            traces = list(self._traces.values())
+        return [trace.summary() for trace in reversed(traces)]
+
+
+class TracingMiddleware:
+    """
+    X-Trace / X-Profile 헤더가 있는 요청을 추적 (ASGI 미들웨어, TRACING_ENABLED=True 일 때만)
+    ? 응답 헤더 X-Trace-Id 로 추적 ID 전달, 스트리밍 응답은 전송이 끝날 때까지 기록
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+        # ! 프로파일러는 프로세스 전체를 샘플링하므로 한 번에 하나만 실행
+        self._profiler_lock = threading.Lock()
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or not settings.TRACING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        profile = _flag(headers.get(b"x-profile"))
+        if not profile and not _flag(headers.get(b"x-trace")):
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(f"{scope['method']} {scope['path']}")
+        trace_header = (b"x-trace-id", trace.trace_id.encode())
+
+        profiler = None
+        if profile and self._profiler_lock.acquire(blocking=False):
+            profiler = SamplingProfiler(settings.PROFILE_SAMPLE_INTERVAL_MS / 1000, settings.PROFILE_MAX_SECONDS)
+            profiler.start()
+
+        async def send_with_trace_id(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), trace_header]}
+                root.set(status=message["status"])
+            await send(message)
+
+        token = _current_trace.set(trace)
+        try:
+            with span(trace.name, method=scope["method"], path=scope["path"]) as root:
+                if profile and profiler is None:
+                    root.set(profile="busy")  # 다른 요청 프로파일링 중
+                await self.app(scope, receive, send_with_trace_id)
+        finally:
+            _current_trace.reset(token)
+            trace.end = time.perf_counter()
+            if profiler is not None:
+                trace.profile = profiler.stop()
+                trace.profile_samples = profiler.samples
+                self._profiler_lock.release()
+            trace_store.add(trace)
+            print(f"🔎 요청 추적: {trace.trace_id} ({trace.name}, {trace.duration_ms:.1f}ms, {len(trace.spans)} spans)")
+
+
+def _flag(value: Optional[bytes]) -> bool:
+    return value is not None and value.strip().lower() in (b"1", b"true", b"yes", b"on")
+
+
+# 싱글톤 인스턴스
+trace_store = TraceStore(max_traces=settings.TRACE_STORE_MAX_TRACES)
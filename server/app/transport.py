@@ -0,0 +1,302 @@
+"""
+Transport Module - 프레임 전송 형식 (JSON Base64 / 바이너리 프레임 컨테이너)
+
+서비스 계층은 프레임/비디오를 Blob(원본 바이트 + MIME)으로 응답 딕셔너리에 담고,
+엔드포인트에서 요청의 Accept 헤더에 따라 직렬화 형식을 고릅니다.
+- 기본: 기존과 동일한 JSON (Blob → data:<mime>;base64,... 문자열)
+- Accept: application/x-anime-frames → 바이너리 프레임 컨테이너 (Base64 33% 증가 없음)
+
+프레임 컨테이너 구조 (정수는 모두 big-endian uint32):
+    b"AFC1" | 매니페스트 길이 | 매니페스트(JSON, UTF-8) | (파트 길이 | 파트 바이트) * N
+매니페스트는 JSON 응답과 같은 구조이며, Blob 자리에는 {"$part": i, "mime": ...} 가 들어갑니다.
+요청 본문도 같은 형식으로 보낼 수 있습니다 (Content-Type: application/x-anime-frames).
+큰 업로드(렌더링)는 open_frame_upload 로 본문 스트림에서 프레임을 하나씩 읽어 전체를 메모리에 올리지 않습니다.
+
+스트리밍 응답(이벤트 단위)은 NDJSON(기본) 또는 SSE(Accept: text/event-stream)로 직렬화합니다.
+"""
+import base64
+import json
+import struct
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+FRAME_CONTAINER_MIME = "application/x-anime-frames"
+NDJSON_MIME = "application/x-ndjson"
+SSE_MIME = "text/event-stream"
+MAGIC = b"AFC1"
+_LENGTH = struct.Struct(">I")
+
+
+class Blob:
+    """
+    응답/요청에 포함되는 바이너리 데이터 (프레임 JPEG, 비디오 등)
+    """
+    __slots__ = ("data", "mime")
+
+    def __init__(self, data: bytes, mime: str = "image/jpeg"):
+        self.data = data
+        self.mime = mime
+
+    def to_data_url(self) -> str:
+        return f"data:{self.mime};base64,{base64.b64encode(self.data).decode('utf-8')}"
+
+
+# -----------------------------------------------------------------------------
+# 형식 협상
+# -----------------------------------------------------------------------------
+def wants_container(accept: Optional[str]) -> bool:
+    """Accept 헤더에 프레임 컨테이너가 포함되어 있는지 확인"""
+    return _accepts(accept, FRAME_CONTAINER_MIME)
+
+
+def _accepts(accept: Optional[str], mime: str) -> bool:
+    if not accept:
+        return False
+    return any(item.split(";")[0].strip().lower() == mime for item in accept.split(","))
+
+
+def stream_media_type(accept: Optional[str]) -> str:
+    """스트리밍 응답 형식 선택 (SSE 요청 시 SSE, 그 외 NDJSON)"""
+    return SSE_MIME if _accepts(accept, SSE_MIME) else NDJSON_MIME
+
+
+def _content_type_is(content_type: Optional[str], mime: str) -> bool:
+    if not content_type:
+        return False
+    return content_type.split(";")[0].strip().lower() == mime
+
+
+def is_container(content_type: Optional[str]) -> bool:
+    """요청 본문이 프레임 컨테이너인지 확인"""
+    return _content_type_is(content_type, FRAME_CONTAINER_MIME)
+
+
+def is_ndjson(content_type: Optional[str]) -> bool:
+    """요청 본문이 NDJSON 인지 확인"""
+    return _content_type_is(content_type, NDJSON_MIME)
+
+
+# -----------------------------------------------------------------------------
+# JSON (Base64 폴백)
+# -----------------------------------------------------------------------------
+def to_json(value: Any) -> Any:
+    """Blob 을 data URL 문자열로 바꾼 JSON 직렬화 가능한 값 반환"""
+    if isinstance(value, Blob):
+        return value.to_data_url()
+    if isinstance(value, dict):
+        return {k: to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(v) for v in value]
+    return value
+
+
+def decode_data_url(value: Any) -> bytes:
+    """
+    data URL / 순수 Base64 문자열 또는 바이트를 원본 바이트로 변환
+    ? 컨테이너 요청은 이미 바이트, JSON 요청은 Base64 문자열
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    data = value.split(",", 1)[1] if "," in value else value
+    return base64.b64decode(data)
+
+
+def format_stream_event(event: Dict[str, Any], media_type: str) -> str:
+    """
+    스트리밍 이벤트 1건 직렬화 (Blob 은 data URL)
+    - NDJSON: JSON 한 줄
+    - SSE: event: <type> / data: <JSON>
+    """
+    body = json.dumps(to_json(event), ensure_ascii=False)
+    if media_type == SSE_MIME:
+        return f"event: {event.get('type', 'message')}\ndata: {body}\n\n"
+    return body + "\n"
+
+
+# -----------------------------------------------------------------------------
+# 바이너리 프레임 컨테이너
+# -----------------------------------------------------------------------------
+def iter_container(payload: Dict[str, Any]) -> Iterator[bytes]:
+    """
+    응답 딕셔너리를 프레임 컨테이너 청크로 직렬화 (StreamingResponse 용)
+    """
+    parts: List[Blob] = []
+
+    def extract(value: Any) -> Any:
+        if isinstance(value, Blob):
+            parts.append(value)
+            return {"$part": len(parts) - 1, "mime": value.mime}
+        if isinstance(value, dict):
+            return {k: extract(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [extract(v) for v in value]
+        return value
+
+    manifest = json.dumps(extract(payload), ensure_ascii=False).encode("utf-8")
+    yield MAGIC + _LENGTH.pack(len(manifest)) + manifest
+    for part in parts:
+        yield _LENGTH.pack(len(part.data))
+        yield part.data
+
+
+def encode_container(payload: Dict[str, Any]) -> bytes:
+    return b"".join(iter_container(payload))
+
+
+def decode_container(body: bytes) -> Dict[str, Any]:
+    """
+    프레임 컨테이너를 딕셔너리로 복원 ({"$part": i} 자리에 원본 바이트)
+
+    Raises:
+        ValueError: 형식이 올바르지 않은 경우
+    """
+    view = memoryview(body)
+    if bytes(view[:4]) != MAGIC:
+        raise ValueError("프레임 컨테이너 형식이 아닙니다")
+
+    offset = 4
+    parts: List[bytes] = []
+    try:
+        (manifest_len,) = _LENGTH.unpack_from(view, offset)
+        offset += 4
+        manifest = json.loads(bytes(view[offset:offset + manifest_len]).decode("utf-8"))
+        offset += manifest_len
+        while offset < len(view):
+            (part_len,) = _LENGTH.unpack_from(view, offset)
+            offset += 4
+            if offset + part_len > len(view):
+                raise ValueError("프레임 컨테이너 파트가 잘렸습니다")
+            parts.append(bytes(view[offset:offset + part_len]))
+            offset += part_len
+    except (struct.error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"프레임 컨테이너 파싱 실패: {e}")
+
+    def restore(value: Any) -> Any:
+        if isinstance(value, dict):
+            if "$part" in value:
+                index = value["$part"]
+                if not isinstance(index, int) or not 0 <= index < len(parts):
+                    raise ValueError(f"존재하지 않는 파트 참조: {index}")
+                return parts[index]
+            return {k: restore(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [restore(v) for v in value]
+        return value
+
+    if not isinstance(manifest, dict):
+        raise ValueError("매니페스트는 JSON 객체여야 합니다")
+    return restore(manifest)
+
+
+# -----------------------------------------------------------------------------
+# 스트리밍 업로드 (본문을 순차적으로 읽기)
+# -----------------------------------------------------------------------------
+class _ChunkReader:
+    """
+    비동기 청크 스트림에서 필요한 만큼만 읽는 버퍼
+    ? 버퍼에는 현재 읽는 파트(프레임 1장) + 청크 1개 정도만 남음
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks.__aiter__()
+        self._buffer = bytearray()
+        self._eof = False
+
+    async def _fill(self, size: int) -> bool:
+        while len(self._buffer) < size and not self._eof:
+            try:
+                self._buffer += await self._chunks.__anext__()
+            except StopAsyncIteration:
+                self._eof = True
+        return len(self._buffer) >= size
+
+    async def at_eof(self) -> bool:
+        return not await self._fill(1)
+
+    async def read_exact(self, size: int) -> bytes:
+        if not await self._fill(size):
+            raise ValueError("요청 본문이 중간에 끊겼습니다")
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    async def readline(self) -> Optional[bytes]:
+        """한 줄 읽기 (줄바꿈 제외), 본문 끝이면 None"""
+        start = 0
+        while True:
+            newline = self._buffer.find(b"\n", start)
+            if newline >= 0:
+                line = bytes(self._buffer[:newline])
+                del self._buffer[:newline + 1]
+                return line
+            start = len(self._buffer)
+            if not await self._fill(start + 1):
+                if not self._buffer:
+                    return None
+                line = bytes(self._buffer)
+                self._buffer.clear()
+                return line
+
+
+async def open_frame_upload(
+    chunks: AsyncIterator[bytes],
+    content_type: Optional[str]
+) -> Tuple[Dict[str, Any], AsyncIterator[bytes]]:
+    """
+    프레임 업로드 본문을 매니페스트와 프레임 이터레이터로 분리 (본문 전체를 버퍼링하지 않음)
+
+    - 프레임 컨테이너: 매니페스트의 frames 는 파트 번호 목록으로 바뀌고,
+      이터레이터는 파트 바이트를 본문 순서대로 반환
+    - NDJSON: 첫 줄이 매니페스트, 이후 각 줄 {"data": "<data URL / Base64>"} 이 프레임 1장
+      (매니페스트의 frames 는 None, 이터레이터는 줄 순서대로 반환)
+
+    Raises:
+        ValueError: 형식이 올바르지 않은 경우 (이터레이터 소비 중에도 발생 가능)
+    """
+    reader = _ChunkReader(chunks)
+
+    if is_container(content_type):
+        if await reader.read_exact(4) != MAGIC:
+            raise ValueError("프레임 컨테이너 형식이 아닙니다")
+        (manifest_len,) = _LENGTH.unpack(await reader.read_exact(4))
+        try:
+            manifest = json.loads((await reader.read_exact(manifest_len)).decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ValueError(f"프레임 컨테이너 파싱 실패: {e}")
+        if not isinstance(manifest, dict):
+            raise ValueError("매니페스트는 JSON 객체여야 합니다")
+
+        refs = manifest.get("frames") or []
+        if not all(isinstance(ref, dict) and isinstance(ref.get("$part"), int) for ref in refs):
+            raise ValueError("frames 는 파트 참조 목록이어야 합니다")
+        manifest["frames"] = [ref["$part"] for ref in refs]
+
+        async def parts() -> AsyncIterator[bytes]:
+            while not await reader.at_eof():
+                (part_len,) = _LENGTH.unpack(await reader.read_exact(4))
+                yield await reader.read_exact(part_len)
+
+        return manifest, parts()
+
+    if is_ndjson(content_type):
+        first = await reader.readline()
+        try:
+            manifest = json.loads(first or b"")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"NDJSON 매니페스트 파싱 실패: {e}")
+        if not isinstance(manifest, dict):
+            raise ValueError("매니페스트는 JSON 객체여야 합니다")
+        manifest["frames"] = None
+
+        async def lines() -> AsyncIterator[bytes]:
+            while (line := await reader.readline()) is not None:
+                if not line.strip():
+                    continue
+                try:
+                    frame = decode_data_url(json.loads(line)["data"])
+                except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+                    raise ValueError(f"NDJSON 프레임 파싱 실패: {e}")
+                yield frame
+
+        return manifest, lines()
+
+    raise ValueError(f"스트리밍 업로드를 지원하지 않는 형식입니다: {content_type}")
@@ -0,0 +1,306 @@
+"""
+Video Codecs Module - 비디오 인코더(코덱) 등록/선택
+
+OpenCV VideoWriter 가 지원하는 코덱은 빌드마다 다르므로, 후보 코덱을 프로세스당 한 번만 시험해
+(작은 임시 파일에 1프레임 기록) 결과를 캐시합니다. 렌더링은 매번 실패하는 코덱을 다시 열지 않고
+캐시된 목록에서 용도에 맞는 코덱을 고릅니다.
+    - fast:  브라우저 재생 가능 코덱 중 인코딩이 가장 빠른 것
+    - small: 브라우저 재생 가능 코덱 중 결과 파일이 가장 작은 것
+
+FFMPEG_ENABLED=True 이고 ffmpeg 실행 파일이 있으면 ffmpeg 파이프 백엔드(H.264/VP9)도 후보에 포함합니다.
+프리셋(FFMPEG_PRESET_FAST / FFMPEG_PRESET_SMALL)으로 속도와 용량을 조절합니다.
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from typing import Any, Collection, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from config.settings import settings
+
+PREFER_FAST = "fast"
+PREFER_SMALL = "small"
+PREFERENCES = (PREFER_FAST, PREFER_SMALL)
+
+BACKEND_OPENCV = "opencv"
+BACKEND_FFMPEG = "ffmpeg"
+
+_MIME_BY_EXT = {
+    ".mp4": "video/mp4",
+    ".webm": "video/webm",
+    ".avi": "video/x-msvideo",
+}
+
+
+def mime_for(path: str) -> str:
+    """출력 파일 확장자에 해당하는 MIME"""
+    return _MIME_BY_EXT.get(os.path.splitext(path)[1].lower(), "application/octet-stream")
+
+
+class Codec:
+    """
+    비디오 코덱 후보 1개
+    """
+
+    def __init__(
+        self,
+        name: str,
+        backend: str,
+        ext: str,
+        browser_playable: bool,
+        speed_rank: int,
+        size_rank: int,
+        fourcc: Optional[str] = None,
+        encoder: Optional[str] = None
+    ):
+        """
+        Args:
+            name: 표시 이름 (예: "VP80", "ffmpeg:libx264")
+            backend: opencv / ffmpeg
+            ext: 출력 파일 확장자
+            browser_playable: 브라우저 <video> 에서 바로 재생 가능한지
+            speed_rank, size_rank: 인코딩 속도 / 결과 크기 순위 (작을수록 빠름 / 작음)
+            fourcc: OpenCV FourCC (opencv 백엔드)
+            encoder: ffmpeg 인코더 이름 (ffmpeg 백엔드)
+        """
+        self.name = name
+        self.backend = backend
+        self.ext = ext
+        self.browser_playable = browser_playable
+        self.speed_rank = speed_rank
+        self.size_rank = size_rank
+        self.fourcc = fourcc
+        self.encoder = encoder
+
+    @property
+    def mime(self) -> str:
+        return _MIME_BY_EXT[self.ext]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "backend": self.backend,
+            "ext": self.ext,
+            "mime": self.mime,
+            "browser_playable": self.browser_playable,
+        }
+
+
+# 후보 코덱 (순위는 python -m benchmarks.run --only codec. 측정 기준, 1280x720 96 frames)
+#   VP80 5.9s / 2.40MB, VP90 42.9s / 2.16MB, mp4v 0.6s, MJPG 1.1s
+# ! avc1 / ffmpeg 코덱은 측정 환경에 없어 순위가 추정값이므로 fast 에서 VP80 뒤에 둠
+#   (기본 출력은 기존과 같은 .webm, 사용 환경에서 codec.* 항목으로 측정 후 조정)
+# ? mp4v(MPEG-4 Part 2)는 대부분 브라우저에서 재생되지 않지만, 재생 가능 코덱이 하나도 없을 때의 최종 폴백
+OPENCV_CANDIDATES: List[Codec] = [
+    Codec("VP80", BACKEND_OPENCV, ".webm", True, speed_rank=1, size_rank=2, fourcc="VP80"),
+    Codec("VP90", BACKEND_OPENCV, ".webm", True, speed_rank=4, size_rank=0, fourcc="VP90"),
+    Codec("avc1", BACKEND_OPENCV, ".mp4", True, speed_rank=2, size_rank=1, fourcc="avc1"),
+    Codec("mp4v", BACKEND_OPENCV, ".mp4", False, speed_rank=0, size_rank=3, fourcc="mp4v"),
+    Codec("MJPG", BACKEND_OPENCV, ".avi", False, speed_rank=1, size_rank=4, fourcc="MJPG"),
+]
+FFMPEG_CANDIDATES: List[Codec] = [
+    Codec("ffmpeg:libx264", BACKEND_FFMPEG, ".mp4", True, speed_rank=2, size_rank=0, encoder="libx264"),
+    Codec("ffmpeg:libvpx-vp9", BACKEND_FFMPEG, ".webm", True, speed_rank=3, size_rank=0, encoder="libvpx-vp9"),
+]
+
+
+class VideoSink:
+    """
+    선택된 코덱으로 프레임을 기록하는 출력 (OpenCV VideoWriter / ffmpeg 파이프 공통 인터페이스)
+    """
+
+    def __init__(self, codec: Codec, path: str, fps: float, size: Tuple[int, int], preference: str):
+        self.codec = codec
+        self.path = path
+        self.size = size
+        self._writer: Optional[cv2.VideoWriter] = None
+        self._process: Optional[subprocess.Popen] = None
+        self._stderr = None
+
+        if codec.backend == BACKEND_FFMPEG:
+            self._stderr = tempfile.TemporaryFile()
+            self._process = subprocess.Popen(
+                _ffmpeg_command(codec, path, fps, size, preference),
+                stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=self._stderr
+            )
+        else:
+            self._writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*codec.fourcc), fps, size)
+
+    def is_opened(self) -> bool:
+        if self._process is not None:
+            return self._process.poll() is None
+        return self._writer is not None and self._writer.isOpened()
+
+    def write(self, frame: np.ndarray) -> None:
+        if frame.shape[1::-1] != self.size:
+            # ! 파이프는 원시 바이트를 그대로 보내므로 크기가 다르면 영상이 깨짐 (VideoWriter 는 조용히 버림)
+            frame = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        if self._process is not None:
+            self._process.stdin.write(np.ascontiguousarray(frame).tobytes())
+        else:
+            self._writer.write(frame)
+
+    def release(self) -> bool:
+        """기록 종료, 성공 여부 반환"""
+        if self._process is not None:
+            try:
+                self._process.stdin.close()
+            except BrokenPipeError:
+                pass
+            code = self._process.wait()
+            if code != 0:
+                self._stderr.seek(0)
+                print(f"⚠️ ffmpeg 인코딩 실패 ({code}): {self._stderr.read().decode(errors='replace')[-500:]}")
+            self._stderr.close()
+            return code == 0
+        self._writer.release()
+        return True
+
+
+def _ffmpeg_command(codec: Codec, path: str, fps: float, size: Tuple[int, int], preference: str) -> List[str]:
+    preset = settings.FFMPEG_PRESET_SMALL if preference == PREFER_SMALL else settings.FFMPEG_PRESET_FAST
+    command = [
+        settings.FFMPEG_PATH, "-hide_banner", "-loglevel", "error", "-y",
+        "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{size[0]}x{size[1]}", "-r", str(fps), "-i", "-",
+        "-c:v", codec.encoder, "-pix_fmt", "yuv420p",
+    ]
+    if codec.encoder == "libx264":
+        # ? yuv420p 는 짝수 크기만 허용
+        command += ["-preset", preset, "-crf", str(settings.FFMPEG_CRF), "-movflags", "+faststart",
+                    "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2"]
+    else:
+        # libvpx 는 x264 프리셋 대신 deadline/cpu-used 로 속도 조절
+        fast = preference != PREFER_SMALL
+        command += ["-b:v", "0", "-crf", str(settings.FFMPEG_CRF + 8),
+                    "-deadline", "realtime" if fast else "good", "-cpu-used", "8" if fast else "2",
+                    "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2"]
+    return command + [path]
+
+
+class CodecRegistry:
+    """
+    사용 가능한 코덱 목록 (프로세스당 한 번 시험 후 캐시)
+    """
+
+    def __init__(self, ffmpeg_enabled: bool = False, ffmpeg_path: str = "ffmpeg"):
+        self.ffmpeg_enabled = ffmpeg_enabled
+        self.ffmpeg_path = ffmpeg_path
+        self._lock = threading.Lock()
+        self._available: Optional[List[Codec]] = None
+
+    def available(self) -> List[Codec]:
+        """사용 가능한 코덱 목록 (처음 호출 시 시험)"""
+        with self._lock:
+            if self._available is None:
+                self._available = self._probe()
+            return list(self._available)
+
+    def select(
+        self,
+        preference: Optional[str] = None,
+        browser_playable: bool = True,
+        exclude: Collection[str] = ()
+    ) -> Optional[Codec]:
+        """
+        용도에 맞는 코덱 선택
+
+        Args:
+            preference: fast / small (None 이면 VIDEO_CODEC_PREFERENCE)
+            browser_playable: True 면 브라우저 재생 가능 코덱 우선 (없으면 나머지 중 선택)
+            exclude: 제외할 코덱 이름
+        """
+        preference = preference or settings.VIDEO_CODEC_PREFERENCE
+        candidates = [codec for codec in self.available() if codec.name not in exclude]
+        if browser_playable:
+            candidates = [codec for codec in candidates if codec.browser_playable] or candidates
+        if not candidates:
+            return None
+        if preference == PREFER_SMALL:
+            return min(candidates, key=lambda codec: (codec.size_rank, codec.speed_rank))
+        return min(candidates, key=lambda codec: (codec.speed_rank, codec.size_rank))
+
+    def open(
+        self,
+        output_base: str,
+        fps: float,
+        size: Tuple[int, int],
+        preference: Optional[str] = None
+    ) -> Optional[VideoSink]:
+        """
+        선택된 코덱으로 출력 열기 (확장자는 코덱에 맞춰 output_base 에 붙임)
+        ? 시험을 통과한 코덱이 열리지 않으면 (디스크 오류 등) 다음 후보로 넘어감
+        """
+        preference = preference or settings.VIDEO_CODEC_PREFERENCE
+        tried = set()
+        while True:
+            codec = self.select(preference, exclude=tried)
+            if codec is None:
+                return None
+            tried.add(codec.name)
+            sink = VideoSink(codec, output_base + codec.ext, fps, size, preference)
+            if sink.is_opened():
+                print(f"코덱 선택: {codec.name} ({preference}) -> {sink.path}")
+                return sink
+            sink.release()
+            print(f"코덱 초기화 실패: {codec.name}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "available": [codec.to_dict() for codec in self.available()],
+            "fast": getattr(self.select(PREFER_FAST), "name", None),
+            "small": getattr(self.select(PREFER_SMALL), "name", None),
+            "ffmpeg_enabled": self.ffmpeg_enabled,
+        }
+
+    # -------------------------------------------------------------------------
+    # 내부 유틸리티
+    # -------------------------------------------------------------------------
+    def _probe(self) -> List[Codec]:
+        available = [codec for codec in OPENCV_CANDIDATES if self._probe_opencv(codec)]
+        if self.ffmpeg_enabled:
+            available += self._probe_ffmpeg()
+        print(f"🎬 사용 가능 코덱: {', '.join(codec.name for codec in available) or '없음'}")
+        return available
+
+    @staticmethod
+    def _probe_opencv(codec: Codec) -> bool:
+        fd, path = tempfile.mkstemp(prefix="codec_probe_", suffix=codec.ext)
+        os.close(fd)
+        try:
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*codec.fourcc), 10, (64, 64))
+            if not writer.isOpened():
+                return False
+            writer.write(np.zeros((64, 64, 3), dtype=np.uint8))
+            writer.release()
+            return os.path.getsize(path) > 0
+        except cv2.error:
+            return False
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _probe_ffmpeg(self) -> List[Codec]:
+        if shutil.which(self.ffmpeg_path) is None:
+            print(f"⚠️ ffmpeg 실행 파일을 찾을 수 없습니다: {self.ffmpeg_path}")
+            return []
+        try:
+            output = subprocess.run(
+                [self.ffmpeg_path, "-hide_banner", "-encoders"],
+                capture_output=True, text=True, timeout=10
+            ).stdout
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"⚠️ ffmpeg 인코더 조회 실패: {e}")
+            return []
+        encoders = {line.split()[1] for line in output.splitlines() if len(line.split()) > 1}
+        return [codec for codec in FFMPEG_CANDIDATES if codec.encoder in encoders]
+
+
+# 싱글톤 인스턴스 (미디어 워커 프로세스는 각자 한 번 시험)
+codec_registry = CodecRegistry(
+    ffmpeg_enabled=settings.FFMPEG_ENABLED,
+    ffmpeg_path=settings.FFMPEG_PATH
+)
@@ -0,0 +1,136 @@
+"""
+Workers Module - 미디어 작업(CPU 연산) 전용 워커 풀
+
+렌더링(이미지 디코딩 + 비디오 인코딩)처럼 CPU 를 오래 쓰는 작업을 이벤트 루프 밖에서 실행합니다.
+기본은 프로세스 풀이며, API 프로세스는 작업 분배와 응답 조립만 담당합니다.
+실행 중 + 대기 중인 작업 수가 상한(워커 수 + 대기열 깊이)을 넘으면 즉시 거절하여
+요청이 무한정 쌓이지 않도록 합니다.
+"""
+import asyncio
+import functools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from config.settings import settings
+
+
+class MediaPoolBusyError(RuntimeError):
+    """워커 풀 대기열이 가득 찬 경우"""
+
+    def __init__(self, retry_after: float):
+        super().__init__("미디어 작업 대기열이 가득 찼습니다. 잠시 후 다시 시도하세요.")
+        self.retry_after = retry_after
+
+
+class MediaWorkerPool:
+    """
+    대기열 깊이가 제한된 미디어 작업 워커 풀
+    """
+
+    def __init__(self, mode: str = "process", workers: int = 0, queue_depth: int = 8):
+        """
+        Args:
+            mode: "process" (멀티 프로세스, 코어 수만큼 확장) 또는 "thread"
+            workers: 워커 수 (0 이면 CPU 코어 수)
+            queue_depth: 모든 워커가 바쁠 때 대기할 수 있는 최대 작업 수
+        """
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_depth = queue_depth
+
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        워커에서 func(*args, **kwargs) 실행 후 결과 반환
+        ! 프로세스 모드에서는 func 와 인자/반환값이 pickle 가능해야 함 (모듈 최상위 함수, 바이트 등)
+
+        Raises:
+            MediaPoolBusyError: 대기열이 가득 찬 경우
+        """
+        with self._lock:
+            if self._pending >= self.workers + self.queue_depth:
+                self._rejected += 1
+                raise MediaPoolBusyError(retry_after=settings.MEDIA_WORKER_RETRY_AFTER_SECONDS)
+            self._pending += 1
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            result = await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+        except Exception as e:
+            with self._lock:
+                self._failed += 1
+                if isinstance(e, BrokenProcessPool) and self._executor is executor:
+                    # 워커 프로세스 비정상 종료 (메모리 부족 등) → 다음 작업부터 새 풀 사용
+                    print(f"⚠️ 미디어 워커 풀 재시작: {e}")
+                    self._executor = None
+            raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+        with self._lock:
+            self._completed += 1
+        return result
+
+    def ensure_capacity(self) -> None:
+        """
+        대기열 여유 확인 (큰 업로드를 받기 전에 미리 거절할 때 사용)
+
+        Raises:
+            MediaPoolBusyError: 대기열이 가득 찬 경우
+        """
+        with self._lock:
+            if self._pending >= self.workers + self.queue_depth:
+                self._rejected += 1
+                raise MediaPoolBusyError(retry_after=settings.MEDIA_WORKER_RETRY_AFTER_SECONDS)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "workers": self.workers,
+                "queue_depth": self.queue_depth,
+                "pending": self._pending,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.mode == "process":
+                    # ? spawn: 이벤트 루프/스레드 풀 상태를 복제하지 않도록 fork 대신 새 프로세스로 시작
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="media")
+                print(f"🧵 미디어 워커 풀 시작: {self.mode} x {self.workers}")
+            return self._executor
+
+
+# 싱글톤 인스턴스
+media_pool = MediaWorkerPool(
+    mode=settings.MEDIA_WORKER_MODE,
+    workers=settings.MEDIA_WORKER_COUNT,
+    queue_depth=settings.MEDIA_WORKER_QUEUE_DEPTH
+)
@@ -0,0 +1,259 @@
+"""
+Workspace Module - 요청별 임시 작업 디렉토리 관리
+
+렌더링/재생성/다운로드마다 고유한 작업 디렉토리를 만들어 주므로,
+같은 프로젝트를 동시에 처리해도 서로의 파일을 덮어쓰거나 지우지 않습니다.
+    1. 작업 루트: WORKSPACE_DIR (비어 있으면 /dev/shm 사용 가능 시 RAM 디스크, 아니면 ./cache/workspaces)
+    2. 용량 상한: 새 작업 디렉토리를 만들 때 전체 사용량이 WORKSPACE_MAX_BYTES 이상이면
+       WorkspaceQuotaError (엔드포인트에서 503 + Retry-After) 후 정리 스레드에 즉시 회수 요청
+       ? 사용량은 정리 스레드가 몇 초마다 측정한 값 (요청마다 디렉토리 전체를 훑지 않음)
+    3. 정리(Janitor): 주기적으로 방치된 디렉토리를 회수
+        - 만든 프로세스가 종료됨 (이전 실행, 비정상 종료한 워커)
+        - 만든 지 WORKSPACE_MAX_AGE_SECONDS 가 지남 (예외로 정리되지 못한 요청)
+
+디렉토리 이름은 "{용도}.{PID}.{임의 문자열}" 형식이며, PID 로 소유 프로세스 생존 여부를 확인합니다.
+"""
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from config.settings import settings
+
+# RAM 디스크(tmpfs) 경로
+_SHM_DIR = "/dev/shm"
+# 디스크 작업 루트 (RAM 디스크를 쓸 수 없을 때)
+_DISK_DIR = "./cache/workspaces"
+# 사용량 측정 주기 (초, 회수 주기가 더 짧으면 회수 주기)
+_USAGE_REFRESH_SECONDS = 5.0
+
+
+class WorkspaceQuotaError(RuntimeError):
+    """작업 디렉토리 전체 사용량이 상한을 넘은 경우"""
+
+    def __init__(self, retry_after: float):
+        super().__init__("임시 작업 공간이 부족합니다. 잠시 후 다시 시도하세요.")
+        self.retry_after = retry_after
+
+
+class Workspace:
+    """
+    요청 1건의 임시 작업 디렉토리 (with 블록 종료 시 삭제)
+    """
+
+    def __init__(self, manager: "WorkspaceManager", path: str, purpose: str):
+        self._manager = manager
+        self.path = path
+        self.purpose = purpose
+        self.created_at = time.time()
+
+    def file(self, name: str) -> str:
+        """작업 디렉토리 안의 파일 경로"""
+        return os.path.join(self.path, name)
+
+    def release(self) -> None:
+        """작업 디렉토리 삭제 (여러 번 호출해도 안전)"""
+        self._manager.release(self.path)
+
+    def __enter__(self) -> "Workspace":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.release()
+
+
+class WorkspaceManager:
+    """
+    요청별 고유 작업 디렉토리 발급 + 전체 용량 상한 + 방치 디렉토리 회수
+    """
+
+    def __init__(self, root: str, max_bytes: int, max_age: float, janitor_interval: float):
+        """
+        Args:
+            root: 작업 디렉토리를 만들 루트
+            max_bytes: 작업 디렉토리 전체 최대 용량 (바이트)
+            max_age: 이 시간(초)이 지난 작업 디렉토리는 방치된 것으로 보고 회수
+            janitor_interval: 방치 디렉토리 회수 주기 (초)
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.janitor_interval = janitor_interval
+        self._lock = threading.Lock()
+        # 이 프로세스가 발급한 작업 디렉토리 (경로 -> Workspace)
+        self._active: Dict[str, Workspace] = {}
+        self._created = 0
+        self._reclaimed = 0
+        self._rejected = 0
+        # 마지막으로 측정한 전체 사용량 (정리 스레드가 갱신)
+        self._usage = 0
+        # 용량 초과 시 다음 정리 주기를 기다리지 않고 회수하도록 요청
+        self._collect_requested = threading.Event()
+        self.refresh_usage()
+
+    def create(self, purpose: str, enforce_quota: bool = True) -> Workspace:
+        """
+        새 작업 디렉토리 발급
+
+        Args:
+            purpose: 용도 (디렉토리 이름 접두어, 예: render/regen/download)
+            enforce_quota: False 면 용량 상한을 확인하지 않음 (이미 비용이 청구된 Kling 결과 다운로드 등)
+
+        Raises:
+            WorkspaceQuotaError: 방치 디렉토리를 회수해도 전체 사용량이 상한 이상인 경우
+        """
+        os.makedirs(self.root, exist_ok=True)
+        # ! 이벤트 루프에서 호출되므로 디렉토리를 훑거나 회수하지 않고 측정된 값만 확인
+        if enforce_quota and self.usage() >= self.max_bytes:
+            self._rejected += 1
+            self._collect_requested.set()
+            raise WorkspaceQuotaError(self._refresh_interval)
+
+        path = tempfile.mkdtemp(prefix=f"{purpose}.{os.getpid()}.", dir=self.root)
+        workspace = Workspace(self, path, purpose)
+        with self._lock:
+            self._active[path] = workspace
+            self._created += 1
+        return workspace
+
+    def release(self, path: str) -> None:
+        """작업 디렉토리 삭제 (발급하지 않은 경로도 루트 안이면 삭제)"""
+        with self._lock:
+            self._active.pop(path, None)
+        if self._owns(path):
+            shutil.rmtree(path, ignore_errors=True)
+
+    def usage(self) -> int:
+        """작업 디렉토리 전체 사용량 (바이트, 정리 스레드가 마지막으로 측정한 값)"""
+        return self._usage
+
+    def refresh_usage(self) -> int:
+        """작업 디렉토리 전체 사용량 측정 (블로킹, 정리 스레드에서 실행)"""
+        total = 0
+        for directory, _, files in os.walk(self.root):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(directory, name))
+                except OSError:
+                    pass  # 확인 도중 삭제된 파일
+        self._usage = total
+        return total
+
+    def collect(self) -> int:
+        """
+        방치된 작업 디렉토리 회수, 회수한 개수 반환
+        ! 다른 프로세스(미디어 워커, 다른 서버 워커)가 만든 디렉토리는 PID 가 살아 있으면 나이로만 판단
+        """
+        if not os.path.isdir(self.root):
+            return 0
+        now = time.time()
+        reclaimed = 0
+        for entry in os.scandir(self.root):
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            with self._lock:
+                workspace = self._active.get(entry.path)
+            if workspace is not None:
+                created_at = workspace.created_at
+            else:
+                try:
+                    created_at = entry.stat(follow_symlinks=False).st_mtime
+                except OSError:
+                    continue
+            pid = self._owner_pid(entry.name)
+            abandoned = now - created_at > self.max_age
+            if pid is not None and pid != os.getpid() and not self._pid_alive(pid):
+                abandoned = True
+            if abandoned:
+                self.release(entry.path)
+                reclaimed += 1
+                print(f"🧹 방치된 작업 디렉토리 회수: {entry.name}")
+        if reclaimed:
+            with self._lock:
+                self._reclaimed += reclaimed
+        return reclaimed
+
+    async def run_janitor(self) -> None:
+        """
+        방치 디렉토리 주기적 회수 + 사용량 측정 (서버 수명 동안 실행, 취소 시 종료)
+        ? 회수는 janitor_interval 마다 또는 용량 초과로 요청되었을 때, 사용량은 그보다 자주 측정
+        """
+        last_collect = 0.0
+        while True:
+            try:
+                now = time.monotonic()
+                if now - last_collect >= self.janitor_interval or self._collect_requested.is_set():
+                    self._collect_requested.clear()
+                    last_collect = now
+                    await asyncio.to_thread(self.collect)
+                await asyncio.to_thread(self.refresh_usage)
+            except Exception as e:
+                print(f"⚠️ 작업 디렉토리 정리 실패: {e}")
+            await asyncio.sleep(self._refresh_interval)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            active = len(self._active)
+        return {
+            "root": self.root,
+            "ram_backed": self.root.startswith(_SHM_DIR),
+            "active": active,
+            "bytes": self.usage(),
+            "max_bytes": self.max_bytes,
+            "created": self._created,
+            "reclaimed": self._reclaimed,
+            "rejected": self._rejected,
+        }
+
+    # -------------------------------------------------------------------------
+    # 내부 유틸리티
+    # -------------------------------------------------------------------------
+    @property
+    def _refresh_interval(self) -> float:
+        return min(self.janitor_interval, _USAGE_REFRESH_SECONDS)
+
+    def _owns(self, path: str) -> bool:
+        root = os.path.abspath(self.root)
+        return os.path.dirname(os.path.abspath(path)) == root
+
+    @staticmethod
+    def _owner_pid(name: str) -> Optional[int]:
+        parts = name.split(".")
+        if len(parts) < 3 or not parts[1].isdigit():
+            return None
+        return int(parts[1])
+
+    @staticmethod
+    def _pid_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True  # 다른 사용자의 프로세스
+        return True
+
+
+def _select_root() -> str:
+    """
+    작업 루트 선택: WORKSPACE_DIR 지정 시 그대로,
+    아니면 /dev/shm 여유 공간이 충분할 때 RAM 디스크, 부족하면(예: Docker 기본 64MB) 디스크
+    """
+    if settings.WORKSPACE_DIR:
+        return settings.WORKSPACE_DIR
+    if settings.WORKSPACE_USE_SHM and os.path.isdir(_SHM_DIR) and os.access(_SHM_DIR, os.W_OK):
+        if shutil.disk_usage(_SHM_DIR).free >= settings.WORKSPACE_SHM_MIN_FREE_BYTES:
+            return os.path.join(_SHM_DIR, "ai-anime-workspaces")
+    return _DISK_DIR
+
+
+# 싱글톤 인스턴스
+workspace_manager = WorkspaceManager(
+    root=_select_root(),
+    max_bytes=settings.WORKSPACE_MAX_BYTES,
+    max_age=settings.WORKSPACE_MAX_AGE_SECONDS,
+    janitor_interval=settings.WORKSPACE_JANITOR_INTERVAL_SECONDS
+)
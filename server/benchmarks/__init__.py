@@ -0,0 +1,10 @@
+"""
+Benchmarks - 미디어 처리 경로 오프라인 벤치마크
+
+Kling API 키나 GUI 없이 합성 비디오/프레임으로 주요 처리 경로의 소요 시간을 측정하고,
+커밋 간 비교할 수 있도록 JSON 으로 저장합니다.
+    - python -m benchmarks.run --width 1280 --height 720 --frames 120 --output benchmarks/results/head.json
+    - python -m benchmarks.compare benchmarks/results/base.json benchmarks/results/head.json
+
+! server/ 디렉토리에서 실행 (app, config 패키지 참조)
+"""
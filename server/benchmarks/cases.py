@@ -0,0 +1,314 @@
+"""
+벤치마크 항목 정의
+
+각 항목은 준비(setup) 함수로 등록되며, 준비 함수는 (측정할 함수, 측정 전 초기화 함수 또는 None) 을 반환합니다.
+측정할 함수는 {"frames": 처리 프레임 수, "bytes": 결과 크기} 를 반환합니다 (초당 처리량 계산용).
+"""
+import json
+import os
+import shutil
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app import frames as frames_lib
+from app import transport
+from app.animator import animator
+from app.frame_store import frame_store
+from app.services import VideoService
+from app.video_codecs import BACKEND_FFMPEG, PREFER_FAST, PREFER_SMALL, Codec, VideoSink, codec_registry
+
+RunFn = Callable[[], Dict[str, Any]]
+SetupFn = Callable[["BenchContext"], Tuple[RunFn, Optional[Callable[[], None]]]]
+
+# 등록된 항목 (이름, 그룹, 준비 함수) - 등록 순서대로 실행
+CASES: List[Tuple[str, str, SetupFn]] = []
+
+
+class BenchContext:
+    """
+    항목 공용 입력 (합성 비디오/프레임, 작업 디렉토리, 테스트 클라이언트)
+    """
+
+    def __init__(
+        self,
+        workdir: str,
+        width: int,
+        height: int,
+        frame_count: int,
+        fps: int,
+        video_path: str,
+        frames: List[bytes],
+        frame_paths: List[str],
+        client: Any
+    ):
+        self.workdir = workdir
+        self.width = width
+        self.height = height
+        self.frame_count = frame_count
+        self.fps = fps
+        self.video_path = video_path
+        self.frames = frames
+        self.frame_paths = frame_paths
+        self.client = client
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.workdir, name)
+
+
+def case(name: str, group: str) -> Callable[[SetupFn], SetupFn]:
+    """벤치마크 항목 등록 데코레이터"""
+    def decorator(setup: SetupFn) -> SetupFn:
+        CASES.append((name, group, setup))
+        return setup
+    return decorator
+
+
+def _check(response: Any) -> Any:
+    """엔드포인트 응답 확인 (실패한 요청을 측정값으로 남기지 않도록, 200 + "status": "error" 포함)"""
+    request = f"{response.request.method} {response.request.url.path}"
+    if response.status_code != 200:
+        raise RuntimeError(f"{request} → {response.status_code}: {response.text[:200]}")
+    content_type = response.headers.get("content-type", "")
+    if transport.is_container(content_type):
+        payload = transport.decode_container(response.content)
+    elif content_type.startswith("application/json"):
+        payload = response.json()
+    else:
+        return response
+    if payload.get("status") == "error":
+        raise RuntimeError(f"{request} → {payload.get('message')}")
+    return response
+
+
+def _file_size(path: Optional[str]) -> int:
+    return os.path.getsize(path) if path and os.path.exists(path) else 0
+
+
+# -----------------------------------------------------------------------------
+# Animator
+# -----------------------------------------------------------------------------
+@case("animator.extract_frames_from_url", "animator")
+def extract_frames_from_url(ctx: BenchContext):
+    """비디오 → 프레임 JPEG 파일 (디스크 기록 경로)"""
+    output_dir = ctx.path("extract")
+
+    def run() -> Dict[str, Any]:
+        paths = animator.extract_frames_from_url(ctx.video_path, output_dir)
+        return {"frames": len(paths), "bytes": sum(map(_file_size, paths))}
+
+    return run, lambda: shutil.rmtree(output_dir, ignore_errors=True)
+
+
+@case("frames.iter_frames", "animator")
+def iter_frames(ctx: BenchContext):
+    """비디오 → 프레임 JPEG 바이트 (생성 파이프라인이 쓰는 메모리 경로, 비교용)"""
+    def run() -> Dict[str, Any]:
+        frames = list(frames_lib.iter_frames(ctx.video_path))
+        return {"frames": len(frames), "bytes": sum(map(len, frames))}
+
+    return run, None
+
+
+@case("animator.create_video_from_frames", "animator")
+def create_video_from_frames(ctx: BenchContext):
+    """프레임 JPEG 파일 → 비디오 (코덱은 VIDEO_CODEC_PREFERENCE 기준 선택)"""
+    output_dir = ctx.path("video")
+
+    def run() -> Dict[str, Any]:
+        path = animator.create_video_from_frames(ctx.frame_paths, os.path.join(output_dir, "bench"), fps=ctx.fps)
+        if not path:
+            raise RuntimeError("비디오 생성 실패")
+        return {"frames": len(ctx.frame_paths), "bytes": _file_size(path)}
+
+    def reset() -> None:
+        shutil.rmtree(output_dir, ignore_errors=True)
+        os.makedirs(output_dir)
+
+    return run, reset
+
+
+@case("animator.create_zip_from_frames", "animator")
+def create_zip_from_frames(ctx: BenchContext):
+    """프레임 JPEG 파일 → ZIP 파일"""
+    output_path = ctx.path("frames.zip")
+
+    def run() -> Dict[str, Any]:
+        path = animator.create_zip_from_frames(ctx.frame_paths, output_path)
+        return {"frames": len(ctx.frame_paths), "bytes": _file_size(path)}
+
+    return run, None
+
+
+@case("animator.iter_zip_from_frames", "animator")
+def iter_zip_from_frames(ctx: BenchContext):
+    """프레임 JPEG 바이트 → ZIP 스트림 (/projects/{id}/frames.zip 경로)"""
+    def run() -> Dict[str, Any]:
+        named = ((f"frame_{index:03d}.jpg", frame) for index, frame in enumerate(ctx.frames))
+        size = sum(len(chunk) for chunk in animator.iter_zip_from_frames(named))
+        return {"frames": len(ctx.frames), "bytes": size}
+
+    return run, None
+
+
+# -----------------------------------------------------------------------------
+# 코덱별 인코딩 (video_codecs 의 speed_rank / size_rank 근거)
+# -----------------------------------------------------------------------------
+def _codec_case(codec: Codec, preference: str) -> SetupFn:
+    def setup(ctx: BenchContext):
+        # 디코딩은 측정에서 빼고 인코딩(VideoSink 기록)만 측정
+        images = [frames_lib.decode_image(frame) for frame in ctx.frames]
+        output_base = ctx.path(f"codec_{codec.name.replace(':', '_')}_{preference}")
+
+        def run() -> Dict[str, Any]:
+            sink = VideoSink(codec, output_base + codec.ext, ctx.fps, (ctx.width, ctx.height), preference)
+            if not sink.is_opened():
+                raise RuntimeError(f"코덱을 열 수 없습니다: {codec.name}")
+            for image in images:
+                sink.write(image)
+            if not sink.release():
+                raise RuntimeError(f"인코딩 실패: {codec.name}")
+            return {"frames": len(images), "bytes": _file_size(sink.path)}
+
+        return run, None
+
+    setup.__doc__ = f"{codec.name} ({codec.ext}, {preference}) 인코딩만 측정 - 결과 크기는 bytes"
+    return setup
+
+
+# ? 사용 가능한 코덱만 등록 (빌드/ffmpeg 설치 여부에 따라 항목이 달라짐)
+#   ffmpeg 코덱은 프리셋이 preference 에 따라 달라지므로 둘 다 측정
+for _codec in codec_registry.available():
+    for _preference in (PREFER_FAST, PREFER_SMALL) if _codec.backend == BACKEND_FFMPEG else (PREFER_FAST,):
+        _name = f"codec.{_codec.name}" + (f".{_preference}" if _codec.backend == BACKEND_FFMPEG else "")
+        case(_name, "codec")(_codec_case(_codec, _preference))
+
+
+# -----------------------------------------------------------------------------
+# VideoService 응답 구성
+# -----------------------------------------------------------------------------
+def _pack(ctx: BenchContext) -> Dict[str, Any]:
+    result = VideoService._pack_generation_result("bench", ctx.frames, None)
+    # ? 반복 측정 중 보관소에 쌓이지 않도록 바로 삭제 (목록에서 빼는 정도라 측정에 영향 없음)
+    frame_store.delete(result["data"]["project_id"])
+    return result
+
+
+@case("service.pack_base64_json", "service")
+def pack_base64_json(ctx: BenchContext):
+    """생성 결과 구성 (프레임 보관, 프록시 생성) + Base64 JSON 직렬화"""
+    def run() -> Dict[str, Any]:
+        body = json.dumps(transport.to_json(_pack(ctx)))
+        return {"frames": len(ctx.frames), "bytes": len(body)}
+
+    return run, None
+
+
+@case("service.pack_container", "service")
+def pack_container(ctx: BenchContext):
+    """생성 결과 구성 + 바이너리 프레임 컨테이너 직렬화 (Base64 JSON 과 비교용)"""
+    def run() -> Dict[str, Any]:
+        body = transport.encode_container(_pack(ctx))
+        return {"frames": len(ctx.frames), "bytes": len(body)}
+
+    return run, None
+
+
+# -----------------------------------------------------------------------------
+# 엔드포인트 왕복 (FastAPI TestClient, Kling 은 fake_kling)
+# -----------------------------------------------------------------------------
+def _generate(ctx: BenchContext, headers: Optional[Dict[str, str]] = None) -> Any:
+    return _check(ctx.client.post(
+        "/generate-video",
+        files={
+            "start_image": ("start.jpg", ctx.frames[0], "image/jpeg"),
+            "end_image": ("end.jpg", ctx.frames[-1], "image/jpeg"),
+        },
+        data={"prompt": "benchmark", "project_name": "bench"},
+        headers=headers or {}
+    ))
+
+
+def _project_id(ctx: BenchContext) -> str:
+    data = _generate(ctx).json()["data"]
+    return data["project_id"]
+
+
+@case("endpoint.generate_video", "endpoint")
+def endpoint_generate_video(ctx: BenchContext):
+    """POST /generate-video (Base64 JSON 응답)"""
+    def run() -> Dict[str, Any]:
+        response = _generate(ctx)
+        return {"frames": response.json()["data"]["frame_count"], "bytes": len(response.content)}
+
+    return run, None
+
+
+@case("endpoint.generate_video_container", "endpoint")
+def endpoint_generate_video_container(ctx: BenchContext):
+    """POST /generate-video (Accept: 바이너리 프레임 컨테이너)"""
+    def run() -> Dict[str, Any]:
+        response = _generate(ctx, {"Accept": transport.FRAME_CONTAINER_MIME})
+        return {"frames": ctx.frame_count, "bytes": len(response.content)}
+
+    return run, None
+
+
+@case("endpoint.render_video", "endpoint")
+def endpoint_render_video(ctx: BenchContext):
+    """POST /render-video (보관 프레임 렌더링)"""
+    project_id = _project_id(ctx)
+
+    def run() -> Dict[str, Any]:
+        response = _check(ctx.client.post(
+            "/render-video", json={"project_name": "bench", "project_id": project_id, "fps": ctx.fps}
+        ))
+        return {"frames": ctx.frame_count, "bytes": response.json()["data"]["video_size"]}
+
+    return run, None
+
+
+@case("endpoint.result_download", "endpoint")
+def endpoint_result_download(ctx: BenchContext):
+    """GET /results/{result_id} (렌더링 비디오 다운로드)"""
+    project_id = _project_id(ctx)
+    rendered = _check(ctx.client.post(
+        "/render-video", json={"project_name": "bench", "project_id": project_id, "fps": ctx.fps}
+    )).json()["data"]
+
+    def run() -> Dict[str, Any]:
+        response = _check(ctx.client.get(rendered["video_url"]))
+        return {"frames": None, "bytes": len(response.content)}
+
+    return run, None
+
+
+@case("endpoint.regenerate_local", "endpoint")
+def endpoint_regenerate_local(ctx: BenchContext):
+    """POST /regenerate (mode=local, 광학 흐름 보간)"""
+    project_id = _project_id(ctx)
+    end_index = min(ctx.frame_count - 1, 12)
+
+    def run() -> Dict[str, Any]:
+        response = _check(ctx.client.post("/regenerate", json={
+            "project_name": "bench",
+            "project_id": project_id,
+            "start_index": 0,
+            "end_index": end_index,
+            "mode": "local",
+            "prompt": "benchmark",
+            "revision_prompt": ""
+        }))
+        return {"frames": len(response.json()["data"]["frames"]), "bytes": len(response.content)}
+
+    return run, None
+
+
+@case("endpoint.frames_zip", "endpoint")
+def endpoint_frames_zip(ctx: BenchContext):
+    """GET /projects/{project_id}/frames.zip (ZIP 스트리밍)"""
+    project_id = _project_id(ctx)
+
+    def run() -> Dict[str, Any]:
+        response = _check(ctx.client.get(f"/projects/{project_id}/frames.zip"))
+        return {"frames": ctx.frame_count, "bytes": len(response.content)}
+
+    return run, None
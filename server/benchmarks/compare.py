@@ -0,0 +1,111 @@
+"""
+벤치마크 결과 비교
+
+    python -m benchmarks.compare benchmarks/results/base.json benchmarks/results/head.json
+    python -m benchmarks.compare base.json head.json --threshold 0.15 --metric p95
+
+항목별 소요 시간(기본: median) 비율을 출력하고, threshold 보다 느려진 항목이 있으면 종료 코드 1 을 반환합니다.
+? 입력 크기(params)나 실행 환경이 다르면 경고 (다른 조건의 결과는 비교 의미가 약함)
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional
+
+from benchmarks.run import SCHEMA_VERSION
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    if report.get("schema") != SCHEMA_VERSION:
+        raise ValueError(f"지원하지 않는 결과 형식입니다 (schema={report.get('schema')}): {path}")
+    return report
+
+
+def _label(report: Dict[str, Any]) -> str:
+    git = report.get("git") or {}
+    commit = (git.get("commit") or "nogit")[:10]
+    return f"{commit}{' (dirty)' if git.get('dirty') else ''}"
+
+
+def compare(
+    base: Dict[str, Any],
+    head: Dict[str, Any],
+    metric: str = "median",
+    threshold: float = 0.1
+) -> List[Dict[str, Any]]:
+    """
+    항목별 비교 결과 (ratio = head / base, 1 보다 크면 느려짐)
+    """
+    base_results = {entry["name"]: entry for entry in base["results"]}
+    rows = []
+    for entry in head["results"]:
+        before = base_results.get(entry["name"])
+        row: Dict[str, Any] = {"name": entry["name"], "base": None, "head": None, "ratio": None, "verdict": "new"}
+        if "error" in entry:
+            row["verdict"] = "error"
+        elif before is not None and "error" not in before:
+            row["base"] = before["seconds"][metric]
+            row["head"] = entry["seconds"][metric]
+            row["ratio"] = row["head"] / row["base"] if row["base"] > 0 else None
+            if row["ratio"] is None:
+                row["verdict"] = "same"
+            elif row["ratio"] > 1 + threshold:
+                row["verdict"] = "slower"
+            elif row["ratio"] < 1 - threshold:
+                row["verdict"] = "faster"
+            else:
+                row["verdict"] = "same"
+        elif before is not None:
+            row["head"] = entry["seconds"][metric]
+            row["verdict"] = "fixed"
+        rows.append(row)
+    return rows
+
+
+def _warnings(base: Dict[str, Any], head: Dict[str, Any]) -> List[str]:
+    warnings = []
+    if base.get("params") != head.get("params"):
+        warnings.append(f"입력 조건이 다릅니다: {base.get('params')} → {head.get('params')}")
+    for key in ("cpu_count", "opencv", "media_worker_mode", "video_codec_preference"):
+        before = (base.get("environment") or {}).get(key)
+        after = (head.get("environment") or {}).get(key)
+        if before != after:
+            warnings.append(f"실행 환경이 다릅니다 ({key}): {before} → {after}")
+    return warnings
+
+
+def _ms(value: Optional[float]) -> str:
+    return f"{value * 1000:.2f}" if value is not None else "-"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compare", description="벤치마크 결과 비교")
+    parser.add_argument("base", help="기준 결과 JSON")
+    parser.add_argument("head", help="비교할 결과 JSON")
+    parser.add_argument("--metric", choices=("min", "median", "mean", "p95"), default="median", help="비교 값 (기본: median)")
+    parser.add_argument("--threshold", type=float, default=0.1, help="느려짐/빨라짐 판단 비율 (기본: 0.1 = 10%%)")
+    args = parser.parse_args(argv)
+
+    base = _load(args.base)
+    head = _load(args.head)
+    for warning in _warnings(base, head):
+        print(f"⚠️ {warning}")
+
+    rows = compare(base, head, args.metric, args.threshold)
+    print(f"{'항목':40s} {_label(base):>14s} {_label(head):>14s} {'ratio':>7s}  ({args.metric}, ms)")
+    for row in rows:
+        ratio = f"{row['ratio']:.2f}x" if row["ratio"] is not None else "-"
+        print(f"{row['name']:40s} {_ms(row['base']):>14s} {_ms(row['head']):>14s} {ratio:>7s}  {row['verdict']}")
+
+    regressions = [row["name"] for row in rows if row["verdict"] in ("slower", "error")]
+    if regressions:
+        print(f"\n❌ 느려지거나 실패한 항목: {', '.join(regressions)}")
+        return 1
+    print("\n✅ 느려진 항목 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+가짜 Kling API - 엔드포인트 왕복 측정용 (네트워크/API 키 불필요)
+
+KlingClient 의 transport 주입 지점에 httpx.MockTransport 로 연결합니다.
+작업은 첫 상태 조회에서 바로 완료되고, 결과 URL 은 미리 만든 합성 비디오를 돌려주므로
+측정 시간은 Kling 생성 대기를 뺀 서버 처리(다운로드 수신, 프레임 추출, 응답 구성)만 반영합니다.
+"""
+import itertools
+
+import httpx
+
+from app.kling_client import KlingClient
+
+VIDEO_URL = "https://bench.invalid/result.mp4"
+
+
+class FakeKling:
+    """
+    image2video 제출/조회/결과 다운로드 응답
+    """
+
+    def __init__(self, video: bytes):
+        self.video = video
+        self._ids = itertools.count(1)
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if request.method == "POST" and path == KlingClient.IMAGE2VIDEO_PATH:
+            return httpx.Response(200, json={"code": 0, "data": {"task_id": f"bench-{next(self._ids)}"}})
+        if request.method == "GET" and path.startswith(KlingClient.IMAGE2VIDEO_PATH + "/"):
+            return httpx.Response(200, json={
+                "code": 0,
+                "data": {"task_status": "succeed", "task_result": {"videos": [{"url": VIDEO_URL}]}}
+            })
+        if str(request.url) == VIDEO_URL:
+            return httpx.Response(200, content=self.video, headers={"Content-Type": "video/mp4"})
+        return httpx.Response(404, json={"code": 404, "message": f"unknown path: {path}"})
+
+
+def install(video: bytes) -> KlingClient:
+    """
+    가짜 Kling 클라이언트를 Animator/폴러에 연결하고 반환
+    ! app 모듈을 가져온 뒤, 첫 요청 전에 호출
+    """
+    from app.animator import animator
+    from app.poller import task_poller
+    from config.settings import settings
+
+    client = KlingClient(
+        access_key="benchmark",
+        secret_key="benchmark",
+        base_url=settings.KLING_API_BASE_URL,
+        transport=httpx.MockTransport(FakeKling(video))
+    )
+    animator.client = client
+    task_poller.client = client
+    return client
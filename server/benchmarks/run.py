@@ -0,0 +1,258 @@
+"""
+벤치마크 실행
+
+    python -m benchmarks.run                                   # 기본 640x360, 48 프레임
+    python -m benchmarks.run --width 1280 --height 720 --frames 120 --repeat 10
+    python -m benchmarks.run --only endpoint. --output benchmarks/results/head.json
+    python -m benchmarks.run --list
+
+결과 JSON 에는 항목별 소요 시간 통계(min/median/mean/p95/stdev, 초)와 초당 처리 프레임 수,
+실행 환경(커밋, Python/OpenCV 버전, CPU 수, 미디어 워커 모드)이 기록됩니다.
+! 실행 중인 서버와 캐시/결과 디렉토리를 공유하지 않도록 임시 디렉토리를 사용
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(SERVER_DIR, "benchmarks", "results")
+
+# 결과 JSON 형식 버전 (compare 에서 확인)
+SCHEMA_VERSION = 1
+
+
+def _configure_environment(workdir: str) -> None:
+    """
+    app 모듈을 가져오기 전에 설정 (config.settings 는 가져올 때 환경 변수를 읽음)
+    """
+    # 실행 중인 서버의 파일을 건드리지 않도록 분리 (결과 보관소는 시작 시 비워짐)
+    os.environ["RESULT_STORE_DIR"] = os.path.join(workdir, "outputs")
+    os.environ["RESULT_CACHE_DIR"] = os.path.join(workdir, "results")
+    os.environ["TASK_LEDGER_PATH"] = os.path.join(workdir, "tasks.sqlite3")
+    os.environ["WORKSPACE_DIR"] = os.path.join(workdir, "workspaces")
+    # 반복 측정마다 같은 입력이므로 캐시/작업 기록을 끄고 매번 전체 경로를 실행
+    os.environ["RESULT_CACHE_ENABLED"] = "False"
+    os.environ["TASK_LEDGER_ENABLED"] = "False"
+    os.environ["TRACING_ENABLED"] = "False"
+    # 가짜 Kling 작업은 즉시 완료되므로 폴링 대기 최소화
+    os.environ["KLING_POLL_MIN_INTERVAL"] = "0.001"
+    os.environ["KLING_POLL_MAX_INTERVAL"] = "0.001"
+    os.environ["KLING_POLL_EXPECTED_SECONDS"] = "0.001"
+    os.environ["KLING_POLL_JITTER"] = "0"
+    os.environ["KLING_POLL_RATE_LIMIT"] = "100000"
+    os.environ.setdefault("KLING_ACCESS_KEY", "benchmark")
+    os.environ.setdefault("KLING_SECRET_KEY", "benchmark")
+    if SERVER_DIR not in sys.path:
+        sys.path.insert(0, SERVER_DIR)
+
+
+def _git_info() -> Dict[str, Any]:
+    def git(*args: str) -> Optional[str]:
+        try:
+            return subprocess.run(
+                ["git", *args], cwd=SERVER_DIR, capture_output=True, text=True, timeout=30, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "subject": git("log", "-1", "--format=%s"),
+        "dirty": bool(status) if status is not None else None,
+    }
+
+
+def _environment() -> Dict[str, Any]:
+    import cv2
+    import numpy as np
+    from config.settings import settings
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+        "media_worker_mode": settings.MEDIA_WORKER_MODE,
+        "media_worker_count": settings.MEDIA_WORKER_COUNT,
+        "video_codec_preference": settings.VIDEO_CODEC_PREFERENCE,
+        "proxy_enabled": settings.PROXY_ENABLED,
+    }
+
+
+def _summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, max(0, round(0.95 * len(ordered)) - 1))]
+    return {
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "mean": statistics.fmean(ordered),
+        "p95": p95,
+        "stdev": statistics.pstdev(ordered),
+    }
+
+
+def measure(
+    run: Callable[[], Dict[str, Any]],
+    reset: Optional[Callable[[], None]],
+    repeat: int,
+    warmup: int
+) -> Dict[str, Any]:
+    """
+    warmup 회 실행 후 repeat 회 측정 (초기화/GC 는 측정 시간에서 제외)
+    """
+    info: Dict[str, Any] = {}
+    for _ in range(warmup):
+        if reset:
+            reset()
+        run()
+
+    samples = []
+    for _ in range(repeat):
+        if reset:
+            reset()
+        gc.collect()
+        started = time.perf_counter()
+        info = run() or {}
+        samples.append(time.perf_counter() - started)
+
+    seconds = _summarize(samples)
+    frames = info.get("frames")
+    return {
+        "repeat": repeat,
+        "samples": samples,
+        "seconds": seconds,
+        "frames": frames,
+        "bytes": info.get("bytes"),
+        "frames_per_second": frames / seconds["median"] if frames and seconds["median"] > 0 else None,
+    }
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="미디어 처리 경로 벤치마크")
+    parser.add_argument("--width", type=int, default=640, help="합성 비디오/프레임 가로 (기본: 640)")
+    parser.add_argument("--height", type=int, default=360, help="합성 비디오/프레임 세로 (기본: 360)")
+    parser.add_argument("--frames", type=int, default=48, help="합성 비디오 프레임 수 (기본: 48)")
+    parser.add_argument("--fps", type=int, default=24, help="합성/렌더링 비디오 fps (기본: 24)")
+    parser.add_argument("--repeat", type=int, default=5, help="항목별 측정 횟수 (기본: 5)")
+    parser.add_argument("--warmup", type=int, default=1, help="항목별 측정 전 실행 횟수 (기본: 1)")
+    parser.add_argument("--only", action="append", default=[], help="이름에 이 문자열이 포함된 항목만 실행 (여러 번 지정 가능)")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/<시각>_<커밋>.json)")
+    parser.add_argument("--list", action="store_true", help="항목 목록만 출력")
+    parser.add_argument("--verbose", action="store_true", help="서버 로그 출력 (기본: 숨김)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    if args.frames < 2 or args.repeat < 1 or args.warmup < 0:
+        print("--frames 는 2 이상, --repeat 는 1 이상, --warmup 은 0 이상이어야 합니다", file=sys.stderr)
+        return 2
+
+    with contextlib.ExitStack() as stack:
+        workdir = stack.enter_context(tempfile.TemporaryDirectory(prefix="ai-anime-bench."))
+        _configure_environment(workdir)
+        # 서버 로그(print)는 측정 결과와 섞이지 않도록 숨김 (--verbose 면 stderr 로)
+        log = sys.stderr if args.verbose else stack.enter_context(open(os.devnull, "w"))
+        quiet = contextlib.redirect_stdout(log)
+        with quiet:
+            from benchmarks import cases, fake_kling, synthetic
+
+        selected = [
+            (name, group, setup) for name, group, setup in cases.CASES
+            if not args.only or any(pattern in name for pattern in args.only)
+        ]
+        if args.list:
+            for name, group, setup in cases.CASES:
+                print(f"{name:40s} {group:10s} {(setup.__doc__ or '').strip()}")
+            return 0
+        if not selected:
+            print(f"선택된 항목이 없습니다: {args.only}", file=sys.stderr)
+            return 2
+
+        report: Dict[str, Any] = {
+            "schema": SCHEMA_VERSION,
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git": _git_info(),
+            "environment": _environment(),
+            "params": {
+                "width": args.width,
+                "height": args.height,
+                "frames": args.frames,
+                "fps": args.fps,
+                "repeat": args.repeat,
+                "warmup": args.warmup,
+            },
+            "results": [],
+        }
+
+        print(f"⏱️  합성 입력 생성: {args.width}x{args.height}, {args.frames} frames", file=sys.stderr)
+        frames = synthetic.make_frames(args.width, args.height, args.frames)
+        video_path = synthetic.write_video(
+            os.path.join(workdir, "source.mp4"), args.width, args.height, args.frames, args.fps
+        )
+        frame_paths = synthetic.write_frame_files(os.path.join(workdir, "frames"), frames)
+        with open(video_path, "rb") as f:
+            fake_kling.install(f.read())
+
+        from fastapi.testclient import TestClient
+        from app.main import app
+
+        failed = 0
+        with quiet, TestClient(app) as client:
+            context = cases.BenchContext(
+                workdir, args.width, args.height, args.frames, args.fps, video_path, frames, frame_paths, client
+            )
+            for name, group, setup in selected:
+                print(f"⏱️  {name} ...", file=sys.stderr)
+                entry: Dict[str, Any] = {"name": name, "group": group}
+                try:
+                    run, reset = setup(context)
+                    entry.update(measure(run, reset, args.repeat, args.warmup))
+                except Exception as e:
+                    failed += 1
+                    entry["error"] = f"{type(e).__name__}: {e}"
+                    traceback.print_exc(file=sys.stderr)
+                report["results"].append(entry)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR,
+        f"{datetime.now().strftime('%Y%m%d-%H%M%S')}_{(report['git']['commit'] or 'nogit')[:10]}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    _print_table(report["results"])
+    print(f"\n📄 결과 저장: {output}")
+    return 1 if failed else 0
+
+
+def _print_table(results: List[Dict[str, Any]]) -> None:
+    print(f"\n{'항목':40s} {'median(ms)':>11s} {'p95(ms)':>9s} {'frames/s':>9s} {'bytes':>12s}")
+    for entry in results:
+        if "error" in entry:
+            print(f"{entry['name']:40s} 실패: {entry['error']}")
+            continue
+        seconds = entry["seconds"]
+        fps = f"{entry['frames_per_second']:.1f}" if entry["frames_per_second"] else "-"
+        size = str(entry["bytes"]) if entry["bytes"] is not None else "-"
+        print(
+            f"{entry['name']:40s} {seconds['median'] * 1000:11.2f} {seconds['p95'] * 1000:9.2f} {fps:>9s} {size:>12s}"
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
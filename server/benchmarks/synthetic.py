@@ -0,0 +1,81 @@
+"""
+합성 입력 생성 - 벤치마크용 비디오/프레임
+
+애니메이션 프레임과 비슷하게 단색 면 + 그라데이션 배경 위에서 도형이 움직이는 영상을 만듭니다.
+(완전한 단색/잡음 영상은 JPEG/비디오 압축률이 실제와 크게 달라 측정이 왜곡됨)
+"""
+import os
+from typing import Iterator, List
+
+import cv2
+import numpy as np
+
+
+def iter_images(width: int, height: int, count: int, seed: int = 0) -> Iterator[np.ndarray]:
+    """
+    BGR 프레임 count 장 (같은 인자면 항상 같은 영상)
+    """
+    rng = np.random.default_rng(seed)
+    # 배경: 가로 그라데이션 + 약한 잡음 (종이 질감)
+    gradient = np.linspace(40, 200, width, dtype=np.float32)
+    background = np.empty((height, width, 3), dtype=np.uint8)
+    background[..., 0] = gradient.astype(np.uint8)
+    background[..., 1] = gradient[::-1].astype(np.uint8)
+    background[..., 2] = 120
+    background = cv2.add(background, rng.integers(0, 12, (height, width, 3), dtype=np.uint8))
+
+    radius = max(4, min(width, height) // 8)
+    colors = [tuple(int(c) for c in rng.integers(0, 256, 3)) for _ in range(3)]
+    for index in range(count):
+        frame = background.copy()
+        t = index / max(count - 1, 1)
+        # 캐릭터 대신 외곽선 있는 도형 3개가 서로 다른 궤적으로 이동
+        for shape, color in enumerate(colors):
+            cx = int((0.15 + 0.7 * ((t + shape * 0.3) % 1.0)) * width)
+            cy = int((0.5 + 0.3 * np.sin(2 * np.pi * (t + shape / 3))) * height)
+            cv2.circle(frame, (cx, cy), radius, color, -1, cv2.LINE_AA)
+            cv2.circle(frame, (cx, cy), radius, (20, 20, 20), 2, cv2.LINE_AA)
+        cv2.putText(
+            frame, f"{index:04d}", (8, height - 12), cv2.FONT_HERSHEY_SIMPLEX,
+            max(0.4, height / 720), (255, 255, 255), 1, cv2.LINE_AA
+        )
+        yield frame
+
+
+def make_frames(width: int, height: int, count: int, quality: int = 95) -> List[bytes]:
+    """JPEG 프레임 바이트 count 장 (생성 결과 프레임과 같은 형식)"""
+    frames = []
+    for image in iter_images(width, height, count):
+        ok, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if not ok:
+            raise RuntimeError("JPEG 인코딩 실패")
+        frames.append(buffer.tobytes())
+    return frames
+
+
+def write_video(path: str, width: int, height: int, count: int, fps: int = 24) -> str:
+    """
+    MP4 비디오 파일 생성 (Kling 결과 영상 대용)
+    ? mp4v 는 OpenCV 기본 빌드에서 항상 사용 가능
+    """
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    if not writer.isOpened():
+        raise RuntimeError(f"비디오 파일을 만들 수 없습니다: {path}")
+    try:
+        for image in iter_images(width, height, count):
+            writer.write(image)
+    finally:
+        writer.release()
+    return path
+
+
+def write_frame_files(directory: str, frames: List[bytes]) -> List[str]:
+    """프레임을 frame_000000.jpg 형식 파일로 저장 (파일 경로 기반 API 측정용)"""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for index, frame in enumerate(frames):
+        path = os.path.join(directory, f"frame_{index:06d}.jpg")
+        with open(path, "wb") as f:
+            f.write(frame)
+        paths.append(path)
+    return paths
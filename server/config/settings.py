@@ -85,9 +85,81 @@ class Settings(BaseModel):
         description="Kling AI Secret Key"
     )
     KLING_API_BASE_URL: str = Field(
-        default=os.getenv("KLING_API_BASE_URL", "https://api.klingai.com"),
+        default=os.getenv("KLING_API_BASE_URL", "https://api-singapore.klingai.com"),
         description="Kling AI API 베이스 URL"
     )
+    KLING_CONNECT_TIMEOUT: float = Field(
+        default=float(os.getenv("KLING_CONNECT_TIMEOUT", "10")),
+        description="Kling API 연결 타임아웃 (초)"
+    )
+    KLING_SUBMIT_TIMEOUT: float = Field(
+        default=float(os.getenv("KLING_SUBMIT_TIMEOUT", "120")),
+        description="작업 요청(이미지 업로드 포함) 타임아웃 (초)"
+    )
+    KLING_STATUS_TIMEOUT: float = Field(
+        default=float(os.getenv("KLING_STATUS_TIMEOUT", "10")),
+        description="작업 상태 조회 타임아웃 (초)"
+    )
+    KLING_DOWNLOAD_TIMEOUT: float = Field(
+        default=float(os.getenv("KLING_DOWNLOAD_TIMEOUT", "60")),
+        description="결과 비디오 다운로드 타임아웃 (초)"
+    )
+    KLING_DOWNLOAD_CHUNK_SIZE: int = Field(
+        default=int(os.getenv("KLING_DOWNLOAD_CHUNK_SIZE", str(256 * 1024))),  # 256KB
+        description="결과 비디오 다운로드 청크 크기 (바이트)"
+    )
+    KLING_MAX_CONNECTIONS: int = Field(
+        default=int(os.getenv("KLING_MAX_CONNECTIONS", "20")),
+        description="Kling API 커넥션 풀 최대 연결 수"
+    )
+    KLING_TOKEN_TTL_SECONDS: int = Field(
+        default=int(os.getenv("KLING_TOKEN_TTL_SECONDS", "1800")),
+        description="JWT 토큰 유효 시간 (초)"
+    )
+    KLING_TOKEN_REFRESH_MARGIN_SECONDS: int = Field(
+        default=int(os.getenv("KLING_TOKEN_REFRESH_MARGIN_SECONDS", "300")),
+        description="JWT 만료 몇 초 전에 재발급할지"
+    )
+    KLING_POLL_MIN_INTERVAL: float = Field(
+        default=float(os.getenv("KLING_POLL_MIN_INTERVAL", "2")),
+        description="작업 상태 최소 폴링 간격 (초, 완료 예상 시점 근처)"
+    )
+    KLING_POLL_MAX_INTERVAL: float = Field(
+        default=float(os.getenv("KLING_POLL_MAX_INTERVAL", "30")),
+        description="작업 상태 최대 폴링 간격 (초, 작업 초반)"
+    )
+    KLING_POLL_EXPECTED_SECONDS: float = Field(
+        default=float(os.getenv("KLING_POLL_EXPECTED_SECONDS", "180")),
+        description="학습 데이터가 없을 때의 작업 예상 소요 시간 (초)"
+    )
+    KLING_POLL_RATE_LIMIT: float = Field(
+        default=float(os.getenv("KLING_POLL_RATE_LIMIT", "5")),
+        description="초당 최대 상태 조회 요청 수 (전체 작업 합산)"
+    )
+    KLING_POLL_JITTER: float = Field(
+        default=float(os.getenv("KLING_POLL_JITTER", "0.2")),
+        description="폴링 간격 무작위 편차 비율 (0~1)"
+    )
+    KLING_POLL_TIMEOUT_SECONDS: float = Field(
+        default=float(os.getenv("KLING_POLL_TIMEOUT_SECONDS", "1800")),
+        description="작업당 최대 대기 시간 (초)"
+    )
+
+    # =========================================================================
+    # Kling 작업 스케줄러 설정
+    # =========================================================================
+    KLING_MAX_IN_FLIGHT: int = Field(
+        default=int(os.getenv("KLING_MAX_IN_FLIGHT", "4")),
+        description="Kling 에 동시에 진행 가능한 최대 작업 수"
+    )
+    KLING_QUEUE_MAX_WAITING: int = Field(
+        default=int(os.getenv("KLING_QUEUE_MAX_WAITING", "32")),
+        description="작업 자리를 기다릴 수 있는 최대 요청 수 (초과 시 429)"
+    )
+    KLING_QUEUE_RETRY_AFTER_SECONDS: float = Field(
+        default=float(os.getenv("KLING_QUEUE_RETRY_AFTER_SECONDS", "30")),
+        description="대기열 초과로 거절 시 Retry-After (초)"
+    )
     
     # =========================================================================
     # 파일 업로드 설정
@@ -105,6 +177,214 @@ class Settings(BaseModel):
         description="업로드 파일 저장 디렉토리"
     )
     
+    # =========================================================================
+    # 프레임 처리 설정
+    # =========================================================================
+    FRAME_JPEG_QUALITY: int = Field(
+        default=int(os.getenv("FRAME_JPEG_QUALITY", "95")),
+        description="추출 프레임 JPEG 품질 (0~100)"
+    )
+    FRAME_DECODE_WINDOW: int = Field(
+        default=int(os.getenv("FRAME_DECODE_WINDOW", "8")),
+        description="소비 측보다 앞서 디코딩해 둘 최대 프레임 수 (메모리 상한)"
+    )
+    FRAME_DECODE_WORKERS: int = Field(
+        default=int(os.getenv("FRAME_DECODE_WORKERS", "0")),
+        description="렌더링 시 이미지 병렬 디코딩 스레드 수 (0 이면 CPU 코어 수)"
+    )
+    INTERPOLATION_FLOW_MAX_SIDE: int = Field(
+        default=int(os.getenv("INTERPOLATION_FLOW_MAX_SIDE", "640")),
+        description="중간 프레임 보간 시 광학 흐름 계산 해상도 (긴 변 픽셀)"
+    )
+    PROXY_ENABLED: bool = Field(
+        default=os.getenv("PROXY_ENABLED", "True").lower() == "true",
+        description="리뷰용 저해상도 프레임(프록시) 생성 여부"
+    )
+    PROXY_MAX_SIDE: int = Field(
+        default=int(os.getenv("PROXY_MAX_SIDE", "480")),
+        description="프록시 프레임 긴 변 최대 길이 (픽셀)"
+    )
+    PROXY_JPEG_QUALITY: int = Field(
+        default=int(os.getenv("PROXY_JPEG_QUALITY", "60")),
+        description="프록시 프레임 JPEG 품질 (0~100)"
+    )
+    RETIME_MODE: str = Field(
+        default=os.getenv("RETIME_MODE", "flow"),
+        description="프레임 수/속도 재조정 기본 방식 (nearest, linear, flow)"
+    )
+
+    # =========================================================================
+    # 미디어 워커 풀 설정 (렌더링 등 CPU 작업)
+    # =========================================================================
+    MEDIA_WORKER_MODE: str = Field(
+        default=os.getenv("MEDIA_WORKER_MODE", "process"),
+        description="미디어 작업 실행 방식 (process, thread)"
+    )
+    MEDIA_WORKER_COUNT: int = Field(
+        default=int(os.getenv("MEDIA_WORKER_COUNT", "0")),
+        description="미디어 작업 워커 수 (0 이면 CPU 코어 수)"
+    )
+    MEDIA_WORKER_QUEUE_DEPTH: int = Field(
+        default=int(os.getenv("MEDIA_WORKER_QUEUE_DEPTH", "8")),
+        description="워커가 모두 바쁠 때 대기 가능한 최대 작업 수 (초과 시 503)"
+    )
+    MEDIA_WORKER_RETRY_AFTER_SECONDS: float = Field(
+        default=float(os.getenv("MEDIA_WORKER_RETRY_AFTER_SECONDS", "5")),
+        description="대기열 초과 응답의 Retry-After (초)"
+    )
+
+    # =========================================================================
+    # 비디오 인코딩 설정
+    # =========================================================================
+    VIDEO_CODEC_PREFERENCE: str = Field(
+        default=os.getenv("VIDEO_CODEC_PREFERENCE", "fast"),
+        description="렌더링 코덱 선택 기준 (fast: 인코딩 속도 우선, small: 파일 크기 우선)"
+    )
+    FFMPEG_ENABLED: bool = Field(
+        default=os.getenv("FFMPEG_ENABLED", "False").lower() == "true",
+        description="ffmpeg 파이프 인코딩 백엔드 사용 여부"
+    )
+    FFMPEG_PATH: str = Field(
+        default=os.getenv("FFMPEG_PATH", "ffmpeg"),
+        description="ffmpeg 실행 파일 경로"
+    )
+    FFMPEG_PRESET_FAST: str = Field(
+        default=os.getenv("FFMPEG_PRESET_FAST", "ultrafast"),
+        description="fast 선택 시 x264 프리셋"
+    )
+    FFMPEG_PRESET_SMALL: str = Field(
+        default=os.getenv("FFMPEG_PRESET_SMALL", "slow"),
+        description="small 선택 시 x264 프리셋"
+    )
+    FFMPEG_CRF: int = Field(
+        default=int(os.getenv("FFMPEG_CRF", "23")),
+        description="ffmpeg 화질 (CRF, 낮을수록 고화질/대용량)"
+    )
+
+    # =========================================================================
+    # 생성 결과 캐시 설정
+    # =========================================================================
+    RESULT_CACHE_ENABLED: bool = Field(
+        default=os.getenv("RESULT_CACHE_ENABLED", "True").lower() == "true",
+        description="동일 입력 재요청 시 생성 결과 캐시 사용 여부"
+    )
+    RESULT_CACHE_DIR: str = Field(
+        default=os.getenv("RESULT_CACHE_DIR", "./cache/results"),
+        description="생성 결과 캐시 디렉토리"
+    )
+    RESULT_CACHE_MAX_BYTES: int = Field(
+        default=int(os.getenv("RESULT_CACHE_MAX_BYTES", str(2 * 1024 * 1024 * 1024))),  # 2GB
+        description="생성 결과 캐시 최대 용량 (바이트, 초과 시 LRU 삭제)"
+    )
+
+    # =========================================================================
+    # 프로젝트 프레임 보관 설정
+    # =========================================================================
+    FRAME_STORE_TTL_SECONDS: int = Field(
+        default=int(os.getenv("FRAME_STORE_TTL_SECONDS", "3600")),
+        description="생성 프레임 서버 보관 시간 (마지막 접근 기준, 초)"
+    )
+    FRAME_STORE_MAX_BYTES: int = Field(
+        default=int(os.getenv("FRAME_STORE_MAX_BYTES", str(1024 * 1024 * 1024))),  # 1GB
+        description="프레임 보관소 최대 용량 (바이트, 초과 시 LRU 삭제)"
+    )
+
+    # =========================================================================
+    # 결과 파일 보관 설정 (렌더링/생성 비디오 다운로드)
+    # =========================================================================
+    RESULT_STORE_DIR: str = Field(
+        default=os.getenv("RESULT_STORE_DIR", "./cache/outputs"),
+        description="결과 파일 보관 디렉토리 (서버 시작 시 비움)"
+    )
+    RESULT_STORE_TTL_SECONDS: int = Field(
+        default=int(os.getenv("RESULT_STORE_TTL_SECONDS", "1800")),
+        description="결과 파일 보관 시간 (마지막 접근 기준, 초)"
+    )
+    RESULT_STORE_MAX_BYTES: int = Field(
+        default=int(os.getenv("RESULT_STORE_MAX_BYTES", str(2 * 1024 * 1024 * 1024))),  # 2GB
+        description="결과 파일 보관소 최대 용량 (바이트, 초과 시 LRU 삭제)"
+    )
+    RESULT_INLINE_VIDEO: bool = Field(
+        default=os.getenv("RESULT_INLINE_VIDEO", "False").lower() == "true",
+        description="응답 JSON 에 비디오를 Base64(video_data)로도 포함할지 여부 (이전 클라이언트 호환용)"
+    )
+
+    # =========================================================================
+    # 임시 작업 디렉토리 설정 (요청별 고유 디렉토리)
+    # =========================================================================
+    WORKSPACE_DIR: str = Field(
+        default=os.getenv("WORKSPACE_DIR", ""),
+        description="작업 디렉토리 루트 (비어 있으면 /dev/shm 또는 ./cache/workspaces 자동 선택)"
+    )
+    WORKSPACE_USE_SHM: bool = Field(
+        default=os.getenv("WORKSPACE_USE_SHM", "True").lower() == "true",
+        description="WORKSPACE_DIR 미지정 시 RAM 디스크(/dev/shm) 사용 여부"
+    )
+    WORKSPACE_SHM_MIN_FREE_BYTES: int = Field(
+        default=int(os.getenv("WORKSPACE_SHM_MIN_FREE_BYTES", str(512 * 1024 * 1024))),  # 512MB
+        description="/dev/shm 사용에 필요한 최소 여유 공간 (바이트, 부족하면 디스크 사용)"
+    )
+    WORKSPACE_MAX_BYTES: int = Field(
+        default=int(os.getenv("WORKSPACE_MAX_BYTES", str(2 * 1024 * 1024 * 1024))),  # 2GB
+        description="작업 디렉토리 전체 최대 용량 (바이트, 초과 시 새 요청 503)"
+    )
+    WORKSPACE_MAX_AGE_SECONDS: int = Field(
+        default=int(os.getenv("WORKSPACE_MAX_AGE_SECONDS", "3600")),
+        description="이 시간이 지난 작업 디렉토리는 방치된 것으로 보고 회수 (초)"
+    )
+    WORKSPACE_JANITOR_INTERVAL_SECONDS: float = Field(
+        default=float(os.getenv("WORKSPACE_JANITOR_INTERVAL_SECONDS", "300")),
+        description="방치된 작업 디렉토리 회수 주기 (초)"
+    )
+
+    # =========================================================================
+    # Kling 작업 기록 설정
+    # =========================================================================
+    TASK_LEDGER_ENABLED: bool = Field(
+        default=os.getenv("TASK_LEDGER_ENABLED", "True").lower() == "true",
+        description="제출한 Kling 작업 기록 및 재시작 시 이어서 처리 여부"
+    )
+    TASK_LEDGER_PATH: str = Field(
+        default=os.getenv("TASK_LEDGER_PATH", "./cache/tasks.sqlite3"),
+        description="Kling 작업 기록 SQLite 파일 경로"
+    )
+    TASK_LEDGER_RETENTION_SECONDS: int = Field(
+        default=int(os.getenv("TASK_LEDGER_RETENTION_SECONDS", str(7 * 24 * 3600))),  # 7일
+        description="완료/실패한 작업 기록 보관 시간 (초)"
+    )
+
+    # =========================================================================
+    # 비동기 작업(Job) 설정
+    # =========================================================================
+    JOB_RESULT_TTL_SECONDS: int = Field(
+        default=int(os.getenv("JOB_RESULT_TTL_SECONDS", "1800")),
+        description="완료된 작업 결과 보관 시간 (초)"
+    )
+    JOB_SSE_KEEPALIVE_SECONDS: float = Field(
+        default=float(os.getenv("JOB_SSE_KEEPALIVE_SECONDS", "15")),
+        description="SSE 진행 스트림 keep-alive 전송 간격 (초)"
+    )
+
+    # =========================================================================
+    # 요청 추적/프로파일링 설정 (X-Trace / X-Profile 헤더)
+    # =========================================================================
+    TRACING_ENABLED: bool = Field(
+        default=os.getenv("TRACING_ENABLED", "False").lower() == "true",
+        description="X-Trace/X-Profile 헤더로 요청 추적 및 프로파일링 허용 여부 (관리자 플래그)"
+    )
+    TRACE_STORE_MAX_TRACES: int = Field(
+        default=int(os.getenv("TRACE_STORE_MAX_TRACES", "50")),
+        description="보관할 최근 추적 결과 수"
+    )
+    PROFILE_SAMPLE_INTERVAL_MS: float = Field(
+        default=float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5")),
+        description="샘플링 프로파일러 샘플링 간격 (밀리초)"
+    )
+    PROFILE_MAX_SECONDS: float = Field(
+        default=float(os.getenv("PROFILE_MAX_SECONDS", "600")),
+        description="요청 1건의 최대 프로파일링 시간 (초, 지나면 샘플링 중지)"
+    )
+
     # =========================================================================
     # 로깅 설정
     # =========================================================================
@@ -1,5 +1,6 @@
 import sys
 import os
+import asyncio
 import tkinter as tk
 from tkinter import filedialog, messagebox, simpledialog
 
@@ -63,6 +64,20 @@ def ask_prompt(default_prompt: str = "") -> str:
     return prompt if prompt else default_prompt
 
 
+def save_frames(frames: list, project_name: str) -> list:
+    """메모리에 있는 프레임(JPEG 바이트)을 generated_frames/{project_name}/frames 에 저장"""
+    frames_dir = os.path.join("generated_frames", project_name, "frames")
+    os.makedirs(frames_dir, exist_ok=True)
+    
+    frame_paths = []
+    for i, frame in enumerate(frames):
+        path = os.path.join(frames_dir, f"frame_{i:06d}.jpg")
+        with open(path, "wb") as f:
+            f.write(frame)
+        frame_paths.append(path)
+    return frame_paths
+
+
 def main():
     print("=" * 60)
     print("  애니메이션 비디오 생성기 (Kling AI)")
@@ -135,12 +150,13 @@ def main():
     print("비디오 생성 중... (시간이 걸릴 수 있습니다)")
     print("=" * 60)
     
-    frame_paths = animator.generate_video_from_images(
+    result = asyncio.run(animator.generate_video_from_images(
         project_name=project_name,
         start_image_bytes=start_bytes,
         end_image_bytes=end_bytes,
         prompt=user_prompt,
-    )
+    ))
+    frame_paths = save_frames(result[0], project_name) if result else []
     
 
     # 결과 저장 및 수정 루프
@@ -185,25 +201,24 @@ def main():
             
             # from app.frame_generator import frame_generator
             
-            new_frames = animator.regenerate_video_segment(
+            new_frames = asyncio.run(animator.regenerate_video_segment(
                 # animator_client=animator, # No longer needed
                 project_name=project_name,
                 start_image_path=frame_paths[start_idx],
                 end_image_path=frame_paths[end_idx],
                 target_frame_count=target_count,
                 original_prompt=user_prompt
-            )
+            ))
             
             if new_frames and len(new_frames) == target_count:
                 print("✓ 구간 재생성 성공! 파일을 덮어씁니다.")
                 # 파일 덮어쓰기
-                for i, new_frame_path in enumerate(new_frames):
+                for i, new_frame in enumerate(new_frames):
                     original_frame_path = frame_paths[start_idx + i]
                     
-                    # 새 프레임을 원본 위치로 복사/이동 (덮어쓰기)
-                    # new_frames는 revision 폴더에 있음
-                    import shutil
-                    shutil.copy2(new_frame_path, original_frame_path)
+                    # 새 프레임(JPEG 바이트)을 원본 위치에 덮어쓰기
+                    with open(original_frame_path, "wb") as f:
+                        f.write(new_frame)
                     print(f"  Updated: {original_frame_path}")
                 
                 print("수정 완료.")
@@ -0,0 +1,9 @@
+"""
+pytest 공용 설정 - server/ 를 모듈 경로에 추가 (app, config 패키지 import 용)
+"""
+import os
+import sys
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
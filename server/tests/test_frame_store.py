@@ -0,0 +1,93 @@
+"""
+FrameStore.splice - 키 프레임 유지, 프록시 정렬, 버전 충돌
+"""
+import pytest
+
+from app.frame_store import FrameStore
+
+
+def _frames(prefix: str, count: int):
+    return [f"{prefix}{i}".encode() for i in range(count)]
+
+
+@pytest.fixture
+def store():
+    return FrameStore(ttl=3600, max_bytes=1 << 30)
+
+
+def test_splice_keeps_key_frames(store):
+    project = store.create("p", _frames("f", 6))
+    store.splice(project.project_id, 1, 4, _frames("n", 3))
+
+    # 양 끝(1, 4) 키 프레임은 유지, 사이(2, 3)만 교체
+    assert project.frames == [b"f0", b"f1", b"n0", b"n1", b"n2", b"f4", b"f5"]
+    assert project.version == 2
+
+
+def test_splice_adjacent_indices_inserts_between(store):
+    project = store.create("p", _frames("f", 3))
+    store.splice(project.project_id, 0, 1, _frames("n", 2))
+
+    assert project.frames == [b"f0", b"n0", b"n1", b"f1", b"f2"]
+
+
+def test_splice_aligns_proxies(store):
+    project = store.create("p", _frames("f", 5), proxies=_frames("p", 5))
+    store.splice(project.project_id, 0, 4, _frames("n", 4), new_proxies=_frames("q", 4))
+
+    assert len(project.proxies) == len(project.frames) == 6
+    assert project.frames == [b"f0", b"n0", b"n1", b"n2", b"n3", b"f4"]
+    assert project.proxies == [b"p0", b"q0", b"q1", b"q2", b"q3", b"p4"]
+
+
+@pytest.mark.parametrize("new_proxies", [None, [b"q0"]])
+def test_splice_drops_proxies_that_would_misalign(store, new_proxies):
+    project = store.create("p", _frames("f", 5), proxies=_frames("p", 5))
+    store.splice(project.project_id, 1, 3, _frames("n", 2), new_proxies=new_proxies)
+
+    assert project.proxies is None
+    assert len(project.frames) == 6
+
+
+def test_splice_without_stored_proxies_ignores_new_proxies(store):
+    project = store.create("p", _frames("f", 4))
+    store.splice(project.project_id, 0, 3, _frames("n", 2), new_proxies=_frames("q", 2))
+
+    assert project.proxies is None
+    assert project.frames == [b"f0", b"n0", b"n1", b"f3"]
+
+
+def test_splice_version_conflict_leaves_frames_untouched(store):
+    project = store.create("p", _frames("f", 4))
+    store.splice(project.project_id, 0, 3, _frames("n", 1), expected_version=1)
+
+    with pytest.raises(ValueError):
+        store.splice(project.project_id, 0, 3, _frames("x", 5), expected_version=1)
+    assert project.frames == [b"f0", b"n0", b"f3"]
+    assert project.version == 2
+
+
+@pytest.mark.parametrize("start, end", [(-1, 2), (2, 2), (3, 1), (0, 4)])
+def test_splice_rejects_out_of_range(store, start, end):
+    project = store.create("p", _frames("f", 4))
+
+    with pytest.raises(ValueError):
+        store.splice(project.project_id, start, end, [])
+    assert project.version == 1
+
+
+def test_splice_unknown_project(store):
+    with pytest.raises(KeyError):
+        store.splice("missing", 0, 1, [])
+
+
+def test_splice_updates_total_bytes(store):
+    project = store.create("p", _frames("f", 4), proxies=_frames("p", 4))
+    store.splice(project.project_id, 0, 3, [b"x" * 100], new_proxies=[b"y" * 10])
+
+    assert store.stats()["bytes"] == project.size
+
+
+def test_create_rejects_mismatched_proxies(store):
+    with pytest.raises(ValueError):
+        store.create("p", _frames("f", 3), proxies=_frames("p", 2))
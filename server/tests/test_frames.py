@@ -0,0 +1,79 @@
+"""
+frames - 메타데이터 프레임 수가 실제보다 큰 영상의 샘플링 추출
+"""
+import cv2
+import numpy as np
+import pytest
+
+from app import frames as frames_lib
+from app import retiming
+
+ACTUAL = 12
+
+
+class _OverstatedCapture:
+    """CAP_PROP_FRAME_COUNT 만 실제보다 크게 보고하는 VideoCapture (조각화된 MP4/WebM 재현)"""
+
+    def __init__(self, cap: cv2.VideoCapture, factor: int):
+        self._cap = cap
+        self._factor = factor
+
+    def get(self, prop: int) -> float:
+        value = self._cap.get(prop)
+        return value * self._factor if prop == cv2.CAP_PROP_FRAME_COUNT else value
+
+    def __getattr__(self, name: str):
+        return getattr(self._cap, name)
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    # 프레임마다 밝기가 달라 중복 프레임을 구분할 수 있는 영상
+    path = str(tmp_path / "source.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 24, (32, 32))
+    assert writer.isOpened()
+    for index in range(ACTUAL):
+        writer.write(np.full((32, 32, 3), index * 20, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+@pytest.fixture
+def overstated(monkeypatch):
+    open_capture = frames_lib._open_capture
+    monkeypatch.setattr(
+        frames_lib, "_open_capture", lambda source: _OverstatedCapture(open_capture(source), factor=3)
+    )
+
+
+def test_sampled_decode_returns_only_decoded_frames(video_path, overstated):
+    infos = []
+
+    decoded = list(frames_lib.iter_frames(video_path, encode=False, sample_count=8, on_start=infos.append))
+
+    # 메타데이터(36) 기준 8장 예정이었지만 실제 12프레임 안의 샘플만 반환
+    assert infos[0]["frame_count"] == 8
+    wanted = [i for i in frames_lib.sample_indices(ACTUAL * 3, 8) if i < ACTUAL]
+    assert len(decoded) == len(wanted) < 8
+    # 마지막 프레임 반복으로 채우지 않음
+    levels = [int(frame.mean()) for frame in decoded]
+    assert len(set(levels)) == len(levels)
+    assert levels == sorted(levels)
+
+
+def test_short_sample_is_retimed_to_target(video_path, overstated):
+    decoded = list(frames_lib.iter_frames(video_path, sample_count=8))
+
+    retimed = retiming.retime_jpeg(decoded, 8, mode=retiming.MODE_LINEAR)
+
+    assert len(decoded) < 8
+    assert len(retimed) == 8
+    levels = [int(frames_lib.decode_image(frame).mean()) for frame in retimed]
+    # 끝부분이 같은 프레임으로 멈추지 않고 보간됨
+    assert levels[-1] != levels[-2]
+
+
+def test_sampled_decode_without_overstated_metadata(video_path):
+    decoded = list(frames_lib.iter_frames(video_path, encode=False, sample_count=5))
+
+    assert len(decoded) == 5
@@ -0,0 +1,123 @@
+"""
+retiming - 창 단위 iter_retime 와 전체 스택 retime 일치, 짧은 원본, 속도 곡선
+"""
+import numpy as np
+import pytest
+
+from app import retiming
+from app.retiming import iter_retime, retime, source_positions
+
+BATCH = retiming._BATCH_FRAMES
+
+
+def _stack(count: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, (count, 8, 8, 3), dtype=np.uint8)
+
+
+def _iter_all(frames: np.ndarray, positions, mode: str) -> np.ndarray:
+    return np.stack(list(iter_retime(iter(frames), positions, mode)))
+
+
+@pytest.mark.parametrize("mode", [retiming.MODE_NEAREST, retiming.MODE_LINEAR])
+@pytest.mark.parametrize("total", [1, 2, BATCH - 1, BATCH, BATCH + 1, 2 * BATCH - 1, 2 * BATCH, 2 * BATCH + 1, 5 * BATCH + 3])
+@pytest.mark.parametrize("scale", [0.3, 1.0, 2.5])
+def test_iter_retime_matches_retime(mode, total, scale):
+    frames = _stack(total)
+    positions = source_positions(total, max(1, round(total * scale)))
+
+    np.testing.assert_array_equal(_iter_all(frames, positions, mode), retime(frames, positions, mode))
+
+
+@pytest.mark.parametrize("total", [BATCH - 1, BATCH + 1, 3 * BATCH + 5])
+def test_iter_retime_matches_retime_flow(total):
+    frames = _stack(total)
+    positions = source_positions(total, total * 2)
+
+    np.testing.assert_array_equal(
+        _iter_all(frames, positions, retiming.MODE_FLOW), retime(frames, positions, retiming.MODE_FLOW)
+    )
+
+
+@pytest.mark.parametrize("mode", [retiming.MODE_NEAREST, retiming.MODE_LINEAR])
+@pytest.mark.parametrize("speed", [[0.5], [1.0, 0.25, 1.0], [2.0, 0.5], [3.0]])
+def test_iter_retime_matches_retime_speed_curve(mode, speed):
+    total = 3 * BATCH + 7
+    frames = _stack(total)
+    positions = source_positions(total, speed=speed)
+
+    np.testing.assert_array_equal(_iter_all(frames, positions, mode), retime(frames, positions, mode))
+
+
+@pytest.mark.parametrize("mode", [retiming.MODE_NEAREST, retiming.MODE_LINEAR])
+@pytest.mark.parametrize("actual", [1, BATCH - 3, BATCH, BATCH + 2, 2 * BATCH + 1])
+def test_iter_retime_short_source_pads_with_last_frame(mode, actual):
+    # 원본이 positions 가 가정한 프레임 수(3 * BATCH)보다 짧은 경우
+    frames = _stack(actual)
+    positions = source_positions(3 * BATCH, 4 * BATCH)
+
+    out = _iter_all(frames, positions, mode)
+
+    assert len(out) == len(positions)
+    np.testing.assert_array_equal(out, retime(frames, positions, mode))
+    np.testing.assert_array_equal(out[-1], frames[-1])
+
+
+def test_iter_retime_empty():
+    assert list(iter_retime(iter(_stack(4)), [])) == []
+
+
+def test_iter_retime_non_monotonic_positions_are_clamped():
+    frames = _stack(2 * BATCH)
+    positions = np.array([0.0, 5.0, 3.0, 20.0, 10.0, 31.0])
+    expected = retime(frames, np.maximum.accumulate(positions), retiming.MODE_LINEAR)
+
+    np.testing.assert_array_equal(_iter_all(frames, positions, retiming.MODE_LINEAR), expected)
+
+
+# -----------------------------------------------------------------------------
+# source_positions
+# -----------------------------------------------------------------------------
+def test_source_positions_count():
+    np.testing.assert_allclose(source_positions(5, 9), np.linspace(0, 4, 9))
+    np.testing.assert_allclose(source_positions(5), np.arange(5))
+    np.testing.assert_allclose(source_positions(5, 1), [2.0])
+    assert source_positions(0, 3).size == 0
+    assert source_positions(5, 0).size == 0
+
+
+def test_source_positions_constant_speed():
+    # 절반 속도 → 원본 구간마다 출력 2 프레임
+    np.testing.assert_allclose(source_positions(5, speed=[0.5]), np.arange(9) / 2)
+    # 원래 속도 → 원본 그대로
+    np.testing.assert_allclose(source_positions(7, speed=[1.0, 1.0]), np.arange(7))
+
+
+def test_source_positions_speed_curve_shape():
+    positions = source_positions(20, speed=[1.0, 0.25, 1.0])
+
+    assert positions[0] == 0.0 and positions[-1] == pytest.approx(19.0, abs=1.0)
+    assert np.all(np.diff(positions) > 0)
+    steps = np.diff(positions)
+    # 가운데(느린 구간)는 출력 프레임 간 원본 간격이 양 끝보다 좁음
+    assert steps[len(steps) // 2] < steps[0] and steps[len(steps) // 2] < steps[-1]
+    assert len(positions) > 20
+
+
+def test_source_positions_speed_with_count_keeps_length_and_ends():
+    positions = source_positions(20, 50, speed=[2.0, 0.5])
+
+    assert len(positions) == 50
+    assert positions[0] == 0.0 and positions[-1] == pytest.approx(19.0)
+    assert np.all(np.diff(positions) > 0)
+
+
+@pytest.mark.parametrize("speed", [[], [0.0], [1.0, -1.0], [[1.0]]])
+def test_source_positions_rejects_invalid_speed(speed):
+    with pytest.raises(ValueError):
+        source_positions(10, speed=speed)
+
+
+def test_source_positions_rejects_negative_count():
+    with pytest.raises(ValueError):
+        source_positions(10, -1)